@@ -6,30 +6,48 @@
 # LICENSE file in the root directory of this source tree.
 #
 
-from mdlinkscheck.filechecker import FileChecker
+#
+# Dependencies slow to import (mistune, requests, HTML parsers, multiprocessing)
+# are imported on first use, so startup of application (e.g. '--help') stays
+# fast. Modules refer to them at top level only under 'TYPE_CHECKING'
+# (checked by 'testmdlinkscheck.test_startup').
+#
+
+from mdlinkscheck.filechecker import FileChecker, DocumentRegistry
+from mdlinkscheck.mdconverter import MarkdownConverter
+from mdlinkscheck.batch import verify_checker, verify_many, Project, VerifyResult
 
 # ============================== API interface ==============================
 
 
-def verify(md_file, *, implicit_heading_github=False, implicit_heading_bitbucket=False, check_url_reachable=False):
-    """Verify given Markdown file. Return list of invalid links (if any)."""
-    checker = FileChecker(md_file)
-    checker.setOptions(
-        implicit_heading_id_github=implicit_heading_github,
-        implicit_heading_id_bitbucket=implicit_heading_bitbucket,
+def verify(
+    md_file,
+    *,
+    implicit_heading_github=False,
+    implicit_heading_bitbucket=False,
+    implicit_heading_gitlab=False,
+    check_url_reachable=False,
+    registry: DocumentRegistry = None,
+):
+    """Verify given Markdown file. Return list of invalid links (if any).
+
+    Pass the same 'registry' to multiple calls to share parsed documents between them.
+    """
+    checker = verify_checker(
+        md_file,
+        implicit_heading_github=implicit_heading_github,
+        implicit_heading_bitbucket=implicit_heading_bitbucket,
+        implicit_heading_gitlab=implicit_heading_gitlab,
         check_url_reachable=check_url_reachable,
+        registry=registry,
     )
-    checker.checkMarkdown()
     return checker.invalid_links
 
 
 def extract_links(md_file):
     """Extract all links from single file."""
     checker = FileChecker(md_file)
-    ret_set = set()
-    ret_set.update(checker.extractHyperlinks())
-    ret_set.update(checker.extractImgs())
-    return ret_set
+    return checker.extractLinks()
 
 
 def extract_hyperlinks(md_file):
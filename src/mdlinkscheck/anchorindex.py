@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Index of elements of document that links can point to. Ids of headings
+# are calculated for all enabled dialects (GitHub, Bitbucket, GitLab)
+# during single pass over headings of the document.
+#
+
+import re
+
+from collections.abc import Iterable
+
+# lowercased ids with dashes
+HEADING_ID_GITHUB = "github"
+# lowercased ids with dashes and 'markdown-header-' prefix
+HEADING_ID_BITBUCKET = "bitbucket"
+# lowercased ids with dashes, without punctuation
+HEADING_ID_GITLAB = "gitlab"
+
+HEADING_ID_DIALECTS_LIST = [HEADING_ID_GITHUB, HEADING_ID_BITBUCKET, HEADING_ID_GITLAB]
+
+HEADER_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+
+
+_GITHUB_TABLE = str.maketrans({" ": "-", ",": None, ".": None, "(": None, ")": None})
+
+_DASHES_REGEX = re.compile(r"-{2,}")
+
+# anything except word characters, spaces and dashes
+_GITLAB_REMOVE_REGEX = re.compile(r"[^\w\- ]")
+
+
+# ===================================================================
+
+
+def build_anchor_index(anchors: Iterable[str], headers: Iterable[str], dialects: Iterable[str] = ()) -> frozenset:
+    """Return ids of elements of document.
+
+    'anchors' are explicit ids of elements, 'headers' are texts of headings in order of
+    occurrence in document. Ids of headings are calculated for each of given 'dialects'
+    (repeated headings get numeric suffix as in given dialect).
+    """
+    ret_set = set(anchors)
+    use_github = HEADING_ID_GITHUB in dialects
+    use_bitbucket = HEADING_ID_BITBUCKET in dialects
+    use_gitlab = HEADING_ID_GITLAB in dialects
+    if not use_github and not use_bitbucket and not use_gitlab:
+        return frozenset(ret_set)
+
+    github_occurrences: dict[str, int] = {}
+    bitbucket_occurrences: dict[str, int] = {}
+    gitlab_occurrences: dict[str, int] = {}
+    for header_label in headers:
+        lower_label = header_label.lower()
+        if use_github or use_bitbucket:
+            github_id = lower_label.translate(_GITHUB_TABLE)
+            if use_github:
+                ret_set.add(_make_unique(github_id, github_occurrences, "-"))
+            if use_bitbucket:
+                bitbucket_id = "markdown-header-" + _DASHES_REGEX.sub("-", github_id)
+                ret_set.add(_make_unique(bitbucket_id, bitbucket_occurrences, "_"))
+        if use_gitlab:
+            gitlab_id = _DASHES_REGEX.sub("-", _GITLAB_REMOVE_REGEX.sub("", lower_label).replace(" ", "-"))
+            ret_set.add(_make_unique(gitlab_id, gitlab_occurrences, "-"))
+    return frozenset(ret_set)
+
+
+def convert_header_to_github_target(header_label):
+    return header_label.lower().translate(_GITHUB_TABLE)
+
+
+def convert_header_to_bitbucket_target(header_label):
+    # bitbucket adds prefix to all section elements
+    target = _DASHES_REGEX.sub("-", convert_header_to_github_target(header_label))
+    return f"markdown-header-{target}"
+
+
+def convert_header_to_gitlab_target(header_label):
+    target = _GITLAB_REMOVE_REGEX.sub("", header_label.lower()).replace(" ", "-")
+    return _DASHES_REGEX.sub("-", target)
+
+
+def _make_unique(target_id, occurrences: dict[str, int], separator) -> str:
+    """Append number to id if it was already generated ('id', 'id-1', 'id-2' and so on)."""
+    count = occurrences.get(target_id)
+    if count is None:
+        occurrences[target_id] = 0
+        return target_id
+    while True:
+        count += 1
+        unique_id = f"{target_id}{separator}{count}"
+        if unique_id not in occurrences:
+            break
+    occurrences[target_id] = count
+    occurrences[unique_id] = 0
+    return unique_id
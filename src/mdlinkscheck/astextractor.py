@@ -0,0 +1,232 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Extraction of links and anchors directly from Markdown syntax tree.
+# Conversion to HTML and parsing it again is avoided. Only raw HTML
+# embedded in Markdown is parsed by HTML parser.
+#
+# Syntax tree of mistune does not contain positions of elements, so
+# parser's state records start offset of each top-level block and links
+# are located by forward search inside the block they belong to.
+#
+
+import logging
+import html
+import bisect
+
+import mistune
+
+from mdlinkscheck.anchorindex import HEADER_TAGS
+from mdlinkscheck.htmlparser import iter_html_elements, get_html_text, DEFAULT_HTML_PARSER
+from mdlinkscheck.mdconverter import MarkdownConverter, get_converter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# ===================================================================
+
+
+class MarkdownElements:
+    """Elements of Markdown document required to verify links (in order of occurrence)."""
+
+    def __init__(self):
+        self.hyperlinks: list[str] = []  # 'href' of links
+        self.hyperlinks_positions: list[tuple[int, int]] = []  # (line, column) of each link
+        self.imgs: list[str] = []  # 'src' of images
+        self.imgs_positions: list[tuple[int, int]] = []  # (line, column) of each image
+        self.anchors: list[str] = []  # 'id' and 'name' of <a> elements
+        self.headers: list[str] = []  # text of headers
+
+    def getPosition(self, link) -> tuple[int, int] | None:
+        """Return position (1-based line and column) of first occurrence of link or image source."""
+        positions = []
+        if link in self.hyperlinks:
+            positions.append(self.hyperlinks_positions[self.hyperlinks.index(link)])
+        if link in self.imgs:
+            positions.append(self.imgs_positions[self.imgs.index(link)])
+        if not positions:
+            return None
+        return min(positions)
+
+
+class _PositionBlockState(mistune.BlockState):
+    """Block state recording offset in source of each block token.
+
+    Offset of token is the first value of cursor set after previous token was added
+    (parser moves cursor to end of processed block). Tokens added in the same step
+    (e.g. list interrupted by block quote) get the same offset.
+    """
+
+    def __init__(self, parent=None):
+        self.tokens_starts: list[int] = []
+        self._next_start = 0
+        self._cursor = 0
+        super().__init__(parent)
+
+    @property
+    def cursor(self) -> int:
+        return self._cursor
+
+    @cursor.setter
+    def cursor(self, value: int):
+        self._cursor = value
+        if len(self.tokens) != len(self.tokens_starts):
+            self.getTokensStarts()
+            self._next_start = value
+
+    def getTokensStarts(self) -> list[int]:
+        tokens_num = len(self.tokens)
+        while len(self.tokens_starts) < tokens_num:
+            self.tokens_starts.append(self._next_start)
+        return self.tokens_starts
+
+
+class _SourceLocator:
+    """Find positions of links in source of document.
+
+    Links are searched forward inside current block, so repeated links get positions of
+    subsequent occurrences. If link can not be found in source (e.g. because of escaping)
+    then position of beginning of the block is returned.
+    """
+
+    def __init__(self, src):
+        self.src = src
+        self.block_start = 0
+        self.block_end = len(src)
+        self.search_pos = 0
+        self._lines_starts: list[int] | None = None
+
+    def setBlock(self, block_start, block_end):
+        self.block_start = block_start
+        self.block_end = block_end
+        self.search_pos = block_start
+
+    def locate(self, *texts) -> tuple[int, int]:
+        for text in texts:
+            if not text:
+                continue
+            text_pos = self.src.find(text, self.search_pos, self.block_end)
+            if text_pos >= 0:
+                self.search_pos = text_pos + len(text)
+                return self.getLineColumn(text_pos)
+        return self.getLineColumn(self.block_start)
+
+    def getLineColumn(self, offset) -> tuple[int, int]:
+        if self._lines_starts is None:
+            self._lines_starts = [0]
+            line_end = self.src.find("\n")
+            while line_end >= 0:
+                self._lines_starts.append(line_end + 1)
+                line_end = self.src.find("\n", line_end + 1)
+        line_index = bisect.bisect_right(self._lines_starts, offset) - 1
+        return line_index + 1, offset - self._lines_starts[line_index] + 1
+
+
+def extract_elements(
+    md_content, html_parser=DEFAULT_HTML_PARSER, converter: MarkdownConverter = None, ref_links: dict = None
+) -> MarkdownElements:
+    """Extract elements from Markdown content (with positions of links).
+
+    'html_parser' is backend parsing raw HTML embedded in content. 'converter' parses
+    Markdown (converter shared in process by default). 'ref_links' are reference link
+    definitions given in other part of document.
+    """
+    if converter is None:
+        converter = get_converter()
+    block_state = _PositionBlockState()
+    if ref_links:
+        block_state.env["ref_links"] = ref_links
+    tokens, state = converter.parse(md_content, block_state)
+    elements = MarkdownElements()
+    locator = _SourceLocator(state.src)
+    blocks_starts = state.getTokensStarts()
+    src_len = len(state.src)
+    block_end = 0
+    for index, token in enumerate(tokens):
+        block_start = blocks_starts[index]
+        if block_end <= block_start:
+            # blocks sharing start offset share range of source (offsets are not decreasing)
+            next_index = bisect.bisect_right(blocks_starts, block_start, index + 1)
+            block_end = blocks_starts[next_index] if next_index < len(blocks_starts) else src_len
+            locator.setBlock(block_start, block_end)
+        _extract_tokens([token], elements, locator, html_parser)
+    return elements
+
+
+def _extract_tokens(tokens, elements: MarkdownElements, locator: _SourceLocator, html_parser):
+    for token in tokens:
+        token_type = token["type"]
+        if token_type == "link":
+            link_url = token["attrs"]["url"]
+            elements.hyperlinks.append(link_url)
+            # reference link - URL is defined elsewhere
+            label = token.get("label")
+            ref_text = f"[{label}]" if label else None
+            elements.hyperlinks_positions.append(locator.locate(ref_text, link_url))
+        elif token_type == "image":
+            img_url = token["attrs"]["url"]
+            elements.imgs.append(img_url)
+            elements.imgs_positions.append(locator.locate(img_url))
+            # alternative text is not a part of document
+            continue
+        elif token_type == "heading":
+            elements.headers.append(_get_text(token["children"], html_parser))
+        elif token_type in ("block_html", "inline_html"):
+            _extract_html(token["raw"], elements, locator, html_parser)
+            continue
+
+        children = token.get("children")
+        if children:
+            _extract_tokens(children, elements, locator, html_parser)
+
+
+def _extract_html(html_content, elements: MarkdownElements, locator: _SourceLocator, html_parser):
+    # parser is imported only if document contains raw HTML
+    for tag_name, attrs, text in iter_html_elements(html_content, ["a", "img", *HEADER_TAGS], HEADER_TAGS, html_parser):
+        if tag_name == "a":
+            link_href = attrs.get("href")
+            if link_href is not None:
+                elements.hyperlinks.append(link_href)
+                elements.hyperlinks_positions.append(locator.locate(link_href, html.escape(link_href)))
+            link_id = attrs.get("id")
+            if link_id:
+                elements.anchors.append(link_id)
+            link_name = attrs.get("name")
+            if link_name:
+                elements.anchors.append(link_name)
+        elif tag_name == "img":
+            img_src = attrs.get("src")
+            if img_src is not None:
+                elements.imgs.append(img_src)
+                elements.imgs_positions.append(locator.locate(img_src, html.escape(img_src)))
+        else:
+            elements.headers.append(text)
+
+
+def _get_text(tokens, html_parser) -> str:
+    """Get text of inline tokens (the same as text of rendered HTML element)."""
+    ret_text = ""
+    for token in tokens:
+        token_type = token["type"]
+        if token_type == "text":
+            ret_text += html.unescape(token["raw"])
+        elif token_type == "codespan":
+            ret_text += token["raw"]
+        elif token_type in ("softbreak", "linebreak"):
+            ret_text += "\n"
+        elif token_type == "inline_html":
+            ret_text += get_html_text(token["raw"], html_parser)
+        elif token_type == "image":
+            # alternative text is not rendered as text
+            continue
+        else:
+            children = token.get("children")
+            if children:
+                ret_text += _get_text(children, html_parser)
+    return ret_text
@@ -0,0 +1,420 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Verification of many documents in single call. Documents share parsed
+# documents, anchors, file system queries and results of URL checks.
+#
+
+import logging
+import itertools
+
+from collections.abc import Iterator
+
+from mdlinkscheck.filechecker import FileChecker, DocumentRegistry
+from mdlinkscheck.urlchecker import URLChecker
+from mdlinkscheck.urlcache import URLCache
+from mdlinkscheck.incremental import get_checker_details
+from mdlinkscheck.report import InvalidLink, get_invalid_links
+from mdlinkscheck.stats import Stats, PHASE_URL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# maximal number of files whose external URLs are checked together
+URL_PREFETCH_FILES = 256
+
+
+# ===================================================================
+
+
+def verify_checker(
+    md_file,
+    *,
+    implicit_heading_github=False,
+    implicit_heading_bitbucket=False,
+    implicit_heading_gitlab=False,
+    check_url_reachable=False,
+    registry: DocumentRegistry = None,
+) -> FileChecker:
+    """Verify given Markdown file. Return checker holding results of verification.
+
+    Checker is returned directly, because it could be already removed from
+    'registry' (if number of documents in registry is limited).
+    """
+    if registry is None:
+        registry = DocumentRegistry()
+    checker = registry.getChecker(
+        md_file,
+        implicit_heading_id_github=implicit_heading_github,
+        implicit_heading_id_bitbucket=implicit_heading_bitbucket,
+        implicit_heading_id_gitlab=implicit_heading_gitlab,
+    )
+    checker.setOptions(check_url_reachable=check_url_reachable)
+    checker.checkMarkdown()
+    return checker
+
+
+def configure_logging(silence=False, logall=False):
+    if silence is True:
+        logging.getLogger().setLevel(logging.FATAL)
+    elif logall is True:
+        logging.basicConfig()
+        logging.getLogger().setLevel(logging.DEBUG)
+    else:
+        logging.basicConfig(format="%(message)s")
+        logging.getLogger().setLevel(logging.INFO)
+
+
+class _LogCollector(logging.Handler):
+    """Collects log records of worker process, so main process can log them in order of input files."""
+
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record):
+        # arguments of message could be not picklable
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+    def takeRecords(self) -> list[logging.LogRecord]:
+        ret_list = self.records
+        self.records = []
+        return ret_list
+
+
+# registry of worker process (used in parallel mode)
+_WORKER_REGISTRY: DocumentRegistry = None
+# log records of worker process (used in parallel mode)
+_WORKER_LOG: _LogCollector = None
+
+
+def _init_worker(log_level, url_cache_options, registry_options):
+    global _WORKER_REGISTRY, _WORKER_LOG  # pylint: disable=global-statement
+    # messages are passed to main process instead of writing them directly
+    # (handlers could be inherited from main process)
+    root_logger = logging.getLogger()
+    for logger in [root_logger, *logging.Logger.manager.loggerDict.values()]:
+        if isinstance(logger, logging.Logger):
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+            logger.propagate = True
+            logger.setLevel(logging.NOTSET)
+    _WORKER_LOG = _LogCollector()
+    root_logger.addHandler(_WORKER_LOG)
+    root_logger.setLevel(log_level)
+    url_cache = None
+    if url_cache_options is not None:
+        url_cache = URLCache(**url_cache_options)
+    _WORKER_REGISTRY = DocumentRegistry(url_checker=URLChecker(url_cache=url_cache), **registry_options)
+
+
+def _verify_worker(md_files, verify_options, collect_details, collect_report):
+    prev_stats = _WORKER_REGISTRY.collectStats()
+    prefetch_urls(_WORKER_REGISTRY, md_files, verify_options)
+    results = []
+    for md_file in md_files:
+        invalid_links, details, invalid_list = _verify_file(
+            _WORKER_REGISTRY, md_file, verify_options, collect_details, collect_report
+        )
+        results.append((md_file, invalid_links, details, invalid_list, _WORKER_LOG.takeRecords()))
+    stats = _WORKER_REGISTRY.collectStats().difference(prev_stats)
+    return results, stats
+
+
+def _log_records(records: list[logging.LogRecord]):
+    """Log records gathered by worker process."""
+    for record in records:
+        record_logger = logging.getLogger(record.name)
+        if record_logger.isEnabledFor(record.levelno):
+            record_logger.handle(record)
+
+
+def prefetch_urls(registry: DocumentRegistry, md_files, verify_options):
+    """Check concurrently external URLs of all given files (if URLs are checked at all).
+
+    Documents are loaded into 'registry', so they are not parsed again by verification
+    as long as registry can hold all of them.
+    """
+    if not verify_options.get("check_url_reachable", False):
+        return
+    urls = set()
+    for md_file in md_files:
+        checker = registry.getChecker(
+            md_file,
+            implicit_heading_id_github=verify_options.get("implicit_heading_github", False),
+            implicit_heading_id_bitbucket=verify_options.get("implicit_heading_bitbucket", False),
+            implicit_heading_id_gitlab=verify_options.get("implicit_heading_gitlab", False),
+        )
+        urls.update(checker.extractExternalURLs())
+    with registry.stats.measure(PHASE_URL):
+        registry.url_checker.prefetchURLs(urls)
+
+
+def _get_batch_size(registry: DocumentRegistry, verify_options, max_size=URL_PREFETCH_FILES) -> int:
+    """Return number of files verified together (URLs of files are checked together)."""
+    if not verify_options.get("check_url_reachable", False):
+        return 1
+    if registry.max_documents is not None:
+        # documents of batch have to stay in registry
+        max_size = min(max_size, registry.max_documents)
+    return max(1, max_size)
+
+
+def _split_batches(items, batch_size) -> Iterator[list]:
+    items_iter = iter(items)
+    while True:
+        batch = list(itertools.islice(items_iter, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _verify_file(registry: DocumentRegistry, md_file, verify_options, collect_details, collect_report=False):
+    checker = verify_checker(md_file, registry=registry, **verify_options)
+    invalid_links = checker.invalid_links
+    if not collect_details and not collect_report:
+        return invalid_links, None, None
+    details = get_checker_details(checker) if collect_details else None
+    invalid_list = get_invalid_links(checker) if collect_report else None
+    return invalid_links, details, invalid_list
+
+
+def verify_files(
+    md_files,
+    verify_options,
+    jobs=1,
+    url_checker: URLChecker = None,
+    url_cache_options: dict = None,
+    registry: DocumentRegistry = None,
+    registry_options: dict = None,
+    collect_details=False,
+    report_callback=None,
+):
+    """Verify given files. Return list of tuples (file, invalid links, details) in order of input files.
+
+    If 'jobs' is greater than 1 then files are verified in parallel by pool of processes.
+    Results of URL checks are shared between files ('url_checker'). Documents registry
+    is created with 'registry_options' (e.g. parsing engine) and 'url_cache_options'
+    unless 'registry' is given. In parallel mode each worker process has its own
+    registry with the same options as 'registry' (including persistent cache of URL
+    checks) and only timings and counters are gathered (added to 'stats' of registry).
+
+    If URLs are checked ('check_url_reachable') then external URLs of batches of files
+    are checked concurrently before files of batch are verified.
+
+    'details' are returned only if 'collect_details' is set (see 'get_checker_details()').
+    Messages of worker processes are logged by calling process in order of input files
+    (the same as in serial mode).
+
+    If 'report_callback' is given then it is called with file path and list of 'InvalidLink'
+    objects as soon as the file is verified (before remaining files are verified).
+    """
+    collect_report = report_callback is not None
+    if registry_options is None:
+        registry_options = {}
+    if registry is None:
+        if url_checker is None:
+            url_cache = URLCache(**url_cache_options) if url_cache_options is not None else None
+            url_checker = URLChecker(url_cache=url_cache)
+        registry = DocumentRegistry(url_checker=url_checker, **registry_options)
+
+    if jobs is None or jobs <= 1:
+        ret_list = []
+        batch_size = _get_batch_size(registry, verify_options)
+        for md_batch in _split_batches(md_files, batch_size):
+            prefetch_urls(registry, md_batch, verify_options)
+            for md_file in md_batch:
+                _LOGGER.info("file to check: %s", md_file)
+                invalid_links, details, invalid_list = _verify_file(
+                    registry, md_file, verify_options, collect_details, collect_report
+                )
+                if collect_report:
+                    report_callback(md_file, invalid_list)
+                ret_list.append((md_file, invalid_links, details))
+        return ret_list
+
+    # 'multiprocessing' is imported only in parallel mode
+    from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    # workers use the same options as registry of calling process
+    registry_options = registry.getOptions()
+    url_cache = registry.url_checker.url_cache
+    url_cache_options = url_cache.getOptions() if url_cache is not None else None
+    md_files = list(md_files)
+    # each worker gets a few batches (so work is distributed evenly)
+    files_per_batch = min(URL_PREFETCH_FILES, -(-len(md_files) // (jobs * 4)))
+    batch_size = _get_batch_size(registry, verify_options, files_per_batch)
+    ret_list = []
+    # workers gather messages on the same level as calling process
+    log_level = logging.getLogger("mdlinkscheck").getEffectiveLevel()
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(log_level, url_cache_options, registry_options)
+    ) as executor:
+        # 'map' keeps order of input items
+        results = executor.map(
+            _verify_worker,
+            _split_batches(md_files, batch_size),
+            itertools.repeat(verify_options),
+            itertools.repeat(collect_details),
+            itertools.repeat(collect_report),
+        )
+        for batch_results, stats in results:
+            registry.stats.merge(stats)
+            for md_file, invalid_links, details, invalid_list, records in batch_results:
+                _LOGGER.info("file to check: %s", md_file)
+                _log_records(records)
+                if collect_report:
+                    report_callback(md_file, invalid_list)
+                ret_list.append((md_file, invalid_links, details))
+    return ret_list
+
+
+# =======================================================
+
+
+class VerifyResult:
+    """Result of verification of single document.
+
+    'invalid_list' contains 'InvalidLink' objects (with category of failure and position in file).
+    """
+
+    def __init__(self, md_file, invalid_links: set[str], invalid_list: list[InvalidLink]):
+        self.md_file = md_file
+        self.invalid_links = invalid_links
+        self.invalid_list = invalid_list
+
+    @property
+    def valid(self) -> bool:
+        return not self.invalid_links
+
+    def toDict(self) -> dict:
+        return {
+            "file": self.md_file,
+            "valid": self.valid,
+            "invalid_links": [item.toDict() for item in self.invalid_list],
+        }
+
+    def __repr__(self):
+        return f"VerifyResult({self.toDict()})"
+
+
+class Project:
+    """Set of documents verified with the same options.
+
+    All calls share documents registry, so each document is parsed once, ids of its elements
+    are calculated once, each path is queried once and each URL is checked once. If 'jobs'
+    is greater than 1 then documents are verified in parallel by pool of processes (each
+    process has its own registry with options of 'registry', kept for time of single call).
+    """
+
+    def __init__(
+        self,
+        *,
+        implicit_heading_github=False,
+        implicit_heading_bitbucket=False,
+        implicit_heading_gitlab=False,
+        check_url_reachable=False,
+        jobs=1,
+        registry: DocumentRegistry = None,
+        registry_options: dict = None,
+        url_cache_options: dict = None,
+    ):
+        self.verify_options = {
+            "implicit_heading_github": implicit_heading_github,
+            "implicit_heading_bitbucket": implicit_heading_bitbucket,
+            "implicit_heading_gitlab": implicit_heading_gitlab,
+            "check_url_reachable": check_url_reachable,
+        }
+        self.jobs = jobs
+        if registry_options is None:
+            registry_options = {}
+        self.registry_options = registry_options
+        self.url_cache_options = url_cache_options
+        if registry is None:
+            url_cache = None
+            if url_cache_options is not None:
+                url_cache = URLCache(**url_cache_options)
+            registry = DocumentRegistry(url_checker=URLChecker(url_cache=url_cache), **registry_options)
+        self.registry = registry
+
+    def verify(self, md_file) -> VerifyResult:
+        return self.verifyMany([md_file], jobs=1)[0]
+
+    def verifyMany(self, md_files, jobs=None) -> list[VerifyResult]:
+        """Verify given files. Return results in order of input files."""
+        if jobs is None:
+            jobs = self.jobs
+        invalid_lists = {}
+
+        def collect_report(md_file, invalid_list):
+            invalid_lists[md_file] = invalid_list
+
+        results = verify_files(
+            md_files,
+            self.verify_options,
+            jobs=jobs,
+            registry=self.registry,
+            report_callback=collect_report,
+        )
+        return [
+            VerifyResult(md_file, invalid_links, invalid_lists.get(md_file, []))
+            for md_file, invalid_links, _details in results
+        ]
+
+    def extractLinks(self, md_file) -> set[str]:
+        """Extract hyperlinks and images of given file (parsed document is kept in registry)."""
+        checker = self.registry.getChecker(
+            md_file,
+            implicit_heading_id_github=self.verify_options["implicit_heading_github"],
+            implicit_heading_id_bitbucket=self.verify_options["implicit_heading_bitbucket"],
+            implicit_heading_id_gitlab=self.verify_options["implicit_heading_gitlab"],
+        )
+        return checker.extractLinks()
+
+    def getStats(self) -> Stats:
+        return self.registry.collectStats()
+
+    def close(self):
+        self.registry.url_checker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def verify_many(
+    md_files,
+    *,
+    implicit_heading_github=False,
+    implicit_heading_bitbucket=False,
+    implicit_heading_gitlab=False,
+    check_url_reachable=False,
+    jobs=1,
+    registry: DocumentRegistry = None,
+) -> list[VerifyResult]:
+    """Verify given Markdown files sharing parsed documents and caches. Return results in order of input files."""
+    project = Project(
+        implicit_heading_github=implicit_heading_github,
+        implicit_heading_bitbucket=implicit_heading_bitbucket,
+        implicit_heading_gitlab=implicit_heading_gitlab,
+        check_url_reachable=check_url_reachable,
+        jobs=jobs,
+        registry=registry,
+    )
+    results = project.verifyMany(md_files)
+    if registry is None:
+        project.close()
+    return results
@@ -10,130 +10,399 @@ import os
 import logging
 import tempfile
 import hashlib
+import itertools
+import contextlib
+import warnings
 
-import requests
-import validators
+from collections import OrderedDict
 
-import mistune
+from typing import TYPE_CHECKING
 
 # import markdown2        # invalid conversion - converts content of code block
 # import markdown         # invalid conversion - converts content of code block
 
-from bs4 import BeautifulSoup
+from mdlinkscheck.urlchecker import URLChecker
+from mdlinkscheck.pathcache import PathCache
+from mdlinkscheck.linkclassifier import (
+    classify_link,
+    LINK_MAILTO,
+    LINK_URL,
+    LINK_FRAGMENT,
+    LINK_MALFORMED,
+)
+from mdlinkscheck.anchorindex import (  # noqa: F401 - 'convert_header_*' functions are re-exported
+    build_anchor_index,
+    convert_header_to_github_target,
+    convert_header_to_bitbucket_target,
+    HEADER_TAGS,
+    HEADING_ID_GITHUB,
+    HEADING_ID_BITBUCKET,
+    HEADING_ID_GITLAB,
+)
+from mdlinkscheck.summary import DocumentSummary, SummaryBuilder, summarize_elements, summarize_html
+from mdlinkscheck.htmlparser import DEFAULT_HTML_PARSER
+from mdlinkscheck.mdconverter import MarkdownConverter, get_converter
+from mdlinkscheck.stats import (
+    Stats,
+    PHASE_READ,
+    PHASE_CONVERT,
+    PHASE_PARSE,
+    PHASE_FILESYSTEM,
+    PHASE_URL,
+    COUNTER_FILES_VERIFIED,
+    COUNTER_FILES_PARSED,
+    COUNTER_FILES_REPARSED,
+    COUNTER_STAT_CALLS,
+    COUNTER_STAT_CACHE_HITS,
+    COUNTER_URL_REQUESTS,
+    COUNTER_URL_SAVED,
+    COUNTER_URL_CACHE_HITS,
+)
+
+if TYPE_CHECKING:
+    from mdlinkscheck.astextractor import MarkdownElements
 
 _LOGGER = logging.getLogger(__name__)
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
+# extract elements directly from Markdown syntax tree
+ENGINE_AST = "ast"
+# convert Markdown to HTML and extract elements from HTML
+ENGINE_HTML = "html"
+
+ENGINES_LIST = [ENGINE_AST, ENGINE_HTML]
+DEFAULT_ENGINE = ENGINE_AST
+
+# number of documents kept in registry in low memory mode
+DEFAULT_LOW_MEMORY_MAX_DOCUMENTS = 256
+
+
+# categories of invalid links
+INVALID_MALFORMED = "malformed"  # link can not be interpreted
+INVALID_MISSING_FILE = "missing_file"  # local file does not exist
+INVALID_MISSING_README = "missing_readme"  # link points to directory without README.md
+INVALID_MISSING_ANCHOR = "missing_anchor"  # element pointed by link does not exist
+INVALID_UNREACHABLE = "unreachable"  # external URL is not reachable
+
+INVALID_CATEGORIES_LIST = [
+    INVALID_MALFORMED,
+    INVALID_MISSING_FILE,
+    INVALID_MISSING_README,
+    INVALID_MISSING_ANCHOR,
+    INVALID_UNREACHABLE,
+]
+
+
 # ===================================================================
 
 
 class FileChecker:
-    def __init__(self, md_path):
+    def __init__(
+        self,
+        md_path,
+        registry: "DocumentRegistry" = None,
+        engine: str = None,
+        md_content: str = None,
+        dump_html_dir: str = None,
+        low_memory: bool = None,
+        html_parser: str = None,
+        converter: MarkdownConverter = None,
+        streaming: bool = None,
+    ):
+        """Load Markdown document.
+
+        If 'md_content' is given then document is not read from 'md_path' (path is then used only
+        to resolve relative links). If 'dump_html_dir' is given then document converted to HTML
+        is stored in the directory (for debug purpose). If 'low_memory' is set then parse tree
+        is replaced by compact summary right after parsing (positions of links are not kept).
+        'html_parser' is backend parsing HTML (see 'mdlinkscheck.htmlparser'). 'converter' parses
+        Markdown (by default converter of registry or converter shared in process). If 'streaming'
+        is set then file is read and parsed in parts of whole top-level blocks and only compact
+        summary is kept (memory does not depend on size of file).
+        """
         self.implicit_heading_id_github: bool = False
         self.implicit_heading_id_bitbucket: bool = False
+        self.implicit_heading_id_gitlab: bool = False
         self.check_url_reachable: bool = False
 
         self.md_file = md_path
+        self.registry = registry
+        if engine is None:
+            engine = registry.engine if registry is not None else DEFAULT_ENGINE
+        self.engine = engine
+        if dump_html_dir is None and registry is not None:
+            dump_html_dir = registry.dump_html_dir
+        self.dump_html_dir = dump_html_dir
+        if low_memory is None:
+            low_memory = registry.low_memory if registry is not None else False
+        self.low_memory = low_memory
+        if html_parser is None:
+            html_parser = registry.html_parser if registry is not None else DEFAULT_HTML_PARSER
+        self.html_parser = html_parser
+        if converter is None:
+            converter = registry.converter if registry is not None else get_converter()
+        self.converter: MarkdownConverter = converter
+        if streaming is None:
+            streaming = registry.streaming if registry is not None else False
+        self.streaming = streaming
+        # timings and counters (shared by checkers of registry)
+        self.stats: Stats = registry.stats if registry is not None else Stats()
         md_dir = os.path.dirname(md_path)
         self.md_dir = os.path.abspath(md_dir)
-        self.soup: BeautifulSoup = None
-        self.local_targets: set[str] | None = None
+        self.elements: "MarkdownElements" = None  # set only by AST engine
+        self.summary: DocumentSummary | None = None  # set by HTML engine and in low memory mode
+        self.local_targets: frozenset[str] | None = None
         self.valid_links = None
         self.invalid_links = None
+        # category of each invalid link (reason of failure)
+        self.invalid_categories: dict[str, str] = {}
+        # local files pointed by valid links (with anchors of file if link points to element)
+        self.dependencies: dict[str, set[str] | None] = {}
+        # expected real paths of missing local files pointed by invalid links (file could appear later)
+        self.missing_paths: set[str] = set()
+        # content was read from 'md_file' (not given directly)
+        self.from_file: bool = md_content is None
         # load required data
-        self._load()
+        self._load(md_content)
+
+    @property
+    def soup(self):
+        """Deprecated: parsed HTML tree is no longer kept (see 'summary'). Always 'None'."""
+        warnings.warn("'FileChecker.soup' is deprecated, use 'summary' instead", DeprecationWarning, stacklevel=2)
+        return None
 
     @staticmethod
-    def initializeByContent(md_content) -> "FileChecker":
-        with tempfile.NamedTemporaryFile(delete=False) as file:
-            file.write(md_content.encode("utf-8"))
-            file.close()
-            return FileChecker(file.name)
+    def initializeByContent(md_content, md_path=None) -> "FileChecker":
+        """Create checker of given Markdown content (without writing it to disk).
+
+        Relative links are resolved against directory of 'md_path' (temporary directory by default).
+        """
+        if md_path is None:
+            md_path = os.path.join(tempfile.gettempdir(), "md_content.md")
+        return FileChecker(md_path, md_content=md_content)
 
     def setOptions(
         self,
         *,
         implicit_heading_id_github: bool = None,
         implicit_heading_id_bitbucket: bool = None,
+        implicit_heading_id_gitlab: bool = None,
         check_url_reachable: bool = None,
     ):
-        if implicit_heading_id_github is not None:
+        if implicit_heading_id_github is not None and implicit_heading_id_github != self.implicit_heading_id_github:
             self.implicit_heading_id_github = implicit_heading_id_github
-        if implicit_heading_id_bitbucket is not None:
+            # targets depend on heading ids - calculate them again
+            self.local_targets = None
+        if (
+            implicit_heading_id_bitbucket is not None
+            and implicit_heading_id_bitbucket != self.implicit_heading_id_bitbucket
+        ):
             self.implicit_heading_id_bitbucket = implicit_heading_id_bitbucket
+            # targets depend on heading ids - calculate them again
+            self.local_targets = None
+        if implicit_heading_id_gitlab is not None and implicit_heading_id_gitlab != self.implicit_heading_id_gitlab:
+            self.implicit_heading_id_gitlab = implicit_heading_id_gitlab
+            # targets depend on heading ids - calculate them again
+            self.local_targets = None
         if check_url_reachable is not None:
             self.check_url_reachable = check_url_reachable
 
-    def _load(self):
+    def _load(self, md_content=None):
+        if md_content is None and self.streaming:
+            self._loadStream()
+            return
+        if md_content is None:
+            try:
+                with self.stats.measure(PHASE_READ), open(self.md_file, encoding="utf-8") as file:
+                    md_content = file.read()
+            except FileNotFoundError as exc:
+                _LOGGER.warning("could not open md file: %s", exc)
+                return
+
+        self.stats.increment(COUNTER_FILES_PARSED)
+        html_content = None
+        if self.engine == ENGINE_AST:
+            from mdlinkscheck.astextractor import extract_elements  # pylint: disable=import-outside-toplevel
+
+            with self.stats.measure(PHASE_PARSE):
+                self.elements = extract_elements(md_content, self.html_parser, self.converter)
+        else:
+            with self.stats.measure(PHASE_CONVERT):
+                html_content = convert_md_to_html(md_content, self.converter)
+            with self.stats.measure(PHASE_PARSE):
+                # HTML tree is not kept - elements are collected during traversal
+                self.summary = summarize_html(html_content, self.html_parser)
+
+        if self.dump_html_dir:
+            if html_content is None:
+                with self.stats.measure(PHASE_CONVERT):
+                    html_content = convert_md_to_html(md_content, self.converter)
+            self._dumpHtml(html_content)
+
+        if self.low_memory and self.elements is not None:
+            # keep only data required to verify links
+            self.summary = summarize_elements(self.elements)
+            self.elements = None
+
+    def _loadStream(self):
+        """Parse file part by part collecting summary of document."""
+        from mdlinkscheck.mdstream import iter_md_chunks, update_ref_links  # pylint: disable=import-outside-toplevel
+
+        ref_links: dict = {}
         try:
+            # reference links can be defined after use - collect definitions first
             with open(self.md_file, encoding="utf-8") as file:
-                md_content = file.read()
+                for md_chunk in self.stats.measureIter(iter_md_chunks(file), PHASE_READ):
+                    with self.stats.measure(PHASE_PARSE):
+                        update_ref_links(ref_links, md_chunk, self.converter)
         except FileNotFoundError as exc:
             _LOGGER.warning("could not open md file: %s", exc)
             return
 
-        tmp_dir = tempfile.gettempdir()
-        tmp_dir = os.path.join(tmp_dir, "mdlinkscheck")
-        os.makedirs(tmp_dir, exist_ok=True)
+        self.stats.increment(COUNTER_FILES_PARSED)
+        builder = SummaryBuilder()
+        dump_context = contextlib.nullcontext()
+        if self.dump_html_dir:
+            dump_context = open(self._getDumpPath(), "w", encoding="utf-8")  # pylint: disable=consider-using-with
+        with open(self.md_file, encoding="utf-8") as file, dump_context as dump_file:
+            for md_chunk in self.stats.measureIter(iter_md_chunks(file), PHASE_READ):
+                html_content = None
+                if self.engine == ENGINE_AST:
+                    from mdlinkscheck.astextractor import extract_elements  # pylint: disable=import-outside-toplevel
+
+                    with self.stats.measure(PHASE_PARSE):
+                        builder.add(extract_elements(md_chunk, self.html_parser, self.converter, ref_links))
+                else:
+                    with self.stats.measure(PHASE_CONVERT):
+                        html_content = self.converter.toHtml(md_chunk, ref_links)
+                    with self.stats.measure(PHASE_PARSE):
+                        builder.add(summarize_html(html_content, self.html_parser))
+                if dump_file is not None:
+                    if html_content is None:
+                        with self.stats.measure(PHASE_CONVERT):
+                            html_content = self.converter.toHtml(md_chunk, ref_links)
+                    dump_file.write(html_content)
+        self.summary = builder.build()
+
+    def _dumpHtml(self, html_content):
+        with open(self._getDumpPath(), "w", encoding="utf-8") as file:
+            file.write(html_content)
+
+    def _getDumpPath(self):
+        os.makedirs(self.dump_html_dir, exist_ok=True)
         tmp_path = self.md_file.replace("/", "_")
         tmp_path = tmp_path.replace("\\", "_")
 
         encoded_path = tmp_path.encode("utf-8")
         hash_value = hashlib.md5(encoded_path).hexdigest()  # nosec # noqa: S324
-        hash_path = f"{tmp_dir}/page_{hash_value}.html"
-
-        html_content = convert_md_to_html(md_content)
-        with open(hash_path, "w", encoding="utf-8") as file:
-            file.write(html_content)
-
-        self.soup = BeautifulSoup(html_content, "html.parser")
+        return os.path.join(self.dump_html_dir, f"page_{hash_value}.html")
 
     def _prepare(self):
         self.valid_links = set()
         self.invalid_links = set()
+        self.invalid_categories = {}
+        self.dependencies = {}
+        self.missing_paths = set()
+        self._prepareTargets()
+
+    def _prepareTargets(self):
         if self.local_targets is None:
             self.local_targets = self._getElementsIds()
 
     # return 'True' is everything ok, otherwise 'False'
     def checkMarkdown(self) -> bool:
         self._prepare()
+        self.stats.increment(COUNTER_FILES_VERIFIED)
+
+        if self.check_url_reachable:
+            # check all external URLs of document at once (URLs already known are not requested again)
+            external_urls = self.extractExternalURLs()
+            with self.stats.measure(PHASE_URL):
+                self._getRegistry().url_checker.checkURLs(external_urls)
 
         self._checkHyperlinks()
         self._checkImgs()
 
         return len(self.invalid_links) == 0
 
+    def getLocalTargets(self) -> set[str]:
+        """Return ids of elements that can be pointed by links."""
+        self._prepareTargets()
+        return self.local_targets
+
     def checkURLReachable(self, url):
         return self._checkReachableURL(url)
 
+    def getSummary(self) -> "DocumentSummary | MarkdownElements":
+        """Return elements of document required to verify links.
+
+        Elements are collected in single traversal of document (syntax tree walk of AST engine
+        collects them during parsing).
+        """
+        if self.summary is not None:
+            return self.summary
+        if self.elements is not None:
+            return self.elements
+        # document not loaded
+        return DocumentSummary()
+
+    def extractLinks(self) -> set[str]:
+        """Extract hyperlinks and images."""
+        return self.extractHyperlinks() | self.extractImgs()
+
     def extractHyperlinks(self) -> set[str]:
-        ret_set = set()
-        for link in self.soup.find_all("a"):
-            link_href = link.get("href")
+        return set(self._getHyperlinks())
+
+    def extractImgs(self) -> set[str]:
+        return set(self._getImgs())
+
+    def _getHyperlinks(self) -> list[str]:
+        """Return hyperlinks in order of occurrence (without repetitions)."""
+        ret_dict = {}
+        for link_href in self.getSummary().hyperlinks:
             if not link_href:
                 continue
             if link_href.startswith("javascript"):  # type: ignore[union-attr]
                 # skip java script urls
                 continue
-            ret_set.add(link_href)
-        return ret_set  # type: ignore[return-value]
+            ret_dict[link_href] = None
+        return list(ret_dict)
 
-    def extractImgs(self) -> set[str]:
+    def _getImgs(self) -> list[str]:
+        """Return sources of images in order of occurrence (without repetitions)."""
+        return list(dict.fromkeys(img_src for img_src in self.getSummary().imgs if img_src))
+
+    def getLinkPosition(self, link) -> tuple[int, int] | None:
+        """Return position (1-based line and column) of first occurrence of link or image in document.
+
+        Positions are known only in case of AST engine, otherwise 'None' is returned.
+        """
+        if self.elements is None:
+            return None
+        return self.elements.getPosition(link)
+
+    def extractExternalURLs(self) -> set[str]:
+        """Extract URLs of external resources pointed by hyperlinks and images."""
         ret_set = set()
-        for img in self.soup.find_all("img"):
-            img_src = img.get("src")
-            if not img_src:
-                continue
-            ret_set.add(img_src)
-        return ret_set  # type: ignore[return-value]
+        for link in itertools.chain(self.extractHyperlinks(), self.extractImgs()):
+            link_info = classify_link(link)
+            if link_info.kind == LINK_URL:
+                ret_set.add(link_info.url)
+        return ret_set
 
     # ============================================================================
 
+    def _getRegistry(self) -> "DocumentRegistry":
+        if self.registry is None:
+            self.registry = DocumentRegistry(stats=self.stats)
+        return self.registry
+
     def _checkHyperlinks(self):
         """Check <a> tag."""
-        links_list = self.extractHyperlinks()
+        # links are checked in order of occurrence (messages are logged in deterministic order)
+        links_list = self._getHyperlinks()
         for link_href in links_list:
             if self._checkHref(link_href):
                 # valid link
@@ -145,56 +414,69 @@ class FileChecker:
     def _checkImgs(self):
         """Check <img> tag."""
         # check is 'src' points to local file or to external valid URL
-        links_list = self.extractImgs()
+        links_list = self._getImgs()
         for img_src in links_list:
-            if self._checkLocalFile(img_src):
-                # valid regular file or directory
-                self.valid_links.add(img_src)
-                continue
-            if self._checkValidURL(img_src) and self._checkReachableURL(img_src):
-                # valid url
-                self.valid_links.add(img_src)
-                continue
+            link_info = classify_link(img_src)
+            if link_info.kind == LINK_URL:
+                if self._checkReachableURL(link_info.url):
+                    # valid url
+                    self.valid_links.add(img_src)
+                    continue
+                self._markInvalid(img_src, INVALID_UNREACHABLE, "invalid link")
+            else:
+                local_file = self._checkLocalFile(img_src)
+                if local_file:
+                    # valid regular file or directory
+                    self._addDependency(local_file)
+                    self.valid_links.add(img_src)
+                    continue
+                self._addMissing(img_src)
+                self._markInvalid(img_src, INVALID_MISSING_FILE, "invalid link")
 
             # invalid
-            _LOGGER.warning("invalid link: %s in %s", img_src, self.md_file)
             self.invalid_links.add(img_src)
 
     def _checkHref(self, link_href):
-        if link_href.startswith("mailto:"):
+        link_info = classify_link(link_href)
+        if link_info.kind == LINK_MAILTO:
             # consider "mailto" always valid
             return True
 
-        if self._checkLocalFile(link_href):
+        if link_info.kind == LINK_URL:
+            if not self._checkReachableURL(link_info.url):
+                return self._markInvalid(link_href, INVALID_UNREACHABLE, "invalid link (unreachable)")
+            # valid url
+            return True
+
+        # local file name can contain '#' character
+        local_file = self._checkLocalFile(link_href)
+        if local_file:
             # valid local file
+            self._addDependency(local_file)
             return True
         local_dir = self._checkLocalDir(link_href)
         if local_dir:
-            if not self._checkLocalREADME(local_dir):
-                _LOGGER.warning("invalid path (missing README.md): %s in %s", link_href, self.md_file)
-                return False
+            local_file = self._checkLocalREADME(local_dir)
+            if not local_file:
+                self.missing_paths.add(os.path.realpath(os.path.join(self.md_dir, local_dir, "README.md")))
+                return self._markInvalid(link_href, INVALID_MISSING_README, "invalid path (missing README.md)")
             # valid local dir
+            self._addDependency(local_file)
             return True
 
-        if self._checkValidURL(link_href):
-            if not self._checkReachableURL(link_href):
-                _LOGGER.warning("invalid link (unreachable): %s in %s", link_href, self.md_file)
-                return False
-            # valid url
-            return True
-
-        target_data = link_href.split("#")
-        if len(target_data) != 2:
+        if link_info.kind == LINK_MALFORMED:
             # invalid URL - there must be more than one # character
-            _LOGGER.warning("invalid link: %s in %s", link_href, self.md_file)
-            return False
+            return self._markInvalid(link_href, INVALID_MALFORMED, "invalid link")
+        if link_info.fragment is None:
+            # not URL and not existing path
+            self._addMissing(link_href)
+            return self._markInvalid(link_href, INVALID_MISSING_FILE, "invalid link")
 
         # url with target
-        target_url = target_data[0]
-        target_id = target_data[1]
-        target_id = target_id.lower()
+        target_url = link_info.path
+        target_id = link_info.fragment.lower()
 
-        if not target_url:
+        if link_info.kind == LINK_FRAGMENT:
             # current file
             if target_id == "":
                 # "back to top" special link
@@ -206,15 +488,7 @@ class FileChecker:
             if self._checkLocalTarget(target_id):
                 # found local target
                 return True
-            _LOGGER.warning("invalid link: %s in %s", link_href, self.md_file)
-            return False
-
-        if self._checkValidURL(target_url):
-            if not self._checkReachableURL(target_url):
-                _LOGGER.warning("invalid link (unreachable): %s in %s", link_href, self.md_file)
-                return False
-            # valid url
-            return True
+            return self._markInvalid(link_href, INVALID_MISSING_ANCHOR, "invalid link")
 
         # other file
         local_dir = self._checkLocalDir(target_url)
@@ -223,50 +497,89 @@ class FileChecker:
             local_file = self._checkLocalREADME(local_dir)
             if not local_file:
                 # invalid file - missing README.md
-                _LOGGER.warning("invalid path (missing README.md): %s in %s", link_href, self.md_file)
-                return False
+                self.missing_paths.add(os.path.realpath(os.path.join(self.md_dir, local_dir, "README.md")))
+                return self._markInvalid(link_href, INVALID_MISSING_README, "invalid path (missing README.md)")
         else:
             local_file = self._checkLocalFile(target_url)
             if not local_file:
-                # invalid file - missing README.md
-                _LOGGER.warning("invalid path: %s in %s", link_href, self.md_file)
-                return False
+                # invalid file
+                self._addMissing(target_url)
+                return self._markInvalid(link_href, INVALID_MISSING_FILE, "invalid path")
 
         # here 'local_file' points to valid file
 
         if target_id == "":
             # "back to top" special link
+            self._addDependency(local_file)
             return True
         if target_id == "top":
             # "back to top" special link
+            self._addDependency(local_file)
             return True
 
-        checker = FileChecker(local_file)
-        checker.setOptions(
+        local_targets = self._getRegistry().getLocalTargets(
+            local_file,
             implicit_heading_id_github=self.implicit_heading_id_github,
             implicit_heading_id_bitbucket=self.implicit_heading_id_bitbucket,
-            check_url_reachable=self.check_url_reachable,
+            implicit_heading_id_gitlab=self.implicit_heading_id_gitlab,
         )
-        checker._prepare()  # pylint: disable=protected-access
-        if not checker._checkLocalTarget(target_id):  # pylint: disable=protected-access
-            _LOGGER.warning("invalid link: %s in %s", link_href, self.md_file)
-            return False
+        if target_id not in local_targets:
+            return self._markInvalid(link_href, INVALID_MISSING_ANCHOR, "invalid link")
+        self._addDependency(local_file, local_targets)
         return True
 
+    def _markInvalid(self, link, category, message) -> bool:
+        """Log invalid link and store category of failure. Always return 'False'."""
+        _LOGGER.warning("%s: %s in %s", message, link, self.md_file)
+        self.invalid_categories[link] = category
+        return False
+
+    def _addDependency(self, local_path, targets=None):
+        dep_path = os.path.realpath(local_path)
+        if targets is not None:
+            self.dependencies[dep_path] = targets
+        else:
+            self.dependencies.setdefault(dep_path, None)
+
+    def _addMissing(self, local_path):
+        """Remember where missing file pointed by link is expected."""
+        if os.path.isabs(local_path):
+            repo_root = self._getRegistry().path_cache.findRepositoryRoot(self.md_dir)
+            if repo_root is not None:
+                # absolute path is relative to repository's root directory
+                local_path = os.path.join(repo_root, "." + local_path)
+        else:
+            local_path = os.path.join(self.md_dir, local_path)
+        self.missing_paths.add(os.path.realpath(local_path))
+
     def _checkLocalFile(self, path):
-        if os.path.isfile(path):
+        with self.stats.measure(PHASE_FILESYSTEM):
+            return self._findLocalFile(path)
+
+    def _findLocalFile(self, path):
+        path_cache = self._getRegistry().path_cache
+        if path_cache.isfile(path):
             # valid file
             return path
 
         if os.path.isabs(path):
             # in Markdown there can be absolute path to file
             # the path then will be relative to repositoy's root directory
-            # workaround: iterate all path parents and try if file exists
             relative_path = "." + path
+            repo_root = path_cache.findRepositoryRoot(self.md_dir)
+            if repo_root is not None:
+                rel_path = os.path.join(repo_root, relative_path)
+                if path_cache.isfile(rel_path):
+                    # valid file
+                    return rel_path
+                return None
+
+            # repository not detected
+            # workaround: iterate all path parents and try if file exists
             curr_path = self.md_dir
             while True:
                 rel_path = os.path.join(curr_path, relative_path)
-                if os.path.isfile(rel_path):
+                if path_cache.isfile(rel_path):
                     # valid file
                     return rel_path
 
@@ -278,7 +591,7 @@ class FileChecker:
                 curr_path = next_path
 
         rel_path = os.path.join(self.md_dir, path)
-        if os.path.isfile(rel_path):
+        if path_cache.isfile(rel_path):
             # valid file
             return rel_path
         return None
@@ -293,122 +606,205 @@ class FileChecker:
         return local_file
 
     def _checkLocalDir(self, path):
-        if os.path.isdir(path):
-            # valid directory
-            return path
-        rel_path = os.path.join(self.md_dir, path)
-        if os.path.isdir(rel_path):
-            # valid directory
-            return path
+        path_cache = self._getRegistry().path_cache
+        with self.stats.measure(PHASE_FILESYSTEM):
+            if path_cache.isdir(path):
+                # valid directory
+                return path
+            rel_path = os.path.join(self.md_dir, path)
+            if path_cache.isdir(rel_path):
+                # valid directory
+                return path
         return None
 
-    def _checkValidURL(self, file_href):
-        return validators.url(file_href)
-
     def _checkReachableURL(self, url):
         if not self.check_url_reachable:
             # do not check
             return True
 
-        try:
-            headers = {"User-Agent": "My User Agent 1.0"}
-            response = requests.head(url, timeout=15, headers=headers, allow_redirects=True)
-            # _LOGGER.info("link %s response code: %s", url, response.status_code)
-        except requests.exceptions.ConnectionError:
-            return False
-
-        return response.status_code == 200
+        with self.stats.measure(PHASE_URL):
+            return self._getRegistry().url_checker.checkURL(url)
 
     def _checkLocalTarget(self, target_label):
         return target_label in self.local_targets
 
-    def _getElementsIds(self):
-        # on GitHub headers are converted to targets
-        header_labels = extract_header_labels(self.soup)
+    def _getElementsIds(self) -> frozenset[str]:
+        summary = self.getSummary()
+        return build_anchor_index(summary.anchors, summary.headers, self.getHeadingDialects())
 
-        # header_labels_underscore = [convert_header_to_underscore(item) for item in header_labels]
+    def getHeadingDialects(self) -> list[str]:
+        """Return dialects of implicit heading ids enabled in checker."""
+        ret_list = []
+        if self.implicit_heading_id_github:
+            ret_list.append(HEADING_ID_GITHUB)
+        if self.implicit_heading_id_bitbucket:
+            ret_list.append(HEADING_ID_BITBUCKET)
+        if self.implicit_heading_id_gitlab:
+            ret_list.append(HEADING_ID_GITLAB)
+        return ret_list
 
-        anchor_targets = set()
-        for link in self.soup.find_all("a"):
-            link_id = link.get("id")
-            if link_id:
-                anchor_targets.add(link_id)
-            link_name = link.get("name")
-            if link_name:
-                anchor_targets.add(link_name)
 
-        ret_data = set()
-        ret_data.update(anchor_targets)
-        # ret_data.update(header_labels)
-        # ret_data.update(header_labels_underscore)
+# =======================================================
 
-        if self.implicit_heading_id_github:
-            # github compatibility
-            header_labels_github = [convert_header_to_github_target(item) for item in header_labels]
-            ret_data.update(header_labels_github)
 
-        if self.implicit_heading_id_bitbucket:
-            # bitbucket compatibility
-            header_labels_bitbucket = [convert_header_to_bitbucket_target(item) for item in header_labels]
-            ret_data.update(header_labels_bitbucket)
+class DocumentRegistry:
+    """Registry of parsed Markdown documents shared by checkers during single run.
 
-        return ret_data
+    Each document is loaded only once for given set of heading id options. In low memory mode
+    documents are kept as compact summaries and at most 'max_documents' of them stay in
+    registry (least recently used documents are removed and loaded again when needed).
+    Ids of elements of documents are kept regardless of the limit, so links to elements
+    of removed documents do not require loading them again.
+    """
+
+    def __init__(
+        self,
+        url_checker: URLChecker = None,
+        engine: str = DEFAULT_ENGINE,
+        dump_html_dir: str = None,
+        path_cache: PathCache = None,
+        low_memory: bool = False,
+        max_documents: int = None,
+        stats: Stats = None,
+        html_parser: str = DEFAULT_HTML_PARSER,
+        converter: MarkdownConverter = None,
+        streaming: bool = False,
+    ):
+        self._checkers: OrderedDict[tuple[str, bool, bool, bool], FileChecker] = OrderedDict()
+        self._targets: dict[tuple[str, bool, bool, bool], frozenset[str]] = {}
+        # keys of all documents loaded so far (to detect loading the same document again)
+        self._loaded_keys: set[tuple[str, bool, bool, bool]] = set()
+        if url_checker is None:
+            url_checker = URLChecker()
+        self.url_checker: URLChecker = url_checker
+        if path_cache is None:
+            path_cache = PathCache()
+        self.path_cache: PathCache = path_cache
+        self.engine = engine
+        self.dump_html_dir = dump_html_dir
+        self.low_memory = low_memory
+        self.html_parser = html_parser
+        if converter is None:
+            converter = get_converter()
+        # parser of Markdown shared by all documents
+        self.converter: MarkdownConverter = converter
+        self.streaming = streaming
+        if max_documents is None and low_memory:
+            max_documents = DEFAULT_LOW_MEMORY_MAX_DOCUMENTS
+        self.max_documents = max_documents
+        if stats is None:
+            stats = Stats()
+        self.stats: Stats = stats
+
+    def getOptions(self) -> dict:
+        """Return options of registry (to create equivalent registry, e.g. in worker process)."""
+        return {
+            "engine": self.engine,
+            "dump_html_dir": self.dump_html_dir,
+            "low_memory": self.low_memory,
+            "max_documents": self.max_documents,
+            "html_parser": self.html_parser,
+            "converter": self.converter,
+            "streaming": self.streaming,
+        }
+
+    def getChecker(
+        self,
+        md_path,
+        *,
+        implicit_heading_id_github: bool = False,
+        implicit_heading_id_bitbucket: bool = False,
+        implicit_heading_id_gitlab: bool = False,
+    ) -> FileChecker:
+        key = (
+            os.path.realpath(md_path),
+            implicit_heading_id_github,
+            implicit_heading_id_bitbucket,
+            implicit_heading_id_gitlab,
+        )
+        checker = self._checkers.get(key)
+        if checker is not None:
+            self._checkers.move_to_end(key)
+            return checker
+        if key in self._loaded_keys:
+            self.stats.increment(COUNTER_FILES_REPARSED)
+        self._loaded_keys.add(key)
+        checker = FileChecker(md_path, registry=self)
+        checker.setOptions(
+            implicit_heading_id_github=implicit_heading_id_github,
+            implicit_heading_id_bitbucket=implicit_heading_id_bitbucket,
+            implicit_heading_id_gitlab=implicit_heading_id_gitlab,
+        )
+        self._checkers[key] = checker
+        if self.max_documents is not None:
+            while len(self._checkers) > self.max_documents:
+                # remove least recently used document
+                self._checkers.popitem(last=False)
+        return checker
+
+    def getLocalTargets(
+        self,
+        md_path,
+        *,
+        implicit_heading_id_github: bool = False,
+        implicit_heading_id_bitbucket: bool = False,
+        implicit_heading_id_gitlab: bool = False,
+    ) -> frozenset[str]:
+        """Return ids of elements of document (document is loaded only if ids are not known yet)."""
+        key = (
+            os.path.realpath(md_path),
+            implicit_heading_id_github,
+            implicit_heading_id_bitbucket,
+            implicit_heading_id_gitlab,
+        )
+        local_targets = self._targets.get(key)
+        if local_targets is None:
+            checker = self.getChecker(
+                md_path,
+                implicit_heading_id_github=implicit_heading_id_github,
+                implicit_heading_id_bitbucket=implicit_heading_id_bitbucket,
+                implicit_heading_id_gitlab=implicit_heading_id_gitlab,
+            )
+            local_targets = checker.getLocalTargets()
+            self._targets[key] = local_targets
+        return local_targets
+
+    def invalidate(self, md_path):
+        """Remove documents loaded from given path (e.g. because file changed)."""
+        real_path = os.path.realpath(md_path)
+        for key in [key for key in self._checkers if key[0] == real_path]:
+            del self._checkers[key]
+        for key in [key for key in self._targets if key[0] == real_path]:
+            del self._targets[key]
+        self.path_cache.invalidate(md_path)
+
+    def clear(self):
+        self._checkers.clear()
+        self._targets.clear()
+
+    def collectStats(self) -> Stats:
+        """Return timings and counters of registry including counters of file system and URL checks."""
+        stats = self.stats.copy()
+        stats.increment(COUNTER_STAT_CALLS, self.path_cache.stat_calls)
+        stats.increment(COUNTER_STAT_CACHE_HITS, self.path_cache.hits)
+        stats.increment(COUNTER_URL_REQUESTS, self.url_checker.requests_count)
+        stats.increment(COUNTER_URL_SAVED, self.url_checker.saved_count)
+        stats.increment(COUNTER_URL_CACHE_HITS, self.url_checker.cache_hits)
+        return stats
+
+    def __len__(self):
+        return len(self._checkers)
 
 
 # =======================================================
 
 
-def convert_md_to_html(md_content):
-    # # 'escape=False' allows to embed direct HTML code into Markdown
-    # html_content = mistune.markdown(file_content, escape=False)
-    # return html_content
-
-    renderer = mistune.HTMLRenderer(escape=False, allow_harmful_protocols=True)
-    converter = mistune.Markdown(renderer)
-    return converter(md_content)
-
-
-def convert_header_to_github_target(header_label):
-    target = header_label.lower()
-    target = target.replace(" ", "-")
-    target = target.replace(",", "")
-    target = target.replace(".", "")
-    target = target.replace("(", "")
-    return target.replace(")", "")
-
-
-# def convert_header_to_underscore(header_label):
-#     target = header_label.lower()
-#     target = target.replace(" ", "_")
-#     return target
-
-
-def convert_header_to_bitbucket_target(header_label):
-    # bitbucket adds prefix to all section elements
-    target = header_label.lower()
-    target = target.replace(" ", "-")
-    target = target.replace(",", "")
-    target = target.replace(".", "")
-    target = target.replace("(", "")
-    target = target.replace(")", "")
-
-    # reduce dashes
-    while True:
-        new_target = target.replace("--", "-")
-        if new_target == target:
-            # no progress - break
-            break
-        target = new_target
-
-    return f"markdown-header-{target}"
-
-
-def extract_header_labels(soup):
-    header_items = set()
-    header_items.update(soup.find_all("h1"))
-    header_items.update(soup.find_all("h2"))
-    header_items.update(soup.find_all("h3"))
-    header_items.update(soup.find_all("h4"))
-    header_items.update(soup.find_all("h5"))
-    header_items.update(soup.find_all("h6"))
-    return {item.text for item in header_items}
+def convert_md_to_html(md_content, converter: MarkdownConverter = None):
+    if converter is None:
+        converter = get_converter()
+    return converter.toHtml(md_content)
+
+
+def extract_header_labels(soup) -> set[str]:
+    """Return texts of headers of given BeautifulSoup document."""
+    return {item.text for item in soup.find_all(HEADER_TAGS)}
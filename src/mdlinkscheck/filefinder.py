@@ -0,0 +1,378 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import re
+
+from collections.abc import Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# ===================================================================
+
+
+class GitIgnoreRule:
+    """Single pattern of '.gitignore' file."""
+
+    def __init__(self, pattern: str, base_dir: str):
+        self.base_dir = base_dir  # directory containing '.gitignore' file
+        self.negated = False
+        self.dir_only = False
+
+        if pattern.startswith("!"):
+            self.negated = True
+            pattern = pattern[1:]
+        elif pattern.startswith("\\"):
+            # escaped '!' or '#'
+            pattern = pattern[1:]
+        if pattern.endswith("/"):
+            self.dir_only = True
+            pattern = pattern.rstrip("/")
+        # pattern containing slash is relative to directory of '.gitignore' file
+        self.anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        self.regex = re.compile(translate_gitignore_pattern(pattern))
+
+    def match(self, rel_path: str, is_dir: bool) -> bool:
+        """Check if rule matches path relative to 'base_dir' (with '/' separators)."""
+        if self.dir_only and not is_dir:
+            return False
+        if self.anchored:
+            return self.regex.fullmatch(rel_path) is not None
+        name = rel_path.rsplit("/", 1)[-1]
+        return self.regex.fullmatch(name) is not None
+
+
+class GitIgnore:
+    """Set of rules read from '.gitignore' files."""
+
+    def __init__(self):
+        self.rules: list[GitIgnoreRule] = []
+
+    def load(self, dir_path) -> "GitIgnore":
+        """Return new object extended with rules of '.gitignore' file of given directory (if exists)."""
+        gitignore_path = os.path.join(dir_path, ".gitignore")
+        try:
+            with open(gitignore_path, encoding="utf-8") as file:
+                lines = file.read().splitlines()
+        except (FileNotFoundError, NotADirectoryError):
+            return self
+        except (OSError, UnicodeDecodeError) as exc:
+            _LOGGER.warning("could not read %s: %s", gitignore_path, exc)
+            return self
+
+        new_rules = []
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            new_rules.append(GitIgnoreRule(line, dir_path))
+        if not new_rules:
+            return self
+        ret_object = GitIgnore()
+        ret_object.rules = self.rules + new_rules
+        return ret_object
+
+    def isIgnored(self, path, is_dir: bool) -> bool:
+        ignored = False
+        for rule in self.rules:
+            rel_path = os.path.relpath(path, rule.base_dir).replace(os.sep, "/")
+            if rule.match(rel_path, is_dir):
+                ignored = not rule.negated
+        return ignored
+
+
+# =======================================================
+
+
+# prefix of exclude pattern denoting glob pattern instead of regular expression
+GLOB_PREFIX = "glob:"
+
+# characters having special meaning in regular expression
+_REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+# characters having special meaning in glob pattern
+_GLOB_SPECIAL_CHARS = frozenset("*?[\\")
+
+
+class _ExcludePatterns:
+    """Exclude patterns split by kind of check."""
+
+    def __init__(self):
+        self.prefixes: list[str] = []
+        self.suffixes: list[str] = []
+        self.exact: set[str] = set()
+        self.substrings: list[str] = []
+        self.regex_list: list[str] = []  # regular expressions matched at beginning of path
+
+    def addRegex(self, regex):
+        literal = regex
+        # trailing '.*' does not change result of 'match()'
+        if literal.endswith(".*"):
+            literal = literal[:-2]
+        contains = literal.startswith(".*")
+        literal = _parse_regex_literal(literal[2:] if contains else literal)
+        if not literal:
+            self.regex_list.append(regex)
+        elif contains:
+            self.substrings.append(literal)
+        else:
+            self.prefixes.append(literal)
+
+    def addGlob(self, glob_pattern):
+        literal = glob_pattern
+        leading_dirs = literal.startswith("**/")
+        leading_any = not leading_dirs and literal.startswith("**")
+        if leading_dirs:
+            literal = literal[3:]
+        elif leading_any:
+            literal = literal[2:]
+        trailing_any = literal.endswith("**")
+        if trailing_any:
+            literal = literal[:-2]
+        if not literal or any(char in _GLOB_SPECIAL_CHARS for char in literal):
+            self.regex_list.append(translate_gitignore_pattern(glob_pattern) + r"\Z")
+            return
+
+        if leading_any:
+            if trailing_any:
+                self.substrings.append(literal)
+            else:
+                self.suffixes.append(literal)
+            return
+        if trailing_any:
+            self.prefixes.append(literal)
+        else:
+            self.exact.add(literal)
+        if leading_dirs:
+            # pattern matches in any subdirectory
+            if trailing_any:
+                self.substrings.append("/" + literal)
+            else:
+                self.suffixes.append("/" + literal)
+
+
+def create_exclude_matcher(regex_list):
+    """Create callable checking if path matches any of exclude patterns. Return 'None' if list is empty.
+
+    Items are regular expressions matched at beginning of path. Items prefixed with 'glob:'
+    are glob patterns ('*', '?', '[...]' and '**' spanning directories) matched against whole path.
+
+    Patterns being plain strings (e.g. 'build/.*', '.*/generated/.*', 'glob:**/node_modules/**')
+    are checked by 'str' methods and by single precompiled search of all substrings. Remaining
+    patterns are compiled into single alternation. Path is tested by constant number of calls
+    regardless of number of patterns.
+    """
+    if not regex_list:
+        return None
+
+    patterns = _ExcludePatterns()
+    for item in regex_list:
+        if item.startswith(GLOB_PREFIX):
+            patterns.addGlob(item[len(GLOB_PREFIX) :])
+        else:
+            patterns.addRegex(item)
+
+    prefixes = tuple(patterns.prefixes)
+    suffixes = tuple(patterns.suffixes)
+    exact = frozenset(patterns.exact)
+    substrings_pattern = None
+    if patterns.substrings:
+        substrings_pattern = re.compile(_create_trie_regex(patterns.substrings))
+    pattern_list = _compile_alternation(patterns.regex_list)
+
+    def matcher(path) -> bool:
+        if path.startswith(prefixes) or path.endswith(suffixes) or path in exact:
+            return True
+        if substrings_pattern is not None and substrings_pattern.search(path):
+            return True
+        return any(pattern.match(path) for pattern in pattern_list)
+
+    return matcher
+
+
+def _compile_alternation(regex_parts) -> list[re.Pattern]:
+    """Compile regular expressions into as few patterns as possible.
+
+    Expressions containing backreferences are compiled separately, because joining
+    changes numbers of groups. If joined expression can not be compiled (e.g. because
+    of inline global flags or repeated group names) then all expressions are compiled separately.
+    """
+    joinable = []
+    pattern_list = []
+    for item in regex_parts:
+        if re.search(r"\\[1-9]|\(\?P=|\(\?\(", item):
+            pattern_list.append(re.compile(item))
+        else:
+            joinable.append(item)
+    if len(joinable) == 1:
+        pattern_list.insert(0, re.compile(joinable[0]))
+    elif joinable:
+        combined_regex = "|".join(f"(?:{item})" for item in joinable)
+        try:
+            pattern_list.insert(0, re.compile(combined_regex))
+        except re.error:
+            pattern_list[0:0] = [re.compile(item) for item in joinable]
+    return pattern_list
+
+
+def _create_trie_regex(words) -> str:
+    """Create regular expression matching any of given words.
+
+    Words are stored in prefix tree, so common prefixes are compared only once
+    (alternation of plain words is slow in 're' module).
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of word
+
+    def build_node(node) -> str:
+        if "" in node:
+            # shorter word already matches - longer words do not have to be checked
+            return ""
+        items = [re.escape(char) + build_node(sub_node) for char, sub_node in sorted(node.items())]
+        if len(items) == 1:
+            return items[0]
+        return "(?:" + "|".join(items) + ")"
+
+    return build_node(trie)
+
+
+def _parse_regex_literal(regex):
+    """Return string matched by regular expression if expression is plain string (with escapes), otherwise 'None'."""
+    ret_literal = ""
+    index = 0
+    regex_len = len(regex)
+    while index < regex_len:
+        char = regex[index]
+        if char == "\\":
+            index += 1
+            if index >= regex_len or regex[index].isalnum():
+                # character class or special sequence
+                return None
+            char = regex[index]
+        elif char in _REGEX_SPECIAL_CHARS:
+            return None
+        ret_literal += char
+        index += 1
+    return ret_literal
+
+
+def walk_md_files(search_dir, exclude_matcher=None, use_gitignore=True) -> Iterator[str]:
+    """Find Markdown files in given directory and its subdirectories.
+
+    Files are yielded while directory tree is being traversed. Hidden files and directories
+    (names starting with '.') are skipped. 'exclude_matcher' is callable receiving path
+    and returning 'True' if path has to be excluded - it is applied on files and on directories
+    (with trailing path separator) so excluded directories are not traversed at all.
+    If 'use_gitignore' is set then paths matching rules of '.gitignore' files found in
+    the tree are skipped.
+    """
+    if search_dir is None:
+        return
+    gitignore = GitIgnore()
+    if use_gitignore:
+        gitignore = gitignore.load(search_dir)
+    yield from _walk_dir(search_dir, exclude_matcher, gitignore, use_gitignore)
+
+
+def walk_dirs(search_dir, exclude_matcher=None, use_gitignore=True) -> Iterator[str]:
+    """Find directories traversed by 'walk_md_files()' called with the same arguments.
+
+    Given directory is yielded first. Skipped directories (hidden, excluded or ignored)
+    are not yielded.
+    """
+    if search_dir is None:
+        return
+    gitignore = GitIgnore()
+    if use_gitignore:
+        gitignore = gitignore.load(search_dir)
+    yield from _walk_dir(search_dir, exclude_matcher, gitignore, use_gitignore, yield_dirs=True)
+
+
+def _walk_dir(dir_path, exclude_matcher, gitignore: GitIgnore, use_gitignore, yield_dirs=False) -> Iterator[str]:
+    if yield_dirs:
+        yield dir_path
+    try:
+        with os.scandir(dir_path) as entries_iter:
+            entries = sorted(entries_iter, key=lambda entry: entry.name)
+    except OSError as exc:
+        _LOGGER.warning("could not read directory: %s", exc)
+        return
+
+    sub_dirs = []
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        entry_path = os.path.join(dir_path, entry.name)
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+        if is_dir:
+            if exclude_matcher is not None and exclude_matcher(entry_path + os.sep):
+                continue
+            if gitignore.isIgnored(entry_path, True):
+                continue
+            sub_dirs.append(entry_path)
+            continue
+        if yield_dirs or not entry.name.endswith(".md"):
+            continue
+        if exclude_matcher is not None and exclude_matcher(entry_path):
+            continue
+        if gitignore.isIgnored(entry_path, False):
+            continue
+        yield entry_path
+
+    for sub_dir in sub_dirs:
+        sub_gitignore = gitignore.load(sub_dir) if use_gitignore else gitignore
+        yield from _walk_dir(sub_dir, exclude_matcher, sub_gitignore, use_gitignore, yield_dirs)
+
+
+def translate_gitignore_pattern(pattern: str) -> str:
+    """Convert '.gitignore' glob pattern to regular expression."""
+    ret_regex = ""
+    index = 0
+    pattern_len = len(pattern)
+    while index < pattern_len:
+        char = pattern[index]
+        if char == "*":
+            if pattern.startswith("**/", index):
+                # any number of directories
+                ret_regex += "(?:.*/)?"
+                index += 3
+                continue
+            if pattern.startswith("**", index):
+                ret_regex += ".*"
+                index += 2
+                continue
+            ret_regex += "[^/]*"
+        elif char == "?":
+            ret_regex += "[^/]"
+        elif char == "[":
+            end_index = pattern.find("]", index + 1)
+            if end_index < 0:
+                ret_regex += re.escape(char)
+            else:
+                char_class = pattern[index + 1 : end_index]
+                if char_class.startswith("!"):
+                    char_class = "^" + char_class[1:]
+                ret_regex += f"[{char_class}]"
+                index = end_index
+        elif char == "\\" and index + 1 < pattern_len:
+            index += 1
+            ret_regex += re.escape(pattern[index])
+        else:
+            ret_regex += re.escape(char)
+        index += 1
+    return ret_regex
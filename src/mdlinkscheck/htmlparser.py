@@ -0,0 +1,104 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Backends parsing HTML. 'html.parser' (BeautifulSoup with Python's
+# parser) is always available, 'lxml' (BeautifulSoup with lxml parser)
+# and 'selectolax' (lexbor engine) are used only if installed.
+#
+
+import logging
+import importlib.util
+
+from collections.abc import Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# BeautifulSoup with parser of standard library
+HTML_PARSER_PYTHON = "html.parser"
+# BeautifulSoup with 'lxml' parser
+HTML_PARSER_LXML = "lxml"
+# 'selectolax' with 'lexbor' engine
+HTML_PARSER_SELECTOLAX = "selectolax"
+
+HTML_PARSERS_LIST = [HTML_PARSER_PYTHON, HTML_PARSER_LXML, HTML_PARSER_SELECTOLAX]
+DEFAULT_HTML_PARSER = HTML_PARSER_PYTHON
+
+# modules required by parsers
+_PARSERS_MODULES = {
+    HTML_PARSER_PYTHON: ["bs4"],
+    HTML_PARSER_LXML: ["bs4", "lxml"],
+    HTML_PARSER_SELECTOLAX: ["selectolax"],
+}
+
+
+# ===================================================================
+
+
+def is_parser_available(html_parser) -> bool:
+    """Check if modules required by parser are installed (modules are not imported)."""
+    modules = _PARSERS_MODULES.get(html_parser)
+    if modules is None:
+        return False
+    return all(importlib.util.find_spec(module_name) is not None for module_name in modules)
+
+
+def get_available_parsers() -> list[str]:
+    return [item for item in HTML_PARSERS_LIST if is_parser_available(item)]
+
+
+def select_parser(html_parser) -> str:
+    """Return given parser if available, otherwise default parser."""
+    if html_parser == DEFAULT_HTML_PARSER or is_parser_available(html_parser):
+        return html_parser
+    _LOGGER.warning("HTML parser '%s' not available - using '%s'", html_parser, DEFAULT_HTML_PARSER)
+    return DEFAULT_HTML_PARSER
+
+
+def iter_html_elements(html_content, tags, text_tags=(), html_parser=DEFAULT_HTML_PARSER) -> Iterator[tuple]:
+    """Yield tuples (tag name, attributes dict, text) of elements with given tags in order of occurrence.
+
+    Text is extracted only for elements with tags given in 'text_tags' (otherwise 'None').
+    """
+    if html_parser == HTML_PARSER_SELECTOLAX:
+        from selectolax.lexbor import LexborHTMLParser  # pylint: disable=import-outside-toplevel
+
+        tags_set = set(tags)
+        tree = LexborHTMLParser(html_content)
+        if tree.root is None:
+            return
+        for node in tree.root.traverse(include_text=False):
+            tag_name = node.tag
+            if tag_name not in tags_set:
+                continue
+            text = node.text(deep=True) if tag_name in text_tags else None
+            yield tag_name, node.attributes, text
+        return
+
+    from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+    soup = BeautifulSoup(html_content, html_parser)
+    for item in soup.find_all(tags):
+        text = item.text if item.name in text_tags else None
+        yield item.name, item.attrs, text
+
+
+def get_html_text(html_content, html_parser=DEFAULT_HTML_PARSER) -> str:
+    """Return text of HTML fragment (without tags)."""
+    if html_parser == HTML_PARSER_SELECTOLAX:
+        from selectolax.lexbor import LexborHTMLParser  # pylint: disable=import-outside-toplevel
+
+        tree = LexborHTMLParser(html_content)
+        if tree.root is None:
+            return ""
+        return tree.root.text(deep=True)
+
+    from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+    return BeautifulSoup(html_content, html_parser).text
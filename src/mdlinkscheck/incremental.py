@@ -0,0 +1,176 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import json
+import hashlib
+
+from mdlinkscheck.filechecker import FileChecker, DocumentRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+
+STATE_VERSION = 1
+
+
+# ===================================================================
+
+
+class IncrementalState:
+    """State of previous verification run allowing to verify only changed files.
+
+    For each verified file the state holds hash of content, extracted links, invalid links
+    and dependencies: local files pointed by valid links together with hash and anchors of
+    file if link points to element in the file.
+
+    File has to be verified again if its content changed, if it contained invalid links,
+    if any of its dependencies disappeared or if anchors of dependency changed.
+    """
+
+    def __init__(self, state_path, options: dict = None):
+        self.state_path = state_path
+        if options is None:
+            options = {}
+        self.options = options
+        self.results: dict[str, dict] = {}
+        self._hashes: dict[str, str | None] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            _LOGGER.warning("could not load incremental state: %s", exc)
+            return
+
+        if data.get("version") != STATE_VERSION:
+            return
+        if data.get("options") != self.options:
+            _LOGGER.info("options changed - verifying all files")
+            return
+        self.results = data.get("files", {})
+
+    def save(self, md_files=None):
+        """Store state to file.
+
+        If 'md_files' is given then entries of other files (e.g. removed or excluded) are dropped.
+        """
+        if md_files is not None:
+            current_paths = {os.path.realpath(md_file) for md_file in md_files}
+            self.results = {md_path: entry for md_path, entry in self.results.items() if md_path in current_paths}
+        state_dir = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(state_dir, exist_ok=True)
+        data = {"version": STATE_VERSION, "options": self.options, "files": self.results}
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def selectChanged(self, md_files, registry: DocumentRegistry = None) -> list[str]:
+        """Return files from given list that have to be verified again (keeps order of files)."""
+        if registry is None:
+            registry = DocumentRegistry()
+        return [md_file for md_file in md_files if not self.isUpToDate(md_file, registry)]
+
+    def isUpToDate(self, md_file, registry: DocumentRegistry) -> bool:
+        md_path = os.path.realpath(md_file)
+        entry = self.results.get(md_path)
+        if entry is None:
+            return False
+        if entry["invalid_links"]:
+            # target of invalid link could appear
+            return False
+        if entry["hash"] != self._getHash(md_path):
+            return False
+
+        for dep_path, dep_data in entry["dependencies"].items():
+            if dep_data is None:
+                # link to file - only existence matters
+                if not os.path.exists(dep_path):
+                    return False
+                continue
+            dep_hash = self._getHash(dep_path)
+            if dep_hash is None:
+                # file removed
+                return False
+            if dep_hash == dep_data["hash"]:
+                continue
+            # content changed - check anchors
+            checker = registry.getChecker(
+                dep_path,
+                implicit_heading_id_github=self.options.get("implicit_heading_github", False),
+                implicit_heading_id_bitbucket=self.options.get("implicit_heading_bitbucket", False),
+                implicit_heading_id_gitlab=self.options.get("implicit_heading_gitlab", False),
+            )
+            if checker.getLocalTargets() != set(dep_data["anchors"]):
+                return False
+
+        return True
+
+    def getInvalidLinks(self, md_file) -> set[str]:
+        entry = self.results.get(os.path.realpath(md_file))
+        if entry is None:
+            return set()
+        return set(entry["invalid_links"])
+
+    def update(self, md_file, invalid_links, details: dict):
+        """Store results of verification of file.
+
+        'details' is dict returned by 'get_checker_details()'.
+        """
+        md_path = os.path.realpath(md_file)
+        dependencies: dict[str, dict | None] = {}
+        for dep_path, anchors in details["dependencies"].items():
+            if anchors is None:
+                dependencies[dep_path] = None
+                continue
+            dependencies[dep_path] = {"hash": self._getHash(dep_path), "anchors": anchors}
+        self.results[md_path] = {
+            "hash": self._getHash(md_path),
+            "links": details["links"],
+            "invalid_links": sorted(invalid_links),
+            "dependencies": dependencies,
+        }
+
+    def _getHash(self, file_path):
+        if file_path not in self._hashes:
+            self._hashes[file_path] = calculate_file_hash(file_path)
+        return self._hashes[file_path]
+
+
+# =======================================================
+
+
+def get_checker_details(checker: FileChecker) -> dict:
+    """Get data of verified document required by incremental state (JSON serializable)."""
+    links = set()
+    links.update(checker.extractHyperlinks())
+    links.update(checker.extractImgs())
+    dependencies = {}
+    for dep_path, anchors in checker.dependencies.items():
+        if anchors is None:
+            dependencies[dep_path] = None
+        else:
+            dependencies[dep_path] = sorted(anchors)
+    return {"links": sorted(links), "dependencies": dependencies}
+
+
+def calculate_file_hash(file_path):
+    """Return SHA-256 of file content or 'None' if file does not exist."""
+    hasher = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(65536), b""):
+                hasher.update(chunk)
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+    return hasher.hexdigest()
@@ -0,0 +1,105 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Classification of links by kind of target. Each link is classified
+# once (results are memoized) using cheap string and 'urllib' checks.
+#
+
+import re
+import functools
+
+from urllib.parse import urlsplit
+
+# e-mail address ('mailto:')
+LINK_MAILTO = "mailto"
+# URL of external resource
+LINK_URL = "url"
+# element of current document ('#id')
+LINK_FRAGMENT = "fragment"
+# path relative to root directory of repository ('/path')
+LINK_ABSOLUTE = "absolute"
+# path relative to directory of document
+LINK_RELATIVE = "relative"
+# more than one '#' in link that is not URL
+LINK_MALFORMED = "malformed"
+
+
+# scheme followed by authority, e.g. 'https://'
+_URL_PREFIX = re.compile(r"[A-Za-z][A-Za-z0-9+.\-]*://")
+
+# characters not allowed in URL
+_URL_INVALID_CHARS = re.compile(r"[\s<>\"{}|\\^`]")
+
+
+# ===================================================================
+
+
+class LinkInfo:
+    """Kind of link and its parts.
+
+    'path' is part of link before '#' and 'fragment' is part after '#' ('None' if link
+    does not contain '#'). For external links 'url' is address to check.
+    """
+
+    __slots__ = ("kind", "path", "fragment", "url")
+
+    def __init__(self, kind, path, fragment=None, url=None):
+        self.kind = kind
+        self.path = path
+        self.fragment = fragment
+        self.url = url
+
+    def __repr__(self):
+        return f"LinkInfo({self.kind}, {self.path!r}, {self.fragment!r}, {self.url!r})"
+
+
+@functools.lru_cache(maxsize=65536)
+def classify_link(link) -> LinkInfo:
+    """Classify link. Results are memoized."""
+    if link.startswith("mailto:"):
+        return LinkInfo(LINK_MAILTO, link)
+    if is_url(link):
+        path, _, fragment = link.partition("#")
+        return LinkInfo(LINK_URL, path, fragment if fragment else None, url=link)
+
+    link_parts = link.split("#")
+    if len(link_parts) > 2:
+        return LinkInfo(LINK_MALFORMED, link)
+    path = link_parts[0]
+    fragment = link_parts[1] if len(link_parts) == 2 else None
+    if is_url(path):
+        # fragment is not valid part of URL
+        return LinkInfo(LINK_URL, path, fragment, url=path)
+    if not path:
+        return LinkInfo(LINK_FRAGMENT, path, fragment)
+    if path.startswith("/"):
+        return LinkInfo(LINK_ABSOLUTE, path, fragment)
+    return LinkInfo(LINK_RELATIVE, path, fragment)
+
+
+def is_url(text) -> bool:
+    """Check if text is URL of external resource (scheme and host are required)."""
+    if not _URL_PREFIX.match(text):
+        return False
+    if _URL_INVALID_CHARS.search(text):
+        return False
+    try:
+        url_parts = urlsplit(text)
+        host = url_parts.hostname
+        # raises exception if port is invalid
+        url_parts.port  # pylint: disable=pointless-statement
+    except ValueError:
+        return False
+    if not host:
+        return False
+    if url_parts.netloc.rpartition("@")[2].startswith("["):
+        # IPv6 address
+        return True
+    # single label hosts (e.g. 'localhost') are not considered external
+    return "." in host and not host.startswith(".") and not host.endswith(".")
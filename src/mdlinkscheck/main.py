@@ -8,17 +8,34 @@
 
 #
 # Script checks for invalid links (a href) or invalid paths (img src) in Markdown files.
-# Script converts md to html and then iterates through links and paths.
+# Script extracts links and paths from md files and then iterates through them.
 #
 
 import os
+import sys
 import logging
 import argparse
-import re
+import itertools
+import time
 
-from glob import glob
-
-from mdlinkscheck import verify
+from mdlinkscheck import DocumentRegistry
+from mdlinkscheck.batch import configure_logging, verify_files
+from mdlinkscheck.filechecker import ENGINES_LIST, DEFAULT_ENGINE, DEFAULT_LOW_MEMORY_MAX_DOCUMENTS
+from mdlinkscheck.htmlparser import HTML_PARSERS_LIST, DEFAULT_HTML_PARSER, select_parser
+from mdlinkscheck.urlchecker import URLChecker
+from mdlinkscheck.filefinder import walk_md_files, walk_dirs, create_exclude_matcher
+from mdlinkscheck.incremental import IncrementalState
+from mdlinkscheck.urlcache import URLCache, DEFAULT_TTL_SUCCESS, DEFAULT_TTL_FAILURE
+from mdlinkscheck.report import FORMATS_LIST, FORMAT_TEXT, create_reporter
+from mdlinkscheck.watcher import WatchSession, TreeObserver
+from mdlinkscheck.stats import (
+    Stats,
+    PHASE_TOTAL,
+    COUNTER_URL_REQUESTS,
+    COUNTER_URL_SAVED,
+    COUNTER_URL_CACHE_HITS,
+    notify_stats_hooks,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,31 +45,85 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # ============================== CLI interface ==============================
 
 
-def find_md_files(search_dir):
-    return list(glob(f"{search_dir}/**/*.md", recursive=True))
+def find_md_files(search_dir, regex_list=None, use_gitignore=True):
+    exclude_matcher = create_exclude_matcher(regex_list)
+    return list(walk_md_files(search_dir, exclude_matcher, use_gitignore))
 
 
 def filter_items(items_list, regex_list):
     if not items_list:
         return items_list
-    if not regex_list:
+    exclude_matcher = create_exclude_matcher(regex_list)
+    if exclude_matcher is None:
         return items_list
+    return [item for item in items_list if not exclude_matcher(item)]
+
+
+def watch_files(
+    md_files_provider,
+    verify_options,
+    registry: DocumentRegistry,
+    report_format=FORMAT_TEXT,
+    interval=1.0,
+    show_stats=False,
+    dirs_provider=None,
+):
+    """Verify files and verify them again after each change until interrupted.
+
+    'md_files_provider' is callable returning list of files to verify (called after change of
+    directories content). 'dirs_provider' is callable returning directories searched for new files.
+    Statistics of each verification are passed to hooks (and printed if 'show_stats' is set).
+    Return result code of last verification.
+    """
+    session = WatchSession(verify_options, registry)
+    observer = TreeObserver(md_files_provider, interval=interval, dirs_provider=dirs_provider)
+    ret_code = 0
+    try:
+        md_files = observer.scan()
+        changed = None
+        while True:
+            reporter = create_reporter(report_format, sys.stdout)
+            if report_format != FORMAT_TEXT:
+                session.report_callback = reporter.reportFile
+            start_time = time.perf_counter()
+            prev_stats = registry.collectStats()
+            if changed is None:
+                verified = session.verifyFiles(md_files)
+            else:
+                verified = session.update(observer.md_files, changed)
+            reporter.close()
+            observer.setWatchedPaths(session.getWatchedPaths())
+            verify_time = time.perf_counter() - start_time
+            stats = registry.collectStats().difference(prev_stats)
+            stats.addTime(PHASE_TOTAL, verify_time)
+            _report_stats(stats, show_stats)
+
+            invalid_count = session.getInvalidCount()
+            ret_code = 1 if invalid_count > 0 else 0
+            _LOGGER.info(
+                "verified %s files in %.3f s, found %s invalid links - waiting for changes",
+                len(verified),
+                verify_time,
+                invalid_count,
+            )
+            changed = observer.waitChanges()
+            _LOGGER.debug("changed files: %s", sorted(changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.close()
+    return ret_code
 
-    ret_list = []
-    pattern_list = [re.compile(item) for item in regex_list]
-    for item in items_list:
-        is_excluded = False
-        for pattern in pattern_list:
-            if pattern.match(item):
-                is_excluded = True
-                break
-        if is_excluded is False:
-            ret_list.append(item)
 
-    return ret_list
+def _report_stats(stats: Stats, show_stats):
+    if show_stats:
+        sys.stderr.write(stats.format() + "\n")
+        sys.stderr.flush()
+    notify_stats_hooks(stats)
 
 
 def main(args=None):
+    start_time = time.perf_counter()
     parser = argparse.ArgumentParser(description="check links in Markdown")
     parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
     parser.add_argument("--silence", action="store_true", help="Do not output log messages")
@@ -75,7 +146,12 @@ def main(args=None):
         metavar="N",
         type=str,
         nargs="+",
-        help="Space separated list of regex strings applied on found files to be excluded from processing",
+        help="Space separated list of regex strings applied on found files to be excluded from processing"
+        " (directories matching the regex with trailing path separator are not searched)."
+        " Items prefixed with 'glob:' are treated as glob patterns matched against whole path",
+    )
+    parser.add_argument(
+        "--no-gitignore", action="store_true", help="Do not skip files ignored by '.gitignore' files during search"
     )
     parser.add_argument(
         "--implicit-heading-id-github",
@@ -88,40 +164,254 @@ def main(args=None):
         help="Allow links to sections with implicit id as in BitBucket"
         " (lowercased ids with dashes and 'markdown-header-' prefix)",
     )
+    parser.add_argument(
+        "--implicit-heading-id-gitlab",
+        action="store_true",
+        help="Allow links to sections with implicit id as in GitLab (lowercased ids with dashes, without punctuation)",
+    )
     parser.add_argument("--check-url-reachable", action="store_true", help="Check if external URLs are reachable")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Number of parallel processes verifying files (0 means number of CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--url-cache-path",
+        action="store",
+        help="Path to file with persistent cache of URL checks results"
+        " (default: $XDG_CACHE_HOME/mdlinkscheck/urlcache.sqlite or ~/.cache/mdlinkscheck/urlcache.sqlite)",
+    )
+    parser.add_argument(
+        "--no-url-cache",
+        action="store_true",
+        help="Do not use persistent cache of URL checks in this run (cache can be still purged)",
+    )
+    parser.add_argument("--purge-url-cache", action="store_true", help="Remove all entries from URL checks cache")
+    parser.add_argument(
+        "--url-cache-ttl-success",
+        metavar="SECONDS",
+        type=int,
+        default=DEFAULT_TTL_SUCCESS,
+        help="Time after which cached reachable URL is checked again (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--url-cache-ttl-failure",
+        metavar="SECONDS",
+        type=int,
+        default=DEFAULT_TTL_FAILURE,
+        help="Time after which cached unreachable URL is checked again (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES_LIST,
+        default=DEFAULT_ENGINE,
+        help="Method of extracting links: 'ast' walks Markdown syntax tree, 'html' converts Markdown to HTML"
+        " and parses the HTML (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--html-parser",
+        choices=HTML_PARSERS_LIST,
+        default=DEFAULT_HTML_PARSER,
+        help="Backend parsing HTML (converted documents and raw HTML embedded in Markdown). Parsers other"
+        " than 'html.parser' require optional packages - if not installed then default parser is used"
+        " (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Keep only compact summary of each parsed document and limit number of documents kept in memory"
+        " (positions of invalid links are found by searching files)",
+    )
+    parser.add_argument(
+        "--max-documents",
+        metavar="N",
+        type=int,
+        default=DEFAULT_LOW_MEMORY_MAX_DOCUMENTS,
+        help="Number of documents kept in memory in low memory mode (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Read and parse each file in parts consisting of whole top-level blocks, so memory does not depend"
+        " on size of file (only compact summary of document is kept)",
+    )
+    parser.add_argument(
+        "--dump-html-dir",
+        metavar="DIR",
+        action="store",
+        help="Store Markdown files converted to HTML in given directory (for debug purpose)",
+    )
+    parser.add_argument(
+        "--incremental",
+        metavar="STATE_PATH",
+        action="store",
+        help="Path to file with state of previous run. Only files changed since then"
+        " (or pointing to changed files) are verified",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and verify again changed files and files pointing to them (stop with Ctrl+C)",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        metavar="SECONDS",
+        type=float,
+        default=1.0,
+        help="Interval of checking for changes in watch mode (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print timings of verification phases and counters of performed operations to standard error",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS_LIST,
+        default=FORMAT_TEXT,
+        help="Format of report of invalid links written to standard output: 'text' only logs invalid links,"
+        " 'jsonl' writes JSON object per invalid link as soon as file is verified, 'sarif' writes SARIF"
+        " document at the end (default: %(default)s)",
+    )
 
     args = parser.parse_args(args=args)
 
-    if args.silence is True:
-        logging.getLogger().setLevel(logging.FATAL)
-    elif args.logall is True:
-        logging.basicConfig()
-        logging.getLogger().setLevel(logging.DEBUG)
-    else:
-        logging.basicConfig(format="%(message)s")
-        logging.getLogger().setLevel(logging.INFO)
+    configure_logging(args.silence, args.logall)
+
+    url_cache_options = None
+    if not args.no_url_cache:
+        url_cache_options = {
+            "cache_path": args.url_cache_path,
+            "ttl_success": args.url_cache_ttl_success,
+            "ttl_failure": args.url_cache_ttl_failure,
+        }
+
+    if args.purge_url_cache:
+        # purged even if cache is not used by this run ('--no-url-cache')
+        url_cache = URLCache(args.url_cache_path)
+        url_cache.purge()
+        url_cache.close()
+        _LOGGER.info("URL cache purged: %s", url_cache.cache_path)
+        if not args.files and not args.dir:
+            return 0
 
     if not args.files and not args.dir:
         _LOGGER.error("argument required: --files or --dir")
         return 1
 
-    md_files = find_md_files(args.dir)
+    # files are verified while directory is being searched
+    exclude_matcher = create_exclude_matcher(args.excludes)
+    md_files = walk_md_files(args.dir, exclude_matcher, use_gitignore=not args.no_gitignore)
     if args.files:
-        md_files.extend(args.files)
+        md_files = itertools.chain(md_files, filter_items(args.files, args.excludes))
 
-    md_files = filter_items(md_files, args.excludes)
+    jobs = args.jobs
+    if jobs == 0:
+        jobs = os.cpu_count()
+    verify_options = {
+        "implicit_heading_github": args.implicit_heading_id_github,
+        "implicit_heading_bitbucket": args.implicit_heading_id_bitbucket,
+        "implicit_heading_gitlab": args.implicit_heading_id_gitlab,
+        "check_url_reachable": args.check_url_reachable,
+    }
+    if not args.check_url_reachable:
+        # cache not needed
+        url_cache_options = None
+    url_cache = None
+    if url_cache_options is not None:
+        url_cache = URLCache(**url_cache_options)
+    url_checker = URLChecker(url_cache=url_cache)
+    registry_options = {
+        "engine": args.engine,
+        "dump_html_dir": args.dump_html_dir,
+        "html_parser": select_parser(args.html_parser),
+    }
+    if args.streaming:
+        registry_options["streaming"] = True
+    if args.low_memory:
+        registry_options["low_memory"] = True
+        registry_options["max_documents"] = args.max_documents
+    registry = DocumentRegistry(url_checker=url_checker, **registry_options)
 
-    _LOGGER.info("files to check:\n%s\n", "\n".join(md_files))
+    if args.watch:
 
-    invalid_count = 0
-    for md_file in md_files:
-        invalid_links = verify(
-            md_file,
-            implicit_heading_github=args.implicit_heading_id_github,
-            implicit_heading_bitbucket=args.implicit_heading_id_bitbucket,
-            check_url_reachable=args.check_url_reachable,
+        def md_files_provider():
+            found_files = walk_md_files(args.dir, exclude_matcher, use_gitignore=not args.no_gitignore)
+            if args.files:
+                found_files = itertools.chain(found_files, filter_items(args.files, args.excludes))
+            return found_files
+
+        def dirs_provider():
+            return walk_dirs(args.dir, exclude_matcher, use_gitignore=not args.no_gitignore)
+
+        ret_code = watch_files(
+            md_files_provider,
+            verify_options,
+            registry,
+            report_format=args.format,
+            interval=args.watch_interval,
+            show_stats=args.stats,
+            dirs_provider=dirs_provider,
         )
+        url_checker.close()
+        return ret_code
+
+    incremental_state = None
+    files_to_check = md_files
+    if args.incremental:
+        md_files = list(md_files)
+        incremental_state = IncrementalState(args.incremental, verify_options)
+        files_to_check = incremental_state.selectChanged(md_files, registry)
+        _LOGGER.info("files changed since previous run: %s of %s", len(files_to_check), len(md_files))
+
+    reporter = create_reporter(args.format, sys.stdout)
+    report_callback = None
+    if args.format != FORMAT_TEXT:
+        report_callback = reporter.reportFile
+
+    results = verify_files(
+        files_to_check,
+        verify_options,
+        jobs=jobs,
+        url_cache_options=url_cache_options,
+        registry=registry,
+        registry_options=registry_options,
+        collect_details=incremental_state is not None,
+        report_callback=report_callback,
+    )
+    url_checker.close()
+    reporter.close()
+
+    invalid_count = 0
+    for _md_file, invalid_links, _details in results:
         invalid_count += len(invalid_links)
+
+    if incremental_state is not None:
+        for md_file, invalid_links, details in results:
+            incremental_state.update(md_file, invalid_links, details)
+        checked_files = set(files_to_check)
+        for md_file in md_files:
+            if md_file in checked_files:
+                continue
+            # unchanged file - take results of previous run
+            invalid_links = incremental_state.getInvalidLinks(md_file)
+            invalid_count += len(invalid_links)
+        incremental_state.save(md_files)
+
+    stats = registry.collectStats()
+    stats.addTime(PHASE_TOTAL, time.perf_counter() - start_time)
+    _report_stats(stats, args.stats)
+
+    if args.check_url_reachable:
+        _LOGGER.info(
+            "URL requests sent: %s, saved by deduplication: %s, taken from cache: %s",
+            stats.counters.get(COUNTER_URL_REQUESTS, 0),
+            stats.counters.get(COUNTER_URL_SAVED, 0),
+            stats.counters.get(COUNTER_URL_CACHE_HITS, 0),
+        )
     if invalid_count > 0:
         # errors found
         _LOGGER.info("found %s invalid links", invalid_count)
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Converter of Markdown documents. Building mistune parser (block and
+# inline rules, plugins, renderer) takes longer than parsing small
+# document, so parsers are built once and reused for all documents.
+#
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import mistune
+
+
+# converters shared in process (key is tuple of plugins)
+_CONVERTERS: dict[tuple, "MarkdownConverter"] = {}
+
+
+# ===================================================================
+
+
+class MarkdownConverter:
+    """Converts Markdown to HTML or to syntax tree.
+
+    'plugins' are mistune plugins (names or callables) enabled in both conversions.
+    Parsers are built on first use and reused by subsequent calls. Converter can be
+    passed to worker processes - parsers are then built again in each process.
+    """
+
+    def __init__(self, plugins=None):
+        self.plugins: tuple = tuple(plugins) if plugins else ()
+        self._html_markdown: "mistune.Markdown" = None
+        self._ast_markdown: "mistune.Markdown" = None
+
+    def toHtml(self, md_content, ref_links: dict = None) -> str:
+        """Convert content to HTML.
+
+        'ref_links' are reference link definitions given in other part of document
+        (see 'mdlinkscheck.mdstream').
+        """
+        if self._html_markdown is None:
+            import mistune  # pylint: disable=import-outside-toplevel
+
+            # 'escape=False' allows to embed direct HTML code into Markdown
+            renderer = mistune.HTMLRenderer(escape=False, allow_harmful_protocols=True)
+            self._html_markdown = mistune.create_markdown(renderer=renderer, plugins=list(self.plugins))
+        if not ref_links:
+            return self._html_markdown(md_content)
+        state = self._html_markdown.block.state_cls()
+        state.env["ref_links"] = ref_links
+        return self._html_markdown.parse(md_content, state)[0]
+
+    def parse(self, md_content, state: "mistune.BlockState" = None) -> tuple[list[dict], "mistune.BlockState"]:
+        """Return tokens of syntax tree and final state of block parser."""
+        if self._ast_markdown is None:
+            import mistune  # pylint: disable=import-outside-toplevel
+
+            self._ast_markdown = mistune.create_markdown(renderer=None, plugins=list(self.plugins))
+        return self._ast_markdown.parse(md_content, state)
+
+    def __getstate__(self):
+        # parsers are not passed between processes
+        return {"plugins": self.plugins}
+
+    def __setstate__(self, state):
+        self.__init__(state["plugins"])
+
+    def __repr__(self):
+        return f"MarkdownConverter(plugins={list(self.plugins)})"
+
+
+def get_converter(plugins=None) -> MarkdownConverter:
+    """Return converter shared in current process by all callers using the same plugins."""
+    key = tuple(plugins) if plugins else ()
+    converter = _CONVERTERS.get(key)
+    if converter is None:
+        converter = MarkdownConverter(key)
+        _CONVERTERS[key] = converter
+    return converter
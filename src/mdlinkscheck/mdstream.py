@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Reading Markdown document in parts consisting of whole top-level blocks,
+# so very large documents can be parsed part by part with bounded memory.
+#
+# Document is split only before non-indented line following blank line
+# (indented lines may continue list items). Fenced code blocks, HTML
+# comments and raw HTML blocks like <pre> can contain blank lines, so
+# document is never split inside them. Reference link definitions apply
+# to whole document, so they are collected in separate pass.
+#
+
+import re
+
+from collections.abc import Iterator, Iterable
+
+from mdlinkscheck.mdconverter import MarkdownConverter, get_converter
+
+# minimal number of characters of single part (part is closed on first block boundary after the limit)
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_FENCE_REGEX = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_HTML_BLOCK_REGEX = re.compile(r"^ {0,3}<(pre|script|style|textarea)(\s|>|$)", re.IGNORECASE)
+_REF_DEFINITION_REGEX = re.compile(r"^ {0,3}\[(?:[^\]\\]|\\.)+\]:", re.MULTILINE)
+
+
+# ===================================================================
+
+
+def iter_md_chunks(lines: Iterable[str], chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield consecutive parts of document given by lines (e.g. file object).
+
+    Each part consists of whole top-level blocks and contains at least 'chunk_size'
+    characters (except last part). Zero 'chunk_size' yields every block separately.
+    """
+    chunk_lines: list[str] = []
+    chunk_len = 0
+    prev_blank = False
+    block_end = None  # end marker of block that can contain blank lines
+    for line in lines:
+        if block_end is None:
+            if prev_blank and chunk_len >= chunk_size and line[:1] not in ("", " ", "\t", "\n"):
+                yield "".join(chunk_lines)
+                chunk_lines = []
+                chunk_len = 0
+            block_end = _find_block_end(line)
+        elif _is_block_end(line, block_end):
+            block_end = None
+        chunk_lines.append(line)
+        chunk_len += len(line)
+        prev_blank = not line.strip()
+    if chunk_lines:
+        yield "".join(chunk_lines)
+
+
+def collect_ref_links(lines: Iterable[str], converter: MarkdownConverter = None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return reference link definitions of document in form stored in mistune's state.
+
+    Only parts of document containing definitions are parsed.
+    """
+    if converter is None:
+        converter = get_converter()
+    ref_links: dict = {}
+    for chunk in iter_md_chunks(lines, chunk_size):
+        update_ref_links(ref_links, chunk, converter)
+    return ref_links
+
+
+def update_ref_links(ref_links: dict, md_chunk, converter: MarkdownConverter = None):
+    """Add reference link definitions of part of document to 'ref_links' (first definition wins).
+
+    Part is parsed only if it contains definitions.
+    """
+    if _REF_DEFINITION_REGEX.search(md_chunk) is None:
+        return
+    if converter is None:
+        converter = get_converter()
+    _, state = converter.parse(md_chunk)
+    for key, value in state.env["ref_links"].items():
+        ref_links.setdefault(key, value)
+
+
+def _find_block_end(line):
+    """Return end marker of block started by line or 'None' if block ends on blank line."""
+    fence_match = _FENCE_REGEX.match(line)
+    if fence_match:
+        fence = fence_match.group(1)
+        if fence[0] == "`" and "`" in line[fence_match.end() :]:
+            # not a fence (info string of backtick fence can not contain backtick)
+            return None
+        return fence
+    html_match = _HTML_BLOCK_REGEX.match(line)
+    if html_match:
+        end_tag = f"</{html_match.group(1).lower()}>"
+        if end_tag in line.lower():
+            return None
+        return end_tag
+    comment_pos = line.find("<!--")
+    if 0 <= comment_pos <= 3 and not line[:comment_pos].strip():
+        if "-->" in line[comment_pos + 4 :]:
+            return None
+        return "-->"
+    return None
+
+
+def _is_block_end(line, block_end) -> bool:
+    if block_end[0] in "`~":
+        fence_match = _FENCE_REGEX.match(line)
+        if fence_match is None:
+            return False
+        fence = fence_match.group(1)
+        # closing fence: the same character, at least the same length, nothing after
+        return fence[0] == block_end[0] and len(fence) >= len(block_end) and not line[fence_match.end() :].strip()
+    return block_end in line.lower()
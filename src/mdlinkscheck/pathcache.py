@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import stat
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# files and directories marking root directory of repository
+REPOSITORY_MARKERS = [".git", ".hg", ".svn"]
+
+
+# ===================================================================
+
+
+class PathCache:
+    """Cache of file system queries shared by all checkers of single run.
+
+    Each path is queried (stat-ed) only once.
+    """
+
+    def __init__(self):
+        self._modes: dict[str, int | None] = {}  # 'None' if path does not exist
+        self._roots: dict[str, str | None] = {}
+        # number of executed 'stat' calls
+        self.stat_calls = 0
+        # number of queries answered from cache
+        self.hits = 0
+
+    def isfile(self, path) -> bool:
+        mode = self._getMode(path)
+        return mode is not None and stat.S_ISREG(mode)
+
+    def isdir(self, path) -> bool:
+        mode = self._getMode(path)
+        return mode is not None and stat.S_ISDIR(mode)
+
+    def exists(self, path) -> bool:
+        return self._getMode(path) is not None
+
+    def findRepositoryRoot(self, dir_path) -> str | None:
+        """Find root directory of repository containing given directory. Return 'None' if not found."""
+        dir_path = os.path.abspath(dir_path)
+        visited = []
+        curr_path = dir_path
+        root_path = None
+        while True:
+            if curr_path in self._roots:
+                root_path = self._roots[curr_path]
+                break
+            visited.append(curr_path)
+            if any(self.exists(os.path.join(curr_path, marker)) for marker in REPOSITORY_MARKERS):
+                root_path = curr_path
+                break
+            next_path = os.path.dirname(curr_path)
+            if next_path == curr_path:
+                # root dir reached
+                break
+            curr_path = next_path
+        # all visited directories share the same root
+        for item in visited:
+            self._roots[item] = root_path
+        return root_path
+
+    def invalidate(self, path=None):
+        """Remove cached state of given path (or all paths if 'None' given)."""
+        if path is None:
+            self._modes.clear()
+            self._roots.clear()
+            return
+        self._modes.pop(os.path.normpath(path), None)
+        # repository root could change
+        self._roots.clear()
+
+    def invalidateMissing(self):
+        """Remove cached state of paths that did not exist (they could be created since)."""
+        self._modes = {path: mode for path, mode in self._modes.items() if mode is not None}
+
+    def _getMode(self, path):
+        path = os.path.normpath(path)
+        if path in self._modes:
+            self.hits += 1
+            return self._modes[path]
+        self.stat_calls += 1
+        try:
+            mode = os.stat(path).st_mode
+        except (OSError, ValueError):
+            mode = None
+        self._modes[path] = mode
+        return mode
@@ -0,0 +1,228 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Machine-readable reports of invalid links.
+#
+
+import os
+import logging
+import json
+import pathlib
+
+from typing import TextIO
+
+from mdlinkscheck.filechecker import (
+    FileChecker,
+    INVALID_MALFORMED,
+    INVALID_MISSING_FILE,
+    INVALID_MISSING_README,
+    INVALID_MISSING_ANCHOR,
+    INVALID_UNREACHABLE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# invalid links are only logged
+FORMAT_TEXT = "text"
+# each invalid link is written as JSON object in separate line as soon as file is verified
+FORMAT_JSONL = "jsonl"
+# SARIF document written after verification of all files
+FORMAT_SARIF = "sarif"
+
+FORMATS_LIST = [FORMAT_TEXT, FORMAT_JSONL, FORMAT_SARIF]
+
+
+CATEGORY_DESCRIPTIONS = {
+    INVALID_MALFORMED: "Link can not be interpreted",
+    INVALID_MISSING_FILE: "Link points to not existing file",
+    INVALID_MISSING_README: "Link points to directory without README.md",
+    INVALID_MISSING_ANCHOR: "Link points to not existing element",
+    INVALID_UNREACHABLE: "Link points to unreachable URL",
+}
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_URI = "https://github.com/anetczuk/mdlinkscheck"
+
+
+# ===================================================================
+
+
+class InvalidLink:
+    """Invalid link found in Markdown file.
+
+    'line' and 'column' are 1-based position of link in file ('None' if unknown).
+    """
+
+    def __init__(self, md_file, link, category, line=None, column=None):
+        self.md_file = md_file
+        self.link = link
+        self.category = category
+        self.line = line
+        self.column = column
+
+    def toDict(self) -> dict:
+        return {
+            "file": self.md_file,
+            "line": self.line,
+            "column": self.column,
+            "link": self.link,
+            "category": self.category,
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, InvalidLink):
+            return NotImplemented
+        return self.toDict() == other.toDict()
+
+    def __repr__(self):
+        return f"InvalidLink({self.toDict()})"
+
+
+def get_invalid_links(checker: FileChecker) -> list[InvalidLink]:
+    """Return invalid links of verified document (sorted by position in file)."""
+    if not checker.invalid_links:
+        return []
+    links_list = sorted(checker.invalid_links)
+    positions = {}
+    if checker.elements is not None:
+        # positions found during parsing
+        for link in links_list:
+            positions[link] = checker.getLinkPosition(link)
+    elif checker.from_file:
+        # engine does not track positions - search links in file
+        try:
+            with open(checker.md_file, encoding="utf-8") as file:
+                positions = find_links_positions_in_lines(file, links_list)
+        except OSError:
+            pass
+    # otherwise content given directly (file under 'md_file' is different) - positions unknown
+    ret_list = []
+    for link in links_list:
+        line, column = positions.get(link) or (None, None)
+        category = checker.invalid_categories.get(link, INVALID_MALFORMED)
+        ret_list.append(InvalidLink(checker.md_file, link, category, line, column))
+    ret_list.sort(key=lambda item: (item.line is None, item.line or 0, item.column or 0, item.link))
+    return ret_list
+
+
+def find_links_positions(md_content, links_list) -> dict[str, tuple[int, int]]:
+    """Find position (line, column) of first occurrence of each link in content."""
+    return find_links_positions_in_lines(md_content.split("\n"), links_list)
+
+
+def find_links_positions_in_lines(lines, links_list) -> dict[str, tuple[int, int]]:
+    """Find position (line, column) of first occurrence of each link in lines (e.g. file object).
+
+    Lines are read one by one, so whole file does not have to be loaded into memory.
+    """
+    ret_dict: dict[str, tuple[int, int]] = {}
+    remaining = list(links_list)
+    for line_index, line in enumerate(lines):
+        found = False
+        for link in remaining:
+            link_pos = line.find(link)
+            if link_pos >= 0:
+                ret_dict[link] = (line_index + 1, link_pos + 1)
+                found = True
+        if found:
+            remaining = [link for link in remaining if link not in ret_dict]
+            if not remaining:
+                break
+    return ret_dict
+
+
+# =======================================================
+
+
+class Reporter:
+    """Base class of reports. Does nothing (invalid links are logged by checker)."""
+
+    def reportFile(self, md_file, invalid_list: list[InvalidLink]):
+        """Report invalid links of verified file."""
+
+    def close(self):
+        """Finish report."""
+
+
+class JsonLinesReporter(Reporter):
+    """Write each invalid link as single line of JSON immediately after file is verified."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def reportFile(self, md_file, invalid_list: list[InvalidLink]):
+        for item in invalid_list:
+            self.stream.write(json.dumps(item.toDict()) + "\n")
+        self.stream.flush()
+
+
+class SarifReporter(Reporter):
+    """Write SARIF 2.1.0 document after all files are verified."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.invalid_list: list[InvalidLink] = []
+
+    def reportFile(self, md_file, invalid_list: list[InvalidLink]):
+        self.invalid_list.extend(invalid_list)
+
+    def close(self):
+        json.dump(create_sarif_document(self.invalid_list), self.stream, indent=2)
+        self.stream.write("\n")
+        self.stream.flush()
+
+
+def create_reporter(report_format, stream: TextIO) -> Reporter:
+    if report_format == FORMAT_JSONL:
+        return JsonLinesReporter(stream)
+    if report_format == FORMAT_SARIF:
+        return SarifReporter(stream)
+    return Reporter()
+
+
+def create_sarif_document(invalid_list: list[InvalidLink]) -> dict:
+    rules = [
+        {"id": category, "shortDescription": {"text": description}}
+        for category, description in CATEGORY_DESCRIPTIONS.items()
+    ]
+    results = []
+    for item in invalid_list:
+        region = {}
+        if item.line is not None:
+            region["startLine"] = item.line
+            region["startColumn"] = item.column
+            region["endColumn"] = item.column + len(item.link)
+        physical_location = {"artifactLocation": {"uri": _get_file_uri(item.md_file)}}
+        if region:
+            physical_location["region"] = region
+        results.append(
+            {
+                "ruleId": item.category,
+                "level": "error",
+                "message": {"text": f"invalid link: {item.link}"},
+                "locations": [{"physicalLocation": physical_location}],
+            }
+        )
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {"driver": {"name": "mdlinkscheck", "informationUri": TOOL_URI, "rules": rules}},
+                "results": results,
+            }
+        ],
+    }
+
+
+def _get_file_uri(file_path):
+    if os.path.isabs(file_path):
+        return pathlib.Path(file_path).as_uri()
+    return file_path.replace(os.sep, "/")
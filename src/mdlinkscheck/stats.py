@@ -0,0 +1,178 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Timings of phases of verification and counters of performed operations.
+#
+
+import time
+import logging
+
+from collections.abc import Callable, Iterable, Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# reading Markdown files
+PHASE_READ = "read"
+# converting Markdown to HTML
+PHASE_CONVERT = "convert"
+# parsing Markdown syntax tree or HTML
+PHASE_PARSE = "parse"
+# checking existence of local files and directories
+PHASE_FILESYSTEM = "filesystem"
+# checking reachability of external URLs
+PHASE_URL = "url"
+# whole run of application
+PHASE_TOTAL = "total"
+
+PHASES_LIST = [PHASE_READ, PHASE_CONVERT, PHASE_PARSE, PHASE_FILESYSTEM, PHASE_URL, PHASE_TOTAL]
+
+# number of verified files
+COUNTER_FILES_VERIFIED = "files_verified"
+# number of parsed files
+COUNTER_FILES_PARSED = "files_parsed"
+# number of files parsed again (e.g. removed from registry in low memory mode)
+COUNTER_FILES_REPARSED = "files_reparsed"
+# number of executed 'stat' calls
+COUNTER_STAT_CALLS = "stat_calls"
+# number of file system queries answered from cache
+COUNTER_STAT_CACHE_HITS = "stat_cache_hits"
+# number of sent HTTP requests
+COUNTER_URL_REQUESTS = "url_requests"
+# number of HTTP requests avoided thanks to already known results
+COUNTER_URL_SAVED = "url_saved"
+# number of results of URL checks taken from persistent cache
+COUNTER_URL_CACHE_HITS = "url_cache_hits"
+
+COUNTERS_LIST = [
+    COUNTER_FILES_VERIFIED,
+    COUNTER_FILES_PARSED,
+    COUNTER_FILES_REPARSED,
+    COUNTER_STAT_CALLS,
+    COUNTER_STAT_CACHE_HITS,
+    COUNTER_URL_REQUESTS,
+    COUNTER_URL_SAVED,
+    COUNTER_URL_CACHE_HITS,
+]
+
+
+# marker of end of iteration
+_END = object()
+
+# callables receiving 'Stats' object after each run of application
+_STATS_HOOKS: list[Callable] = []
+
+
+# ===================================================================
+
+
+class Stats:
+    """Accumulated time (seconds) of phases and values of counters."""
+
+    def __init__(self, timings: dict[str, float] = None, counters: dict[str, int] = None):
+        self.timings: dict[str, float] = dict(timings) if timings else {}
+        self.counters: dict[str, int] = dict(counters) if counters else {}
+
+    def addTime(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def increment(self, counter, value=1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def measure(self, phase) -> "PhaseTimer":
+        """Return context manager adding time of execution of its block to given phase."""
+        return PhaseTimer(self, phase)
+
+    def measureIter(self, items: Iterable, phase) -> Iterator:
+        """Yield items of iterable adding time of retrieving each item to given phase.
+
+        Allows to measure lazy operations (e.g. reading file line by line) separately
+        from processing of retrieved items.
+        """
+        items_iter = iter(items)
+        while True:
+            with PhaseTimer(self, phase):
+                item = next(items_iter, _END)
+            if item is _END:
+                return
+            yield item
+
+    def merge(self, other: "Stats"):
+        """Add timings and counters of other object (e.g. gathered in worker process)."""
+        for phase, seconds in other.timings.items():
+            self.addTime(phase, seconds)
+        for counter, value in other.counters.items():
+            self.increment(counter, value)
+
+    def difference(self, prev: "Stats") -> "Stats":
+        """Return timings and counters gathered since 'prev' state (copy of this object)."""
+        timings = {phase: seconds - prev.timings.get(phase, 0.0) for phase, seconds in self.timings.items()}
+        counters = {counter: value - prev.counters.get(counter, 0) for counter, value in self.counters.items()}
+        return Stats(timings, counters)
+
+    def copy(self) -> "Stats":
+        return Stats(self.timings, self.counters)
+
+    def clear(self):
+        self.timings.clear()
+        self.counters.clear()
+
+    def toDict(self) -> dict:
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+    def format(self) -> str:
+        """Return human readable summary."""
+        lines = ["timings:"]
+        for phase in _ordered_keys(self.timings, PHASES_LIST):
+            lines.append(f"    {phase:<20} {self.timings[phase]:10.3f} s")
+        lines.append("counters:")
+        for counter in _ordered_keys(self.counters, COUNTERS_LIST):
+            lines.append(f"    {counter:<20} {self.counters[counter]:10}")
+        return "\n".join(lines)
+
+
+class PhaseTimer:
+    """Context manager measuring time of execution of block."""
+
+    __slots__ = ("stats", "phase", "start_time")
+
+    def __init__(self, stats: Stats, phase):
+        self.stats = stats
+        self.phase = phase
+        self.start_time = 0.0
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats.addTime(self.phase, time.perf_counter() - self.start_time)
+
+
+def add_stats_hook(hook: Callable):
+    """Register callable receiving 'Stats' object after each run of application (e.g. metrics exporter)."""
+    _STATS_HOOKS.append(hook)
+
+
+def remove_stats_hook(hook: Callable):
+    _STATS_HOOKS.remove(hook)
+
+
+def notify_stats_hooks(stats: Stats):
+    for hook in list(_STATS_HOOKS):
+        try:
+            hook(stats)
+        except Exception:  # pylint: disable=broad-exception-caught
+            _LOGGER.exception("stats hook failed: %s", hook)
+
+
+def _ordered_keys(data_dict, known_order):
+    ret_list = [key for key in known_order if key in data_dict]
+    ret_list.extend(sorted(key for key in data_dict if key not in known_order))
+    return ret_list
@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Compact summary of parsed document. In low memory mode parse tree of
+# document is replaced by summary right after parsing. HTML engine
+# collects summary while traversing HTML (tree is not kept).
+#
+
+import sys
+
+from typing import TYPE_CHECKING
+
+from mdlinkscheck.anchorindex import HEADER_TAGS
+from mdlinkscheck.htmlparser import iter_html_elements, DEFAULT_HTML_PARSER
+
+if TYPE_CHECKING:
+    from mdlinkscheck.astextractor import MarkdownElements
+
+
+# ===================================================================
+
+
+class DocumentSummary:
+    """Elements of document required to verify links.
+
+    Items are stored in tuples without repetitions (headers keep repetitions, because
+    ids of repeated headers depend on order). Strings are interned, so links repeated
+    in many documents (e.g. links to main README) are stored once.
+    """
+
+    __slots__ = ("hyperlinks", "imgs", "anchors", "headers")
+
+    def __init__(self, hyperlinks=(), imgs=(), anchors=(), headers=()):
+        self.hyperlinks: tuple[str, ...] = _compact(hyperlinks)
+        self.imgs: tuple[str, ...] = _compact(imgs)
+        self.anchors: tuple[str, ...] = _compact(anchors)
+        self.headers: tuple[str, ...] = tuple(sys.intern(item) for item in headers)
+
+
+class SummaryBuilder:
+    """Collects summary of document parsed in parts (repeated items are stored once)."""
+
+    def __init__(self):
+        self._hyperlinks: dict[str, None] = {}
+        self._imgs: dict[str, None] = {}
+        self._anchors: dict[str, None] = {}
+        self._headers: list[str] = []
+
+    def add(self, summary: "DocumentSummary | MarkdownElements"):
+        self._hyperlinks.update(dict.fromkeys(summary.hyperlinks))
+        self._imgs.update(dict.fromkeys(summary.imgs))
+        self._anchors.update(dict.fromkeys(summary.anchors))
+        self._headers.extend(sys.intern(item) for item in summary.headers)
+
+    def build(self) -> DocumentSummary:
+        return DocumentSummary(self._hyperlinks, self._imgs, self._anchors, self._headers)
+
+
+def summarize_elements(elements: "MarkdownElements") -> DocumentSummary:
+    return DocumentSummary(elements.hyperlinks, elements.imgs, elements.anchors, elements.headers)
+
+
+def summarize_html(html_content, html_parser=DEFAULT_HTML_PARSER) -> DocumentSummary:
+    """Create summary of HTML document in single traversal of tree."""
+    hyperlinks = []
+    imgs = []
+    anchors = []
+    headers = []
+    for tag_name, attrs, text in iter_html_elements(html_content, ["a", "img", *HEADER_TAGS], HEADER_TAGS, html_parser):
+        if tag_name == "a":
+            link_href = attrs.get("href")
+            if link_href is not None:
+                hyperlinks.append(link_href)
+            link_id = attrs.get("id")
+            if link_id:
+                anchors.append(link_id)
+            link_name = attrs.get("name")
+            if link_name:
+                anchors.append(link_name)
+        elif tag_name == "img":
+            img_src = attrs.get("src")
+            if img_src is not None:
+                imgs.append(img_src)
+        else:
+            headers.append(text)
+    return DocumentSummary(hyperlinks, imgs, anchors, headers)
+
+
+def _compact(items) -> tuple[str, ...]:
+    return tuple(sys.intern(item) for item in dict.fromkeys(items))
@@ -0,0 +1,140 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+import sqlite3
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_TTL_SUCCESS = 7 * 24 * 60 * 60  # one week
+DEFAULT_TTL_FAILURE = 60 * 60  # one hour
+
+
+# ===================================================================
+
+
+class URLCache:
+    """Persistent cache of URL reachability results stored in SQLite database.
+
+    Entries expire after configured time (separately for reachable and unreachable URLs).
+    New entries are kept in memory and written in single short transaction by 'flush()',
+    so database is not locked while URLs are requested (database can be shared by processes).
+    Cache is best-effort: database errors (e.g. database locked for longer than 'timeout'
+    seconds) are logged and do not break verification.
+    """
+
+    def __init__(self, cache_path=None, ttl_success=DEFAULT_TTL_SUCCESS, ttl_failure=DEFAULT_TTL_FAILURE, timeout=30):
+        if cache_path is None:
+            cache_path = get_default_cache_path()
+        self.cache_path = cache_path
+        self.ttl_success = ttl_success
+        self.ttl_failure = ttl_failure
+        self.timeout = timeout
+        # entries not written yet: url -> (status code, reachable, timestamp)
+        self._pending: dict[str, tuple[int | None, int, float]] = {}
+
+        cache_dir = os.path.dirname(os.path.abspath(cache_path))
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # cache is accessed from threads checking URLs
+        self._connection = sqlite3.connect(cache_path, timeout=timeout, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS url_results"
+            " (url TEXT PRIMARY KEY, status_code INTEGER, reachable INTEGER, timestamp REAL)"
+        )
+        self._connection.commit()
+
+    def getOptions(self) -> dict:
+        """Return options of cache (to open the same cache, e.g. in worker process)."""
+        return {
+            "cache_path": self.cache_path,
+            "ttl_success": self.ttl_success,
+            "ttl_failure": self.ttl_failure,
+            "timeout": self.timeout,
+        }
+
+    def get(self, url) -> bool | None:
+        """Get reachability state of URL. Return 'None' if there is no valid entry."""
+        with self._lock:
+            entry = self._pending.get(url)
+            if entry is not None:
+                row = entry[1:]
+            else:
+                try:
+                    cursor = self._connection.execute(
+                        "SELECT reachable, timestamp FROM url_results WHERE url = ?", (url,)
+                    )
+                    row = cursor.fetchone()
+                except sqlite3.Error as exc:
+                    _LOGGER.warning("could not read URL cache %s: %s", self.cache_path, exc)
+                    return None
+        if row is None:
+            return None
+        reachable = bool(row[0])
+        ttl = self.ttl_success if reachable else self.ttl_failure
+        if time.time() - row[1] > ttl:
+            # expired
+            return None
+        return reachable
+
+    def put(self, url, status_code, reachable: bool):
+        """Store reachability state of URL. 'status_code' is 'None' if connection failed.
+
+        Entry is written to database by 'flush()'.
+        """
+        with self._lock:
+            self._pending[url] = (status_code, int(reachable), time.time())
+
+    def flush(self):
+        """Write pending entries to database."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = [(url, *entry) for url, entry in self._pending.items()]
+            self._pending = {}
+            try:
+                with self._connection:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO url_results (url, status_code, reachable, timestamp)"
+                        " VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error as exc:
+                _LOGGER.warning("could not write URL cache %s: %s", self.cache_path, exc)
+
+    def purge(self):
+        """Remove all entries."""
+        with self._lock:
+            self._pending = {}
+            try:
+                with self._connection:
+                    self._connection.execute("DELETE FROM url_results")
+            except sqlite3.Error as exc:
+                _LOGGER.warning("could not purge URL cache %s: %s", self.cache_path, exc)
+
+    def close(self):
+        if self._connection is None:
+            return
+        self.flush()
+        self._connection.close()
+        self._connection = None
+
+
+# =======================================================
+
+
+def get_default_cache_path():
+    cache_dir = os.environ.get("XDG_CACHE_HOME")
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "mdlinkscheck", "urlcache.sqlite")
@@ -0,0 +1,201 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+import threading
+
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit, urlunsplit
+from concurrent.futures import ThreadPoolExecutor
+
+from mdlinkscheck.urlcache import URLCache
+
+if TYPE_CHECKING:
+    import requests
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# ===================================================================
+
+
+class URLChecker:
+    """Check if external URLs are reachable.
+
+    Requests are sent through single HTTP session, so connections to hosts are kept alive and reused.
+    Multiple URLs can be checked concurrently with limit of parallel requests per host.
+
+    Results are stored under normalized URL, so each resource is requested only once
+    (e.g. URLs differing only by fragment). Optionally results are also stored
+    in persistent cache ('url_cache') to be reused by subsequent runs.
+    """
+
+    def __init__(self, max_workers=16, max_per_host=4, timeout=15, url_cache: URLCache = None):
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.headers = {"User-Agent": "My User Agent 1.0"}
+        self.url_cache = url_cache
+
+        self._session: "requests.Session" = None
+        self._results: dict[str, bool] = {}
+        # URLs checked by 'prefetchURLs()' and not requested by 'checkURLs()' yet
+        self._prefetched: set[str] = set()
+        self._host_limits: dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+        # number of sent requests
+        self.requests_count = 0
+        # number of requests avoided thanks to already known results
+        self.saved_count = 0
+        # number of results taken from persistent cache
+        self.cache_hits = 0
+
+    def checkURL(self, url) -> bool:
+        """Check single URL. Result is remembered."""
+        norm_url = normalize_url(url)
+        result = self._results.get(norm_url)
+        if result is None:
+            result = self._getCached(norm_url)
+        if result is None:
+            result = self._requestURL(norm_url)
+            self._flushCache()
+        return result
+
+    def checkURLs(self, urls) -> dict[str, bool]:
+        """Check all given URLs concurrently. Return dict with reachability state of each URL.
+
+        Results of previous calls are remembered, so URL shared by many documents is requested only once.
+        """
+        urls_map = {}
+        missing: dict[str, None] = {}  # dict keeps order of items
+        for url in urls:
+            norm_url = normalize_url(url)
+            urls_map[url] = norm_url
+            if norm_url in self._prefetched:
+                # first use of prefetched URL
+                self._prefetched.discard(norm_url)
+                continue
+            if norm_url in self._results or norm_url in missing:
+                self.saved_count += 1
+                continue
+            if self._getCached(norm_url) is not None:
+                continue
+            missing[norm_url] = None
+        self._requestURLs(list(missing))
+        return {url: self._results[norm_url] for url, norm_url in urls_map.items()}
+
+    def prefetchURLs(self, urls):
+        """Check concurrently given URLs in advance (e.g. URLs of many documents).
+
+        Results are used by subsequent calls of 'checkURLs()' (first use of prefetched
+        URL is not counted as saved request).
+        """
+        missing: dict[str, None] = {}
+        for url in urls:
+            norm_url = normalize_url(url)
+            if norm_url in self._results or norm_url in missing:
+                continue
+            self._prefetched.add(norm_url)
+            if self._getCached(norm_url) is not None:
+                continue
+            missing[norm_url] = None
+        self._requestURLs(list(missing))
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self.url_cache is not None:
+            self.url_cache.close()
+
+    def _requestURLs(self, norm_urls):
+        if len(norm_urls) == 1:
+            self._requestURL(norm_urls[0])
+        elif norm_urls:
+            workers_num = min(self.max_workers, len(norm_urls))
+            with ThreadPoolExecutor(max_workers=workers_num) as executor:
+                list(executor.map(self._requestURL, norm_urls))
+        self._flushCache()
+
+    def _getCached(self, norm_url) -> bool | None:
+        if self.url_cache is None:
+            return None
+        result = self.url_cache.get(norm_url)
+        if result is not None:
+            self.cache_hits += 1
+            self._results[norm_url] = result
+        return result
+
+    def _flushCache(self):
+        if self.url_cache is not None:
+            self.url_cache.flush()
+
+    def _getSession(self) -> "requests.Session":
+        import requests  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        with self._lock:
+            if self._session is None:
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.max_workers, pool_maxsize=self.max_per_host
+                )
+                self._session = requests.Session()
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def _getHostLimit(self, host) -> threading.Semaphore:
+        with self._lock:
+            semaphore = self._host_limits.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.max_per_host)
+                self._host_limits[host] = semaphore
+            return semaphore
+
+    def _requestURL(self, url) -> bool:
+        import requests  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        session = self._getSession()
+        host = urlsplit(url).netloc
+        with self._getHostLimit(host):
+            status_code = None
+            try:
+                response = session.head(url, timeout=self.timeout, headers=self.headers, allow_redirects=True)
+                # _LOGGER.info("link %s response code: %s", url, response.status_code)
+                status_code = response.status_code
+            except requests.exceptions.RequestException:
+                # e.g. connection error, timeout, too many redirects or invalid URL
+                pass
+        result = status_code == 200
+        with self._lock:
+            self.requests_count += 1
+        self._results[url] = result
+        if self.url_cache is not None:
+            self.url_cache.put(url, status_code, result)
+        return result
+
+
+# =======================================================
+
+
+def normalize_url(url):
+    """Normalize URL for purpose of results lookup.
+
+    Scheme and host are lowercased, default port and fragment are removed.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if scheme == "http" and netloc.endswith(":80"):
+        netloc = netloc[:-3]
+    elif scheme == "https" and netloc.endswith(":443"):
+        netloc = netloc[:-4]
+    path = parts.path
+    if not path:
+        path = "/"
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
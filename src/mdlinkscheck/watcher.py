@@ -0,0 +1,395 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Watch mode: documents stay loaded between runs and after change of files
+# only changed documents and documents pointing to them are verified again.
+#
+
+import os
+import sys
+import errno
+import logging
+import time
+import select
+import struct
+
+from collections.abc import Callable
+
+from mdlinkscheck import verify_checker, DocumentRegistry
+from mdlinkscheck.report import get_invalid_links
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# inotify events signaling change of directory content
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+# events changing list of entries of directory
+IN_ENTRIES_CHANGED = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+# header of 'inotify_event' structure: watch descriptor, mask, cookie, length of name
+_EVENT_HEADER = struct.Struct("iIII")
+
+INOTIFY_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+
+# ===================================================================
+
+
+class WatchSession:
+    """Verification of documents kept in memory between subsequent runs.
+
+    Parsed documents and their anchors are held by 'registry'. After change of files
+    only changed documents are parsed again and only documents affected by the change
+    are verified again: changed documents, documents pointing to changed files and
+    documents containing invalid links (target of the link could appear).
+    """
+
+    def __init__(self, verify_options: dict, registry: DocumentRegistry = None):
+        self.verify_options = verify_options
+        if registry is None:
+            registry = DocumentRegistry()
+        self.registry = registry
+        # callable receiving file path and list of 'InvalidLink' objects
+        self.report_callback: Callable | None = None
+        self.invalid_links: dict[str, set[str]] = {}
+        # real paths of local files pointed by each document
+        self.dependencies: dict[str, set[str]] = {}
+        # real paths of missing local files pointed by invalid links of each document
+        self.missing_paths: dict[str, set[str]] = {}
+
+    def verifyFiles(self, md_files) -> list[str]:
+        """Verify given files. Return list of verified files."""
+        verified_list = []
+        for md_file in md_files:
+            checker = verify_checker(md_file, registry=self.registry, **self.verify_options)
+            self.invalid_links[md_file] = set(checker.invalid_links)
+            self.dependencies[md_file] = set(checker.dependencies.keys())
+            self.missing_paths[md_file] = set(checker.missing_paths)
+            if self.report_callback is not None:
+                self.report_callback(md_file, get_invalid_links(checker))
+            verified_list.append(md_file)
+        return verified_list
+
+    def update(self, md_files, changed_paths) -> list[str]:
+        """Verify files affected by change of given paths.
+
+        'md_files' is list of all documents to watch (files could be added or removed).
+        Return list of verified files.
+        """
+        changed_real = set()
+        for changed_path in changed_paths:
+            self.registry.invalidate(changed_path)
+            # parent directory content changed (e.g. new file)
+            self.registry.path_cache.invalidate(os.path.dirname(changed_path))
+            changed_real.add(os.path.realpath(changed_path))
+        if changed_real:
+            # missing files could be created
+            self.registry.path_cache.invalidateMissing()
+
+        md_files_set = set(md_files)
+        for md_file in list(self.invalid_links.keys()):
+            if md_file not in md_files_set:
+                # file removed or excluded
+                del self.invalid_links[md_file]
+                self.dependencies.pop(md_file, None)
+                self.missing_paths.pop(md_file, None)
+
+        files_to_check = []
+        for md_file in md_files:
+            if md_file not in self.invalid_links:
+                # new file
+                files_to_check.append(md_file)
+                continue
+            if self.invalid_links[md_file]:
+                files_to_check.append(md_file)
+                continue
+            if os.path.realpath(md_file) in changed_real:
+                files_to_check.append(md_file)
+                continue
+            if not changed_real.isdisjoint(self.dependencies.get(md_file, ())):
+                files_to_check.append(md_file)
+        return self.verifyFiles(files_to_check)
+
+    def getWatchedPaths(self) -> set[str]:
+        """Return paths of local files pointed by documents (including missing files pointed by invalid links)."""
+        ret_set = set()
+        for deps in self.dependencies.values():
+            ret_set.update(deps)
+        for missing in self.missing_paths.values():
+            ret_set.update(missing)
+        return ret_set
+
+    def getInvalidCount(self) -> int:
+        return sum(len(item) for item in self.invalid_links.values())
+
+
+# =======================================================
+
+
+class TreeObserver:
+    """Detect changes of Markdown files and files pointed by them.
+
+    Changes are found by comparing modification time and size of files. Waiting for
+    changes uses 'inotify' (on Linux) and falls back to polling in given interval.
+    With 'inotify' only files named by events are checked again and list of Markdown
+    files is searched again only if files or directories were created, removed or moved.
+    'dirs_provider' is callable returning directories where new files can appear (e.g.
+    directories searched for Markdown files) - the directories are watched as well.
+    If directory can not be watched (e.g. limit of watches is reached) then polling is used.
+    """
+
+    def __init__(self, md_files_provider: Callable, interval=1.0, use_inotify=True, dirs_provider: Callable = None):
+        self.md_files_provider = md_files_provider
+        self.interval = interval
+        self.dirs_provider = dirs_provider
+        self.md_files: list[str] = []
+        self.watched_paths: set[str] = set()
+        self._snapshot: dict[str, tuple[int, int] | None] = {}
+        # absolute path of each path of snapshot (to match paths named by events)
+        self._abs_paths: dict[str, str] = {}
+        self._waiter = None
+        if use_inotify:
+            self._waiter = create_inotify_waiter()
+        if self._waiter is None:
+            _LOGGER.debug("watching files by polling")
+
+    def scan(self) -> list[str]:
+        """Find files to watch and remember their state. Return list of Markdown files."""
+        self.md_files = list(self.md_files_provider())
+        self._snapshot = self._takeSnapshot()
+        self._watchSearchedDirs()
+        self._watchDirs(self._getWatchedDirs())
+        return self.md_files
+
+    def setWatchedPaths(self, paths):
+        """Set additional files to watch (e.g. images and documents pointed by links)."""
+        self.watched_paths = set(paths)
+        self._snapshot = self._takeSnapshot()
+        self._watchDirs(self._getWatchedDirs())
+
+    def checkChanges(self) -> set[str]:
+        """Return paths changed since previous check (without waiting)."""
+        prev_snapshot = self._snapshot
+        self.md_files = list(self.md_files_provider())
+        self._snapshot = self._takeSnapshot()
+        changed = set()
+        for path, state in self._snapshot.items():
+            if prev_snapshot.get(path, False) != state:
+                changed.add(path)
+        for path in prev_snapshot:
+            if path not in self._snapshot:
+                changed.add(path)
+        if changed:
+            self._watchDirs(self._getWatchedDirs())
+        return changed
+
+    def waitChanges(self) -> set[str]:
+        """Block until any of watched files changes. Return changed paths."""
+        while True:
+            if self._waiter is None:
+                time.sleep(self.interval)
+                changed = self.checkChanges()
+            elif self._waiter.wait(self.interval):
+                # let editor finish saving file
+                time.sleep(0.05)
+                changed = self._checkEvents(self._waiter.readEvents())
+            else:
+                # no events - nothing changed
+                continue
+            if changed:
+                return changed
+
+    def _checkEvents(self, events) -> set[str]:
+        """Return paths changed according to given 'inotify' events."""
+        event_paths = set()
+        for path, mask in events:
+            if mask & IN_Q_OVERFLOW:
+                # events lost
+                return self.checkChanges()
+            if mask & IN_ENTRIES_CHANGED and (mask & IN_ISDIR or path.endswith(".md")):
+                # Markdown files could appear or disappear
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watchSearchedDirs()
+                return self.checkChanges()
+            event_paths.add(path)
+
+        changed = set()
+        for path, state in self._snapshot.items():
+            if self._abs_paths[path] not in event_paths:
+                continue
+            new_state = get_file_state(path)
+            if new_state != state:
+                self._snapshot[path] = new_state
+                changed.add(path)
+        if changed:
+            self._watchDirs(self._getWatchedDirs())
+        return changed
+
+    def close(self):
+        if self._waiter is not None:
+            self._waiter.close()
+            self._waiter = None
+
+    def _watchSearchedDirs(self):
+        if self.dirs_provider is not None:
+            self._watchDirs(os.path.abspath(dir_path) for dir_path in self.dirs_provider())
+
+    def _watchDirs(self, dirs_list):
+        if self._waiter is None:
+            return
+        try:
+            self._waiter.watchDirs(dirs_list)
+        except OSError as exc:
+            _LOGGER.warning("could not watch directories (%s) - falling back to polling", exc)
+            self._waiter.close()
+            self._waiter = None
+
+    def _getWatchedDirs(self) -> set[str]:
+        # directory of missing file could not exist yet - watch its nearest existing parent
+        return {get_existing_parent(path) for path in self._snapshot}
+
+    def _takeSnapshot(self):
+        snapshot = {}
+        for path in self.md_files:
+            snapshot[path] = get_file_state(path)
+        for path in self.watched_paths:
+            snapshot[path] = get_file_state(path)
+        self._abs_paths = {path: os.path.abspath(path) for path in snapshot}
+        return snapshot
+
+
+class InotifyWaiter:
+    """Wait for changes in directories using Linux 'inotify' interface."""
+
+    def __init__(self, libc, inotify_fd):
+        self._libc = libc
+        self._fd = inotify_fd
+        # watch descriptor of each watched directory
+        self._dirs: dict[str, int] = {}
+        self._wds: dict[int, str] = {}
+
+    def watchDirs(self, dirs_list):
+        """Watch given directories. Raise 'OSError' if existing directory can not be watched."""
+        import ctypes  # pylint: disable=import-outside-toplevel
+
+        for dir_path in dirs_list:
+            if dir_path in self._dirs:
+                continue
+            watch_id = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), INOTIFY_MASK)
+            if watch_id < 0:
+                error_code = ctypes.get_errno()
+                if error_code in (errno.ENOENT, errno.ENOTDIR):
+                    # directory does not exist (yet)
+                    continue
+                # e.g. 'ENOSPC' - limit of watches ('fs.inotify.max_user_watches') reached
+                raise OSError(error_code, os.strerror(error_code), dir_path)
+            self._dirs[dir_path] = watch_id
+            self._wds[watch_id] = dir_path
+
+    def wait(self, timeout) -> bool:
+        """Wait for event. Return 'True' if event occurred."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        return bool(readable)
+
+    def readEvents(self) -> list[tuple[str, int]]:
+        """Read pending events. Return list of pairs (path named by event, mask of event)."""
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return events
+            if not data:
+                return events
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                watch_id, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + name_len].split(b"\0", 1)[0]
+                offset += name_len
+                dir_path = self._wds.get(watch_id)
+                if mask & IN_IGNORED:
+                    # watch removed (e.g. directory deleted)
+                    self._wds.pop(watch_id, None)
+                    self._dirs.pop(dir_path, None)
+                    continue
+                if dir_path is None:
+                    if mask & IN_Q_OVERFLOW:
+                        events.append(("", mask))
+                    continue
+                event_path = os.path.join(dir_path, os.fsdecode(name)) if name else dir_path
+                events.append((event_path, mask))
+
+    def drain(self):
+        """Remove pending events."""
+        self.readEvents()
+
+    def close(self):
+        os.close(self._fd)
+
+
+def create_inotify_waiter() -> InotifyWaiter | None:
+    """Create waiter if 'inotify' is available, otherwise return 'None'."""
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes  # pylint: disable=import-outside-toplevel
+    import ctypes.util  # pylint: disable=import-outside-toplevel
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        inotify_fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError) as exc:
+        _LOGGER.debug("inotify not available: %s", exc)
+        return None
+    if inotify_fd < 0:
+        _LOGGER.debug("inotify not available: %s", os.strerror(ctypes.get_errno()))
+        return None
+    return InotifyWaiter(libc, inotify_fd)
+
+
+def get_existing_parent(path) -> str:
+    """Return nearest existing directory containing given path."""
+    dir_path = os.path.dirname(os.path.abspath(path))
+    while not os.path.isdir(dir_path):
+        parent_path = os.path.dirname(dir_path)
+        if parent_path == dir_path:
+            break
+        dir_path = parent_path
+    return dir_path
+
+
+def get_file_state(path) -> tuple[int, int] | None:
+    """Return modification time and size of file or 'None' if file does not exist."""
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
@@ -0,0 +1,55 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+import logging
+
+from mdlinkscheck.anchorindex import (
+    build_anchor_index,
+    convert_header_to_github_target,
+    convert_header_to_bitbucket_target,
+    convert_header_to_gitlab_target,
+    HEADING_ID_GITHUB,
+    HEADING_ID_BITBUCKET,
+    HEADING_ID_GITLAB,
+    HEADING_ID_DIALECTS_LIST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BuildAnchorIndexTest(unittest.TestCase):
+    def test_no_dialects(self):
+        targets = build_anchor_index(["anchor"], ["Section"])
+        self.assertEqual(targets, frozenset(["anchor"]))
+
+    def test_dialects(self):
+        headers = ["Long  (named) section", "Other"]
+        targets = build_anchor_index([], headers, [HEADING_ID_GITHUB])
+        self.assertEqual(targets, frozenset(["long--named-section", "other"]))
+        targets = build_anchor_index([], headers, [HEADING_ID_BITBUCKET])
+        self.assertEqual(targets, frozenset(["markdown-header-long-named-section", "markdown-header-other"]))
+        targets = build_anchor_index([], headers, [HEADING_ID_GITLAB])
+        self.assertEqual(targets, frozenset(["long-named-section", "other"]))
+
+        targets = build_anchor_index(["anchor"], headers, HEADING_ID_DIALECTS_LIST)
+        self.assertEqual(len(targets), 6)
+
+    def test_repeated_headers(self):
+        headers = ["Examples", "Examples", "Examples-1", "Examples"]
+        targets = build_anchor_index([], headers, [HEADING_ID_GITHUB])
+        self.assertEqual(targets, frozenset(["examples", "examples-1", "examples-1-1", "examples-2"]))
+        targets = build_anchor_index([], headers[:2], [HEADING_ID_BITBUCKET])
+        self.assertEqual(targets, frozenset(["markdown-header-examples", "markdown-header-examples_1"]))
+        targets = build_anchor_index([], headers[:2], [HEADING_ID_GITLAB])
+        self.assertEqual(targets, frozenset(["examples", "examples-1"]))
+
+    def test_convert(self):
+        header = "Section with comma, and . here"
+        self.assertEqual(convert_header_to_github_target(header), "section-with-comma-and--here")
+        self.assertEqual(convert_header_to_bitbucket_target(header), "markdown-header-section-with-comma-and-here")
+        self.assertEqual(convert_header_to_gitlab_target(header), "section-with-comma-and-here")
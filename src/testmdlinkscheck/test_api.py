@@ -5,12 +5,15 @@
 # LICENSE file in the root directory of this source tree.
 #
 
+import os
+import tempfile
 import unittest
 import logging
 from typing import Any
 
 from mdlinkscheck import extract_links, extract_hyperlinks, extract_imgs
-from mdlinkscheck import verify
+from mdlinkscheck import verify, verify_many, Project
+from mdlinkscheck.filechecker import INVALID_MISSING_FILE, DocumentRegistry
 
 from testmdlinkscheck.data import get_data_path
 
@@ -93,3 +96,42 @@ class APITest(unittest.TestCase):
         result_set: set[Any] = set([])
 
         self.assertSetEqual(invalid_links_set, result_set)
+
+    def test_verify_many(self):
+        paths = [get_data_path("images.md"), get_data_path("github.md")]
+        results = verify_many(paths, implicit_heading_github=True)
+
+        self.assertEqual([item.md_file for item in results], paths)
+        self.assertFalse(results[0].valid)
+        self.assertSetEqual(results[0].invalid_links, set(["../image.gif", "img_girl2.jpg"]))
+        self.assertEqual([item.category for item in results[0].invalid_list], [INVALID_MISSING_FILE] * 2)
+        self.assertTrue(results[1].valid)
+        self.assertEqual(results[1].toDict(), {"file": paths[1], "valid": True, "invalid_links": []})
+
+    def test_project(self):
+        links_path = get_data_path("links.md")
+        with Project(jobs=2) as project:
+            results = project.verifyMany([links_path, get_data_path("images.md")])
+            self.assertSetEqual(
+                results[0].invalid_links, set(["www.google.com", "other_file.md", "/tmp/other_file.md", "#xxx"])
+            )
+            self.assertEqual(results[0].invalid_list[0].line, 6)
+
+            # documents parsed once and shared between calls
+            result = project.verify(links_path)
+            self.assertSetEqual(result.invalid_links, results[0].invalid_links)
+            self.assertIn("images.md", project.extractLinks(links_path))
+            self.assertEqual(len(project.registry), 2)
+            self.assertEqual(project.getStats().counters["files_verified"], 3)
+
+    def test_project_registry_jobs(self):
+        paths = [get_data_path("links.md"), get_data_path("images.md")]
+        with tempfile.TemporaryDirectory() as dump_dir:
+            registry = DocumentRegistry(engine="html", low_memory=True, dump_html_dir=dump_dir)
+            project = Project(jobs=2, registry=registry)
+            results = project.verifyMany(paths)
+            self.assertSetEqual(
+                results[0].invalid_links, set(["www.google.com", "other_file.md", "/tmp/other_file.md", "#xxx"])
+            )
+            # workers use options of given registry
+            self.assertTrue(os.listdir(dump_dir))
@@ -0,0 +1,108 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import logging
+import time
+
+from mdlinkscheck.astextractor import extract_elements
+from mdlinkscheck.filechecker import FileChecker, ENGINE_AST, ENGINE_HTML
+
+from testmdlinkscheck.data import get_data_root_path
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_data_md_files():
+    data_dir = get_data_root_path()
+    return sorted(os.path.join(data_dir, item) for item in os.listdir(data_dir) if item.endswith(".md"))
+
+
+class ExtractElementsTest(unittest.TestCase):
+    def test_extract_elements(self):
+        content = """# Title with `code` and <b>bold</b>
+
+[link](file.md) ![image](image.png)
+
+<a name="anchor"></a> <a id="other" href="http://example.com">x</a>
+
+<img src="raw.png">
+"""
+        elements = extract_elements(content)
+
+        self.assertEqual(elements.hyperlinks, ["file.md", "http://example.com"])
+        self.assertEqual(elements.imgs, ["image.png", "raw.png"])
+        self.assertEqual(elements.anchors, ["anchor", "other"])
+        self.assertEqual(elements.headers, ["Title with code and bold"])
+
+    def test_extract_positions(self):
+        content = """# Title
+
+text [a](x.md) and [b](x.md)
+ ![image](img.png) [ref link][ref]
+
+- item
+- [list](list.md)
+> [quote](quote.md)
+
+<div><a href="raw.md">x</a> <img src="a&amp;b.png"></div>
+
+[ref]: ref.md
+"""
+        elements = extract_elements(content)
+
+        self.assertEqual(elements.hyperlinks, ["x.md", "x.md", "ref.md", "list.md", "quote.md", "raw.md"])
+        self.assertEqual(elements.hyperlinks_positions, [(3, 10), (3, 24), (4, 30), (7, 10), (8, 11), (10, 15)])
+        self.assertEqual(elements.imgs, ["img.png", "a&b.png"])
+        self.assertEqual(elements.imgs_positions, [(4, 11), (10, 39)])
+        self.assertEqual(elements.getPosition("x.md"), (3, 10))
+        self.assertIsNone(elements.getPosition("other.md"))
+
+    def test_extract_codeblock(self):
+        content = """```\n[link](file.md)\n```\n\n    [indented](file.md)\n\n`[span](file.md)`\n"""
+        elements = extract_elements(content)
+
+        self.assertEqual(elements.hyperlinks, [])
+
+    def test_extract_scaling(self):
+        def measure(blocks_num):
+            md_content = "".join(f"paragraph {index} [link](file_{index}.md)\n\n" for index in range(blocks_num))
+            times = []
+            for _ in range(2):
+                start_time = time.perf_counter()
+                elements = extract_elements(md_content)
+                times.append(time.perf_counter() - start_time)
+            self.assertEqual(len(elements.hyperlinks), blocks_num)
+            return min(times)
+
+        small_time = measure(2000)
+        large_time = measure(16000)
+        # linear complexity: 8 times more blocks take about 8 times longer (quadratic would take 64 times)
+        self.assertLess(large_time, small_time * 14)
+
+    def test_engines_conformance(self):
+        # AST engine has to give the same results as HTML engine
+        md_files = get_data_md_files()
+        self.assertGreater(len(md_files), 0)
+        for md_file in md_files:
+            with self.subTest(md_file=md_file):
+                ast_checker = FileChecker(md_file, engine=ENGINE_AST)
+                html_checker = FileChecker(md_file, engine=ENGINE_HTML)
+                self.assertIsNotNone(ast_checker.elements)
+                self.assertIsNone(html_checker.elements)
+
+                self.assertSetEqual(ast_checker.extractHyperlinks(), html_checker.extractHyperlinks())
+                self.assertSetEqual(ast_checker.extractImgs(), html_checker.extractImgs())
+
+                options = {"implicit_heading_id_github": True, "implicit_heading_id_bitbucket": True}
+                ast_checker.setOptions(**options)
+                html_checker.setOptions(**options)
+                self.assertSetEqual(ast_checker.getLocalTargets(), html_checker.getLocalTargets())
+
+                self.assertEqual(ast_checker.checkMarkdown(), html_checker.checkMarkdown())
+                self.assertSetEqual(ast_checker.invalid_links, html_checker.invalid_links)
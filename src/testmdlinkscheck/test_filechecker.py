@@ -5,10 +5,13 @@
 # LICENSE file in the root directory of this source tree.
 #
 
+import os
 import unittest
 import logging
+import tempfile
 
-from mdlinkscheck.filechecker import FileChecker
+from mdlinkscheck.filechecker import FileChecker, DocumentRegistry, ENGINES_LIST
+from mdlinkscheck.filechecker import convert_header_to_github_target, extract_header_labels, convert_md_to_html
 
 from testmdlinkscheck.data import get_data_path
 
@@ -80,6 +83,18 @@ class FileCheckerTest(unittest.TestCase):
         valid = checker.checkMarkdown()
         self.assertTrue(valid)
 
+    def test_checkMarkdown_gitlab(self):
+        file_path = get_data_path("gitlab.md")
+        checker = FileChecker(file_path)
+        checker.setOptions(implicit_heading_id_gitlab=True)
+
+        valid = checker.checkMarkdown()
+        self.assertTrue(valid)
+
+        checker.setOptions(implicit_heading_id_gitlab=False, implicit_heading_id_github=True)
+        valid = checker.checkMarkdown()
+        self.assertFalse(valid)
+
     def test_checkMarkdown_codeblock(self):
         file_path = get_data_path("fenced_code_block.md")
         checker = FileChecker(file_path)
@@ -87,6 +102,81 @@ class FileCheckerTest(unittest.TestCase):
         valid = checker.checkMarkdown()
         self.assertTrue(valid)
 
+    def test_checkMarkdown_registry(self):
+        registry = DocumentRegistry()
+        file_path = get_data_path("links.md")
+        checker = registry.getChecker(file_path)
+
+        checker.checkMarkdown()
+        self.assertSetEqual(
+            checker.invalid_links, set(["www.google.com", "other_file.md", "/tmp/other_file.md", "#xxx"])
+        )
+        # 'images.md' loaded once for anchor links
+        self.assertEqual(len(registry), 2)
+
+        images_path = get_data_path("images.md")
+        self.assertIs(registry.getChecker(images_path), registry.getChecker(os.path.relpath(images_path)))
+
+    def test_checkMarkdown_low_memory(self):
+        file_path = get_data_path("links.md")
+        for engine in ENGINES_LIST:
+            with self.subTest(engine=engine):
+                registry = DocumentRegistry(engine=engine, low_memory=True)
+                checker = registry.getChecker(file_path)
+                with self.assertWarns(DeprecationWarning):
+                    self.assertIsNone(checker.soup)
+                self.assertIsNone(checker.elements)
+                self.assertIsInstance(checker.summary.hyperlinks, tuple)
+
+                checker.checkMarkdown()
+                self.assertSetEqual(
+                    checker.invalid_links, set(["www.google.com", "other_file.md", "/tmp/other_file.md", "#xxx"])
+                )
+                self.assertSetEqual(checker.extractImgs(), FileChecker(file_path, engine=engine).extractImgs())
+
+    def test_registry_max_documents(self):
+        registry = DocumentRegistry(max_documents=2)
+        links_path = get_data_path("links.md")
+        images_path = get_data_path("images.md")
+        github_path = get_data_path("github.md")
+        links_checker = registry.getChecker(links_path)
+        registry.getChecker(images_path)
+        self.assertIs(registry.getChecker(links_path), links_checker)
+
+        # least recently used document removed
+        registry.getChecker(github_path)
+        self.assertEqual(len(registry), 2)
+        registry.getChecker(images_path)
+        self.assertIsNot(registry.getChecker(links_path), links_checker)
+
+    def test_initializeByContent_in_memory(self):
+        checker = FileChecker.initializeByContent("[link](images.md)")
+        self.assertFalse(os.path.exists(checker.md_file))
+        self.assertFalse(checker.checkMarkdown())
+
+        # resolve relative links against given location
+        checker = FileChecker.initializeByContent("[link](images.md)", md_path=get_data_path("virtual.md"))
+        self.assertTrue(checker.checkMarkdown())
+
+    def test_dump_html(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = get_data_path("links.md")
+            FileChecker(file_path)
+            self.assertEqual(os.listdir(tmp_dir), [])
+
+            FileChecker(file_path, dump_html_dir=tmp_dir)
+            dumped_files = os.listdir(tmp_dir)
+            self.assertEqual(len(dumped_files), 1)
+            self.assertTrue(dumped_files[0].endswith(".html"))
+
+    def test_header_functions(self):
+        self.assertEqual(convert_header_to_github_target("Header One"), "header-one")
+
+        from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+        soup = BeautifulSoup(convert_md_to_html("# Header One\n\ntext\n\n### Header `Two`\n"), "html.parser")
+        self.assertSetEqual(extract_header_labels(soup), {"Header One", "Header Two"})
+
     # TODO: integration tests checking if real URLs are reachable
     # def test_checkURLReachable_github(self):
     #     checker = FileChecker("")
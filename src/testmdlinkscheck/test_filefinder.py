@@ -0,0 +1,160 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import logging
+
+from mdlinkscheck.filefinder import walk_md_files, walk_dirs, create_exclude_matcher, translate_gitignore_pattern
+
+from testmdlinkscheck.tmpdircase import TempDirTestCase
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WalkMdFilesTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        for rel_path in [
+            "README.md",
+            "notes.txt",
+            "docs/index.md",
+            "docs/generated/api.md",
+            "docs/sub/page.md",
+            "node_modules/pkg/README.md",
+            ".hidden/file.md",
+            "build/out.md",
+        ]:
+            self._writeFile(rel_path, "")
+
+    def _relPaths(self, paths):
+        return [os.path.relpath(path, self.root_dir) for path in paths]
+
+    def test_walk(self):
+        found = self._relPaths(walk_md_files(self.root_dir))
+        self.assertEqual(
+            found,
+            [
+                "README.md",
+                "build/out.md",
+                "docs/index.md",
+                "docs/generated/api.md",
+                "docs/sub/page.md",
+                "node_modules/pkg/README.md",
+            ],
+        )
+
+    def test_walk_excludes(self):
+        matcher = create_exclude_matcher([".*/node_modules/.*", ".*/generated/.*"])
+        visited = []
+
+        def tracking_matcher(path):
+            visited.append(path)
+            return matcher(path)
+
+        found = self._relPaths(walk_md_files(self.root_dir, tracking_matcher))
+        self.assertEqual(found, ["README.md", "build/out.md", "docs/index.md", "docs/sub/page.md"])
+        # excluded directories are not traversed
+        self.assertNotIn(os.path.join(self.root_dir, "node_modules", "pkg") + os.sep, visited)
+
+    def test_walk_gitignore(self):
+        self._writeFile(".gitignore", "build/\nnode_modules\n")
+        self._writeFile("docs/.gitignore", "/generated\n*.md\n!index.md\n")
+        found = self._relPaths(walk_md_files(self.root_dir))
+        self.assertEqual(found, ["README.md", "docs/index.md"])
+
+        found = self._relPaths(walk_md_files(self.root_dir, use_gitignore=False))
+        self.assertEqual(len(found), 6)
+
+    def test_walk_dirs(self):
+        self._writeFile(".gitignore", "build/\n")
+        matcher = create_exclude_matcher([".*/node_modules/.*"])
+        found = self._relPaths(walk_dirs(self.root_dir, matcher))
+        self.assertEqual(found, [".", "docs", "docs/generated", "docs/sub"])
+
+
+class CreateExcludeMatcherTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(create_exclude_matcher(None))
+        self.assertIsNone(create_exclude_matcher([]))
+
+    def test_regex(self):
+        matcher = create_exclude_matcher([".*/generated/.*", r".*\.tmp\.md"])
+        self.assertTrue(matcher("docs/generated/api.md"))
+        self.assertTrue(matcher("docs/file.tmp.md"))
+        self.assertFalse(matcher("docs/index.md"))
+        # regex is matched at beginning of path
+        self.assertFalse(matcher("x/generated"))
+
+    def test_literal_prefix(self):
+        matcher = create_exclude_matcher(["build/", "docs/api.*"])
+        self.assertTrue(matcher("build/out.md"))
+        self.assertTrue(matcher("docs/api/index.md"))
+        self.assertTrue(matcher("docs/apiref.md"))
+        self.assertFalse(matcher("docs/index.md"))
+        self.assertFalse(matcher("src/build/out.md"))
+
+    def test_glob(self):
+        matcher = create_exclude_matcher(
+            ["glob:**/node_modules/**", "glob:docs/*.md", "glob:out/**", "glob:**/CHANGELOG.md", "glob:**.bak.md"]
+        )
+        self.assertTrue(matcher("project/node_modules/pkg/README.md"))
+        self.assertTrue(matcher("node_modules/pkg/README.md"))
+        self.assertTrue(matcher("CHANGELOG.md"))
+        self.assertTrue(matcher("project/CHANGELOG.md"))
+        self.assertTrue(matcher("project/file.bak.md"))
+        self.assertFalse(matcher("project/OLD_CHANGELOG.md"))
+        self.assertTrue(matcher("docs/index.md"))
+        self.assertTrue(matcher("out/sub/file.md"))
+        # '*' does not span directories
+        self.assertFalse(matcher("docs/sub/index.md"))
+        self.assertFalse(matcher("docs/index.md.bak"))
+
+    def test_substrings(self):
+        matcher = create_exclude_matcher([".*/gen/.*", r".*\.tmp", ".*/ab", ".*/abc/", "glob:**draft**"])
+        self.assertTrue(matcher("docs/gen/api.md"))
+        self.assertTrue(matcher("docs/file.tmp.md"))
+        self.assertTrue(matcher("docs/abx.md"))
+        self.assertTrue(matcher("docs/my_draft.md"))
+        self.assertFalse(matcher("docs/generated/api.md"))
+        self.assertFalse(matcher("docs/filextmp.md"))
+
+    def test_escaped(self):
+        matcher = create_exclude_matcher([r"docs\.*", r".*\d\.md"])
+        self.assertTrue(matcher("docs...md"))
+        self.assertTrue(matcher("file1.md"))
+        # zero or more dots
+        self.assertTrue(matcher("docs/index.md"))
+        self.assertFalse(matcher("doc/index.md"))
+
+    def test_backreference(self):
+        matcher = create_exclude_matcher(["(a)b.*", r"(x)\1.*"])
+        self.assertTrue(matcher("ab"))
+        self.assertTrue(matcher("xx"))
+        self.assertFalse(matcher("xy"))
+
+    def test_not_joinable(self):
+        matcher = create_exclude_matcher(["(?i)readme.md", "(?P<name>docs)/.*", "(?P<name>doc)/.*"])
+        self.assertTrue(matcher("README.md"))
+        self.assertTrue(matcher("docs/index.md"))
+        self.assertTrue(matcher("doc/index.md"))
+        self.assertFalse(matcher("src/index.md"))
+
+    def test_many_patterns(self):
+        regex_list = [f".*/generated_{index}/.*" for index in range(200)]
+        regex_list += [f"glob:**/cache_{index}/**" for index in range(200)]
+        matcher = create_exclude_matcher(regex_list)
+        self.assertTrue(matcher("docs/generated_150/api.md"))
+        self.assertTrue(matcher("docs/cache_199/file.md"))
+        self.assertFalse(matcher("docs/generated_200/api.md"))
+
+
+class TranslateGitignorePatternTest(unittest.TestCase):
+    def test_translate(self):
+        self.assertEqual(translate_gitignore_pattern("*.md"), r"[^/]*\.md")
+        self.assertEqual(translate_gitignore_pattern("**/build"), r"(?:.*/)?build")
+        self.assertEqual(translate_gitignore_pattern("doc/[!a]?"), r"doc/[^a][^/]")
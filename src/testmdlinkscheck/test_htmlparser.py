@@ -0,0 +1,93 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import logging
+
+from mdlinkscheck.htmlparser import (
+    is_parser_available,
+    get_available_parsers,
+    select_parser,
+    iter_html_elements,
+    get_html_text,
+    HTML_PARSERS_LIST,
+    HTML_PARSER_PYTHON,
+    DEFAULT_HTML_PARSER,
+)
+from mdlinkscheck.filechecker import FileChecker, DocumentRegistry, ENGINES_LIST
+
+from testmdlinkscheck.data import get_data_path, get_data_root_path
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_data_files() -> list[str]:
+    return sorted(item for item in os.listdir(get_data_root_path()) if item.endswith(".md"))
+
+
+class HtmlParserTest(unittest.TestCase):
+    def test_available(self):
+        self.assertTrue(is_parser_available(HTML_PARSER_PYTHON))
+        self.assertFalse(is_parser_available("unknown"))
+        self.assertIn(DEFAULT_HTML_PARSER, get_available_parsers())
+
+    def test_select_parser(self):
+        self.assertEqual(select_parser(HTML_PARSER_PYTHON), HTML_PARSER_PYTHON)
+        self.assertEqual(select_parser("unknown"), DEFAULT_HTML_PARSER)
+
+    def test_iter_html_elements(self):
+        html_content = '<h2>Sub <b>title</b></h2><p><a href="a.md" id="x">a</a><img src="img.png"/></p>'
+        for html_parser in get_available_parsers():
+            with self.subTest(html_parser=html_parser):
+                elements = list(iter_html_elements(html_content, ["a", "img", "h2"], ["h2"], html_parser))
+                self.assertEqual([item[0] for item in elements], ["h2", "a", "img"])
+                self.assertEqual(elements[0][2], "Sub title")
+                self.assertEqual(elements[1][1].get("href"), "a.md")
+                self.assertEqual(elements[1][1].get("id"), "x")
+                self.assertIsNone(elements[1][2])
+                self.assertEqual(elements[2][1].get("src"), "img.png")
+
+    def test_get_html_text(self):
+        for html_parser in get_available_parsers():
+            with self.subTest(html_parser=html_parser):
+                self.assertEqual(get_html_text("<b>bold</b> text", html_parser), "bold text")
+                self.assertEqual(get_html_text("", html_parser), "")
+
+
+class HtmlParserConformanceTest(unittest.TestCase):
+    """Check that all available parsers give the same results as default parser."""
+
+    def test_summary(self):
+        parsers_list = get_available_parsers()
+        if len(parsers_list) < 2:
+            self.skipTest(f"no alternative parsers installed from {HTML_PARSERS_LIST}")
+        for engine in ENGINES_LIST:
+            for file_name in get_data_files():
+                file_path = get_data_path(file_name)
+                expected = FileChecker(file_path, engine=engine, html_parser=DEFAULT_HTML_PARSER).getSummary()
+                for html_parser in parsers_list:
+                    with self.subTest(engine=engine, file_name=file_name, html_parser=html_parser):
+                        summary = FileChecker(file_path, engine=engine, html_parser=html_parser).getSummary()
+                        self.assertSetEqual(set(summary.hyperlinks), set(expected.hyperlinks))
+                        self.assertSetEqual(set(summary.imgs), set(expected.imgs))
+                        self.assertSetEqual(set(summary.anchors), set(expected.anchors))
+                        self.assertEqual(list(summary.headers), list(expected.headers))
+
+    def test_checkMarkdown(self):
+        for engine in ENGINES_LIST:
+            for file_name in get_data_files():
+                file_path = get_data_path(file_name)
+                expected = DocumentRegistry(engine=engine).getChecker(file_path)
+                expected.checkMarkdown()
+                for html_parser in get_available_parsers():
+                    with self.subTest(engine=engine, file_name=file_name, html_parser=html_parser):
+                        registry = DocumentRegistry(engine=engine, html_parser=html_parser)
+                        checker = registry.getChecker(file_path)
+                        self.assertEqual(checker.html_parser, html_parser)
+                        checker.checkMarkdown()
+                        self.assertSetEqual(checker.invalid_links, expected.invalid_links)
@@ -0,0 +1,79 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+
+from mdlinkscheck.incremental import IncrementalState
+from mdlinkscheck.main import main, verify_files
+
+from testmdlinkscheck.tmpdircase import TempDirTestCase
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IncrementalStateTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.state_path = os.path.join(self.tmp_dir.name, "state.json")
+        self.index_path = self._writeFile("index.md", "[link](other.md#section)\n\n[file](other.md)\n")
+        self.other_path = self._writeFile("other.md", '## <a name="section"></a> Section\n')
+        self.md_files = [self.index_path, self.other_path]
+
+    def _runIncremental(self):
+        state = IncrementalState(self.state_path)
+        changed = state.selectChanged(self.md_files)
+        results = verify_files(changed, {}, collect_details=True)
+        for md_file, invalid_links, details in results:
+            state.update(md_file, invalid_links, details)
+        state.save(self.md_files)
+        return changed
+
+    def test_unchanged(self):
+        self.assertEqual(self._runIncremental(), self.md_files)
+        self.assertEqual(self._runIncremental(), [])
+
+    def test_changed_content(self):
+        self._runIncremental()
+        self._writeFile("other.md", '## <a name="section"></a> Section\n\nnew content\n')
+        # anchors not changed
+        self.assertEqual(self._runIncremental(), [self.other_path])
+
+    def test_changed_anchors(self):
+        self._runIncremental()
+        self._writeFile("other.md", '## <a name="renamed"></a> Section\n')
+        self.assertEqual(self._runIncremental(), self.md_files)
+        # invalid link is always checked again
+        self.assertEqual(self._runIncremental(), [self.index_path])
+
+    def test_removed_dependency(self):
+        self._runIncremental()
+        os.remove(self.other_path)
+        self.md_files = [self.index_path]
+        self.assertEqual(self._runIncremental(), [self.index_path])
+
+    def test_removed_file(self):
+        self._runIncremental()
+        os.remove(self.index_path)
+        self.md_files = [self.other_path]
+        self.assertEqual(self._runIncremental(), [])
+        state = IncrementalState(self.state_path)
+        self.assertEqual(list(state.results), [os.path.realpath(self.other_path)])
+
+    def test_options_changed(self):
+        self._runIncremental()
+        state = IncrementalState(self.state_path, {"implicit_heading_github": True})
+        self.assertEqual(state.selectChanged(self.md_files), self.md_files)
+
+    def test_main(self):
+        args = ["--silence", "--files", self.index_path, self.other_path, "--incremental", self.state_path]
+        self.assertEqual(main(args), 0)
+        self.assertTrue(os.path.isfile(self.state_path))
+        self.assertEqual(main(args), 0)
+
+        self._writeFile("other.md", "## Section\n")
+        self.assertEqual(main(args), 1)
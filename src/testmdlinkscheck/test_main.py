@@ -5,12 +5,15 @@
 # LICENSE file in the root directory of this source tree.
 #
 
+import os
 import unittest
 import logging
+import tempfile
 
-from mdlinkscheck.main import main
+from mdlinkscheck.main import main, verify_files
+from mdlinkscheck.urlcache import URLCache
 
-from testmdlinkscheck.data import get_data_path
+from testmdlinkscheck.data import get_data_path, get_data_root_path
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,3 +46,96 @@ class MainTest(unittest.TestCase):
         )
 
         self.assertEqual(error_code, 0)
+
+    def test_main_jobs(self):
+        md1_path = get_data_path("links.md")
+        md2_path = get_data_path("github.md")
+        md3_path = get_data_path("images.md")
+        error_code = main(["--silence", "--files", md1_path, md2_path, md3_path, "--jobs", "2"])
+
+        self.assertEqual(error_code, 1)
+
+    def test_verify_files_jobs(self):
+        md_files = [get_data_path(name) for name in ("links.md", "empty.md", "images.md")]
+        serial_results = verify_files(md_files, {}, jobs=1)
+        parallel_results = verify_files(md_files, {}, jobs=2)
+
+        self.assertEqual(serial_results, parallel_results)
+        self.assertEqual([item[0] for item in parallel_results], md_files)
+
+    def test_verify_files_jobs_log(self):
+        md_files = [get_data_path(name) for name in sorted(os.listdir(get_data_root_path())) if name.endswith(".md")]
+        with self.assertLogs("mdlinkscheck", level=logging.WARNING) as serial_logs:
+            verify_files(md_files, {}, jobs=1)
+        for _ in range(3):
+            with self.assertLogs("mdlinkscheck", level=logging.WARNING) as parallel_logs:
+                verify_files(md_files, {}, jobs=4)
+            # messages are logged in the same order as in serial mode
+            self.assertEqual(parallel_logs.output, serial_logs.output)
+
+    def test_main_purge_url_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "cache.sqlite")
+            error_code = main(["--silence", "--purge-url-cache", "--url-cache-path", cache_path])
+
+            self.assertEqual(error_code, 0)
+            self.assertTrue(os.path.isfile(cache_path))
+
+            url_cache = URLCache(cache_path)
+            url_cache.put("http://example.com/", 200, True)
+            url_cache.close()
+            # cache is purged even if it is not used by the run
+            error_code = main(["--silence", "--purge-url-cache", "--no-url-cache", "--url-cache-path", cache_path])
+            self.assertEqual(error_code, 0)
+            url_cache = URLCache(cache_path)
+            self.assertIsNone(url_cache.get("http://example.com/"))
+            url_cache.close()
+
+    def test_main_engine_html(self):
+        md_path = get_data_path("invalid.md")
+        error_code = main(["--silence", "--files", md_path, "--engine", "html"])
+
+        self.assertEqual(error_code, 1)
+
+    def test_main_low_memory(self):
+        md_path = get_data_path("invalid.md")
+        error_code = main(["--silence", "--files", md_path, "--low-memory", "--max-documents", "1"])
+        self.assertEqual(error_code, 1)
+
+        md_path = get_data_path("github.md")
+        error_code = main(
+            ["--silence", "--files", md_path, "--implicit-heading-id-github", "--low-memory", "--max-documents", "1"]
+        )
+        self.assertEqual(error_code, 0)
+
+    def test_main_streaming(self):
+        md_path = get_data_path("invalid.md")
+        error_code = main(["--silence", "--files", md_path, "--streaming"])
+        self.assertEqual(error_code, 1)
+
+        md_path = get_data_path("github.md")
+        error_code = main(
+            ["--silence", "--files", md_path, "--implicit-heading-id-github", "--streaming", "--jobs", "2"]
+        )
+        self.assertEqual(error_code, 0)
+
+    def test_main_dir_excludes(self):
+        data_dir = get_data_root_path()
+        error_code = main(["--silence", "--dir", data_dir])
+        self.assertEqual(error_code, 1)
+
+        error_code = main(
+            [
+                "--silence",
+                "--dir",
+                data_dir,
+                "--implicit-heading-id-github",
+                "--implicit-heading-id-bitbucket",
+                "--implicit-heading-id-gitlab",
+                "--excludes",
+                ".*/invalid.md",
+                ".*/links.md",
+                ".*/images.md",
+            ]
+        )
+        self.assertEqual(error_code, 0)
@@ -0,0 +1,70 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+import logging
+import pickle
+
+from mdlinkscheck import Project
+from mdlinkscheck.mdconverter import MarkdownConverter, get_converter
+from mdlinkscheck.filechecker import FileChecker, DocumentRegistry, ENGINES_LIST
+
+from testmdlinkscheck.data import get_data_path
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MarkdownConverterTest(unittest.TestCase):
+    def test_toHtml(self):
+        converter = MarkdownConverter()
+        html_content = converter.toHtml("# Title\n\n[link](file.md) <a name='x'></a>\n")
+        self.assertIn("<h1>Title</h1>", html_content)
+        self.assertIn('<a href="file.md">link</a>', html_content)
+        # raw HTML is not escaped
+        self.assertIn("<a name='x'></a>", html_content)
+        # parser is built once
+        html_markdown = converter._html_markdown  # pylint: disable=protected-access
+        self.assertEqual(converter.toHtml("# Title\n\n[link](file.md) <a name='x'></a>\n"), html_content)
+        self.assertIs(converter._html_markdown, html_markdown)  # pylint: disable=protected-access
+
+    def test_parse(self):
+        converter = MarkdownConverter()
+        tokens, _ = converter.parse("# Title\n")
+        self.assertEqual(tokens[0]["type"], "heading")
+
+    def test_get_converter(self):
+        self.assertIs(get_converter(), get_converter())
+        self.assertIs(get_converter(["url"]), get_converter(("url",)))
+        self.assertIsNot(get_converter(["url"]), get_converter())
+
+    def test_pickle(self):
+        converter = MarkdownConverter(plugins=["url"])
+        converter.toHtml("text")
+        copy = pickle.loads(pickle.dumps(converter))
+        self.assertEqual(copy.plugins, ("url",))
+        self.assertEqual(copy.toHtml("see https://www.google.com"), converter.toHtml("see https://www.google.com"))
+
+    def test_registry_converter(self):
+        converter = MarkdownConverter(plugins=["url"])
+        md_content = "see https://www.google.com\n"
+        for engine in ENGINES_LIST:
+            with self.subTest(engine=engine):
+                default_checker = FileChecker.initializeByContent(md_content)
+                self.assertIs(default_checker.converter, get_converter())
+                self.assertSetEqual(default_checker.extractHyperlinks(), set())
+
+                registry = DocumentRegistry(engine=engine, converter=converter)
+                checker = FileChecker(get_data_path("md_content.md"), registry=registry, md_content=md_content)
+                self.assertIs(checker.converter, converter)
+                self.assertSetEqual(checker.extractHyperlinks(), set(["https://www.google.com"]))
+
+    def test_project_converter(self):
+        converter = MarkdownConverter(plugins=["url"])
+        with Project(jobs=2, registry_options={"converter": converter}) as project:
+            self.assertIs(project.registry.converter, converter)
+            results = project.verifyMany([get_data_path("links.md"), get_data_path("github.md")])
+            self.assertEqual(len(results), 2)
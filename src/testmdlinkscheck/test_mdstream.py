@@ -0,0 +1,115 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import logging
+import tempfile
+
+from mdlinkscheck.mdstream import iter_md_chunks, collect_ref_links
+from mdlinkscheck.mdconverter import get_converter
+from mdlinkscheck.astextractor import extract_elements
+from mdlinkscheck.summary import SummaryBuilder, summarize_html
+from mdlinkscheck.filechecker import FileChecker, DocumentRegistry, ENGINES_LIST, ENGINE_AST
+from mdlinkscheck.report import get_invalid_links
+
+from testmdlinkscheck.data import get_data_path, get_data_root_path, read_data
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def split_blocks(md_content) -> list[str]:
+    return list(iter_md_chunks(md_content.splitlines(keepends=True), chunk_size=0))
+
+
+class IterMdChunksTest(unittest.TestCase):
+    def test_blocks(self):
+        md_content = "# Title\n\npara\ngraph\n\n- item\n\n  continued\n\n[link](a.md)\n"
+        self.assertEqual(
+            split_blocks(md_content), ["# Title\n\n", "para\ngraph\n\n", "- item\n\n  continued\n\n", "[link](a.md)\n"]
+        )
+
+    def test_fence(self):
+        md_content = "```\ncode\n\n[x](y)\n````\n\n~~~\n\nz\n```\n~~~~\n\nend\n"
+        self.assertEqual(
+            split_blocks(md_content), ["```\ncode\n\n[x](y)\n````\n\n", "~~~\n\nz\n```\n~~~~\n\n", "end\n"]
+        )
+
+    def test_html(self):
+        md_content = "<!-- comment\n\n[x](y)\n-->\n\n<pre>\n\ntext\n</pre>\n\n<!-- one line -->\n\nend\n"
+        self.assertEqual(
+            split_blocks(md_content),
+            ["<!-- comment\n\n[x](y)\n-->\n\n", "<pre>\n\ntext\n</pre>\n\n", "<!-- one line -->\n\n", "end\n"],
+        )
+
+    def test_chunk_size(self):
+        md_content = "".join(f"paragraph {index}\n\n" for index in range(100))
+        chunks = list(iter_md_chunks(md_content.splitlines(keepends=True), chunk_size=100))
+        self.assertEqual("".join(chunks), md_content)
+        self.assertGreater(len(chunks), 10)
+        for chunk in chunks[:-1]:
+            self.assertGreaterEqual(len(chunk), 100)
+
+    def test_collect_ref_links(self):
+        md_content = "[link][ref] [other]\n\n```\n[fake]: fake.md\n```\n\n[ref]: a.md\n\n[Other]: b.md 'title'\n"
+        ref_links = collect_ref_links(md_content.splitlines(keepends=True), chunk_size=0)
+        self.assertEqual(sorted(item["url"] for item in ref_links.values()), ["a.md", "b.md"])
+
+        # definitions given after use
+        elements = extract_elements(split_blocks(md_content)[0], ref_links=ref_links)
+        self.assertEqual(elements.hyperlinks, ["a.md", "b.md"])
+
+
+class StreamingTest(unittest.TestCase):
+    def test_data_blocks(self):
+        """Summary collected block by block is the same as summary of whole document."""
+        converter = get_converter()
+        for file_name in sorted(os.listdir(get_data_root_path())):
+            if not file_name.endswith(".md"):
+                continue
+            md_content = read_data(file_name)
+            lines = md_content.splitlines(keepends=True)
+            ref_links = collect_ref_links(lines, chunk_size=0)
+            for engine in ENGINES_LIST:
+                with self.subTest(file_name=file_name, engine=engine):
+                    builder = SummaryBuilder()
+                    for md_chunk in iter_md_chunks(lines, chunk_size=0):
+                        if engine == ENGINE_AST:
+                            builder.add(extract_elements(md_chunk, ref_links=ref_links))
+                        else:
+                            builder.add(summarize_html(converter.toHtml(md_chunk, ref_links)))
+                    summary = builder.build()
+                    expected = FileChecker(get_data_path(file_name), engine=engine).getSummary()
+                    self.assertSetEqual(set(summary.hyperlinks), set(expected.hyperlinks))
+                    self.assertSetEqual(set(summary.imgs), set(expected.imgs))
+                    self.assertSetEqual(set(summary.anchors), set(expected.anchors))
+                    self.assertEqual(list(summary.headers), list(expected.headers))
+
+    def test_checkMarkdown(self):
+        file_path = get_data_path("links.md")
+        for engine in ENGINES_LIST:
+            with self.subTest(engine=engine):
+                registry = DocumentRegistry(engine=engine, streaming=True)
+                checker = registry.getChecker(file_path)
+                self.assertTrue(checker.streaming)
+                self.assertIsNone(checker.elements)
+                checker.checkMarkdown()
+                self.assertSetEqual(
+                    checker.invalid_links, set(["www.google.com", "other_file.md", "/tmp/other_file.md", "#xxx"])
+                )
+                # positions found by searching file
+                invalid_list = get_invalid_links(checker)
+                self.assertEqual(invalid_list[0].line, 6)
+
+    def test_dump_html(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            registry = DocumentRegistry(streaming=True, dump_html_dir=tmp_dir)
+            registry.getChecker(get_data_path("github.md"))
+            dump_files = os.listdir(tmp_dir)
+            self.assertEqual(len(dump_files), 1)
+            with open(os.path.join(tmp_dir, dump_files[0]), encoding="utf-8") as file:
+                self.assertIn("<h1>", file.read())
@@ -0,0 +1,83 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import logging
+import tempfile
+
+from mdlinkscheck.pathcache import PathCache
+from mdlinkscheck.filechecker import FileChecker
+
+from testmdlinkscheck.data import get_data_path, get_data_root_path
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PathCacheTest(unittest.TestCase):
+    def test_isfile(self):
+        cache = PathCache()
+        file_path = get_data_path("links.md")
+        self.assertTrue(cache.isfile(file_path))
+        self.assertFalse(cache.isdir(file_path))
+        self.assertTrue(cache.isdir(get_data_root_path()))
+        self.assertFalse(cache.exists(get_data_path("missing.md")))
+        self.assertFalse(cache.isfile(get_data_path("missing.md")))
+
+        self.assertEqual(cache.stat_calls, 3)
+        self.assertEqual(cache.hits, 2)
+
+    def test_invalidate(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = PathCache()
+            file_path = os.path.join(tmp_dir, "file.md")
+            self.assertFalse(cache.isfile(file_path))
+
+            with open(file_path, "w", encoding="utf-8") as file:
+                file.write("")
+            self.assertFalse(cache.isfile(file_path))
+            cache.invalidate(file_path)
+            self.assertTrue(cache.isfile(file_path))
+
+            other_path = os.path.join(tmp_dir, "other.md")
+            self.assertFalse(cache.isfile(other_path))
+            with open(other_path, "w", encoding="utf-8") as file:
+                file.write("")
+            cache.invalidateMissing()
+            self.assertTrue(cache.isfile(other_path))
+            # existing paths stay cached
+            stat_calls = cache.stat_calls
+            self.assertTrue(cache.isfile(file_path))
+            self.assertEqual(cache.stat_calls, stat_calls)
+
+    def test_findRepositoryRoot(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_dir = os.path.join(tmp_dir, "repo")
+            sub_dir = os.path.join(repo_dir, "docs", "sub")
+            os.makedirs(sub_dir)
+            os.makedirs(os.path.join(repo_dir, ".git"))
+
+            cache = PathCache()
+            self.assertEqual(cache.findRepositoryRoot(sub_dir), repo_dir)
+            stat_calls = cache.stat_calls
+            self.assertEqual(cache.findRepositoryRoot(os.path.join(repo_dir, "docs")), repo_dir)
+            self.assertEqual(cache.stat_calls, stat_calls)
+
+    def test_checkMarkdown_absolute(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, ".git"))
+            docs_dir = os.path.join(tmp_dir, "docs")
+            os.makedirs(docs_dir)
+            with open(os.path.join(docs_dir, "other.md"), "w", encoding="utf-8") as file:
+                file.write("")
+
+            content = "[valid](/docs/other.md)\n\n[invalid](/other.md)\n"
+            checker = FileChecker.initializeByContent(content, md_path=os.path.join(docs_dir, "index.md"))
+            self.assertFalse(checker.checkMarkdown())
+            self.assertSetEqual(checker.invalid_links, set(["/other.md"]))
+            # absolute path of missing file is relative to repository root
+            self.assertSetEqual(checker.missing_paths, set([os.path.realpath(os.path.join(tmp_dir, "other.md"))]))
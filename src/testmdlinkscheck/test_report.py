@@ -0,0 +1,99 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import io
+import json
+import logging
+import contextlib
+
+from mdlinkscheck.filechecker import FileChecker
+from mdlinkscheck.main import main
+from mdlinkscheck.report import InvalidLink, get_invalid_links, find_links_positions, create_sarif_document
+
+from testmdlinkscheck.data import get_data_path
+from testmdlinkscheck.tmpdircase import TempDirTestCase
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ReportTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(os.path.join(self.tmp_dir.name, "subdir"))
+        self._writeFile("other.md", "# Other\n")
+        self.md_path = self._writeFile(
+            "doc.md",
+            "# Title\n"
+            "\n"
+            "[missing](missing.md) and [dir](subdir)\n"
+            "  [anchor](#no-anchor) [other](other.md#no-anchor)\n"
+            "[malformed](a#b#c)\n"
+            "![image](missing.png)\n",
+        )
+
+    def test_get_invalid_links(self):
+        checker = FileChecker(self.md_path)
+        checker.checkMarkdown()
+        invalid_list = get_invalid_links(checker)
+        self.assertEqual(
+            invalid_list,
+            [
+                InvalidLink(self.md_path, "missing.md", "missing_file", 3, 11),
+                InvalidLink(self.md_path, "subdir", "missing_readme", 3, 33),
+                InvalidLink(self.md_path, "#no-anchor", "missing_anchor", 4, 12),
+                InvalidLink(self.md_path, "other.md#no-anchor", "missing_anchor", 4, 32),
+                InvalidLink(self.md_path, "a#b#c", "malformed", 5, 13),
+                InvalidLink(self.md_path, "missing.png", "missing_file", 6, 10),
+            ],
+        )
+
+    def test_get_invalid_links_content(self):
+        # file on disk has different content - positions are not searched there
+        checker = FileChecker(self.md_path, engine="html", md_content="\n\n[missing](missing.md)\n")
+        checker.checkMarkdown()
+        self.assertEqual(get_invalid_links(checker), [InvalidLink(self.md_path, "missing.md", "missing_file")])
+
+        checker = FileChecker(self.md_path, engine="html")
+        checker.checkMarkdown()
+        self.assertEqual(get_invalid_links(checker)[0], InvalidLink(self.md_path, "missing.md", "missing_file", 3, 11))
+
+    def test_find_links_positions(self):
+        positions = find_links_positions("abc\n[x](link)\n", ["link", "other"])
+        self.assertEqual(positions, {"link": (2, 5)})
+
+    def test_sarif_document(self):
+        invalid_list = [InvalidLink("docs/doc.md", "missing.md", "missing_file", 3, 11)]
+        document = create_sarif_document(invalid_list)
+        self.assertEqual(document["version"], "2.1.0")
+        results = document["runs"][0]["results"]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["ruleId"], "missing_file")
+        location = results[0]["locations"][0]["physicalLocation"]
+        self.assertEqual(location["artifactLocation"]["uri"], "docs/doc.md")
+        self.assertEqual(location["region"], {"startLine": 3, "startColumn": 11, "endColumn": 21})
+
+    def test_main_jsonl(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            error_code = main(["--silence", "--format", "jsonl", "--files", self.md_path, get_data_path("empty.md")])
+        self.assertEqual(error_code, 1)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 6)
+        record = json.loads(lines[0])
+        self.assertEqual(
+            record, {"file": self.md_path, "line": 3, "column": 11, "link": "missing.md", "category": "missing_file"}
+        )
+
+    def test_main_sarif(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            error_code = main(["--silence", "--format", "sarif", "--files", self.md_path, "--jobs", "2"])
+        self.assertEqual(error_code, 1)
+        document = json.loads(output.getvalue())
+        results = document["runs"][0]["results"]
+        self.assertEqual(len(results), 6)
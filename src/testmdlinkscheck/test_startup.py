@@ -0,0 +1,69 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sys
+import unittest
+import logging
+import subprocess  # nosec
+
+import mdlinkscheck
+
+from testmdlinkscheck.data import get_data_path
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# packages slow to import that have to be imported only when needed
+HEAVY_MODULES = ["requests", "urllib3", "bs4", "validators", "mistune"]
+
+# upper limit of time of importing package (microseconds) - generous to avoid false alarms on slow machines
+IMPORT_TIME_LIMIT = 500000
+
+
+def get_import_times(args) -> dict[str, int]:
+    """Run module with '-X importtime' and return cumulative import time (microseconds) of each module."""
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(mdlinkscheck.__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_dir, env.get("PYTHONPATH")]))
+    result = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-m", "mdlinkscheck", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    ret_dict = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            cumulative_time = int(fields[1])
+        except ValueError:
+            # header line
+            continue
+        ret_dict[fields[2].strip()] = cumulative_time
+    return ret_dict
+
+
+class StartupTest(unittest.TestCase):
+    def test_help(self):
+        import_times = get_import_times(["--help"])
+        self.assertIn("mdlinkscheck.main", import_times)
+        for module_name in HEAVY_MODULES:
+            self.assertNotIn(module_name, import_times)
+        self.assertLess(import_times["mdlinkscheck"], IMPORT_TIME_LIMIT)
+
+    def test_local_links(self):
+        # without checking URLs HTTP library is not needed
+        import_times = get_import_times(["--silence", "--files", get_data_path("empty.md")])
+        self.assertIn("mistune", import_times)
+        self.assertNotIn("requests", import_times)
+        self.assertNotIn("urllib3", import_times)
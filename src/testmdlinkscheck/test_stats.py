@@ -0,0 +1,87 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+import logging
+
+from mdlinkscheck.stats import (
+    Stats,
+    add_stats_hook,
+    remove_stats_hook,
+    PHASE_PARSE,
+    PHASE_READ,
+    COUNTER_FILES_PARSED,
+    COUNTER_FILES_REPARSED,
+    COUNTER_FILES_VERIFIED,
+    COUNTER_STAT_CALLS,
+)
+from mdlinkscheck.filechecker import DocumentRegistry
+from mdlinkscheck.main import main
+
+from testmdlinkscheck.data import get_data_path
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StatsTest(unittest.TestCase):
+    def test_measure(self):
+        stats = Stats()
+        with stats.measure(PHASE_PARSE):
+            pass
+        with stats.measure(PHASE_PARSE):
+            pass
+        self.assertIn(PHASE_PARSE, stats.timings)
+        self.assertGreaterEqual(stats.timings[PHASE_PARSE], 0.0)
+
+    def test_measureIter(self):
+        stats = Stats()
+        items = []
+        for item in stats.measureIter(range(3), PHASE_READ):
+            items.append(item)
+        self.assertEqual(items, [0, 1, 2])
+        self.assertIn(PHASE_READ, stats.timings)
+        self.assertNotIn(PHASE_PARSE, stats.timings)
+
+    def test_merge_difference(self):
+        stats = Stats({PHASE_READ: 1.0}, {COUNTER_FILES_PARSED: 2})
+        prev_stats = stats.copy()
+        stats.addTime(PHASE_READ, 0.5)
+        stats.increment(COUNTER_FILES_PARSED)
+        stats.increment(COUNTER_STAT_CALLS, 3)
+
+        diff = stats.difference(prev_stats)
+        self.assertEqual(
+            diff.toDict(), {"timings": {PHASE_READ: 0.5}, "counters": {COUNTER_FILES_PARSED: 1, COUNTER_STAT_CALLS: 3}}
+        )
+
+        prev_stats.merge(diff)
+        self.assertEqual(prev_stats.toDict(), stats.toDict())
+        self.assertIn("files_parsed", stats.format())
+
+    def test_registry(self):
+        registry = DocumentRegistry(max_documents=1)
+        registry.getChecker(get_data_path("links.md")).checkMarkdown()
+        registry.getChecker(get_data_path("links.md"))
+
+        stats = registry.collectStats()
+        self.assertEqual(stats.counters[COUNTER_FILES_VERIFIED], 1)
+        # 'images.md' loaded for anchor links removed 'links.md' from registry
+        self.assertEqual(stats.counters[COUNTER_FILES_PARSED], 3)
+        self.assertEqual(stats.counters[COUNTER_FILES_REPARSED], 1)
+        self.assertGreater(stats.counters[COUNTER_STAT_CALLS], 0)
+        self.assertIn(PHASE_PARSE, stats.timings)
+
+    def test_hook(self):
+        received = []
+        add_stats_hook(received.append)
+        try:
+            error_code = main(["--silence", "--files", get_data_path("images.md"), "--jobs", "2"])
+        finally:
+            remove_stats_hook(received.append)
+        self.assertEqual(error_code, 1)
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0].counters[COUNTER_FILES_VERIFIED], 1)
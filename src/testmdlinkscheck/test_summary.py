@@ -0,0 +1,50 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+import logging
+
+from mdlinkscheck.summary import DocumentSummary, summarize_html
+from mdlinkscheck.filechecker import FileChecker, ENGINE_HTML, ENGINE_AST
+
+from testmdlinkscheck.data import get_data_path
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DocumentSummaryTest(unittest.TestCase):
+    def test_compact(self):
+        summary = DocumentSummary(["a.md", "b.md", "a.md"], [], ["x", "x"], ["Head", "Head"])
+        self.assertEqual(summary.hyperlinks, ("a.md", "b.md"))
+        self.assertEqual(summary.anchors, ("x",))
+        # repeated headers are kept (ids depend on order)
+        self.assertEqual(summary.headers, ("Head", "Head"))
+
+    def test_summarize_html(self):
+        summary = summarize_html(
+            '<h1>Title</h1><p><a href="a.md">a</a> <a name="anchor" id="ident"></a><img src="img.png"/></p>'
+            "<h3>Sub <b>title</b></h3><a>no href</a>"
+        )
+        self.assertEqual(summary.hyperlinks, ("a.md",))
+        self.assertEqual(summary.imgs, ("img.png",))
+        self.assertEqual(summary.anchors, ("ident", "anchor"))
+        self.assertEqual(summary.headers, ("Title", "Sub title"))
+
+    def test_engines(self):
+        for file_name in ["links.md", "images.md", "github.md", "bitbucket.md", "gitlab.md"]:
+            with self.subTest(file_name=file_name):
+                file_path = get_data_path(file_name)
+                html_checker = FileChecker(file_path, engine=ENGINE_HTML)
+                ast_checker = FileChecker(file_path, engine=ENGINE_AST)
+                html_summary = html_checker.getSummary()
+                ast_summary = ast_checker.getSummary()
+                # summary is collected once
+                self.assertIs(html_checker.getSummary(), html_summary)
+                self.assertSetEqual(set(html_summary.hyperlinks), set(ast_summary.hyperlinks))
+                self.assertSetEqual(set(html_summary.imgs), set(ast_summary.imgs))
+                self.assertSetEqual(set(html_summary.anchors), set(ast_summary.anchors))
+                self.assertEqual(list(html_summary.headers), list(ast_summary.headers))
@@ -0,0 +1,84 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import logging
+import sqlite3
+import tempfile
+
+from mdlinkscheck.urlcache import URLCache
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class URLCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.cache_path = os.path.join(self.tmp_dir.name, "subdir", "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_missing(self):
+        cache = URLCache(self.cache_path)
+        self.assertIsNone(cache.get("http://example.com/"))
+        cache.close()
+
+    def test_put_persistent(self):
+        cache = URLCache(self.cache_path)
+        cache.put("http://example.com/", 200, True)
+        cache.put("http://example.com/missing", 404, False)
+        cache.close()
+
+        cache = URLCache(self.cache_path)
+        self.assertTrue(cache.get("http://example.com/"))
+        self.assertFalse(cache.get("http://example.com/missing"))
+        cache.close()
+
+    def test_get_expired(self):
+        cache = URLCache(self.cache_path, ttl_success=100, ttl_failure=-1)
+        cache.put("http://example.com/", 200, True)
+        cache.put("http://example.com/missing", None, False)
+
+        self.assertTrue(cache.get("http://example.com/"))
+        self.assertIsNone(cache.get("http://example.com/missing"))
+        cache.close()
+
+    def test_purge(self):
+        cache = URLCache(self.cache_path)
+        cache.put("http://example.com/", 200, True)
+        cache.purge()
+
+        self.assertIsNone(cache.get("http://example.com/"))
+        cache.close()
+
+    def test_shared_database(self):
+        first_cache = URLCache(self.cache_path)
+        second_cache = URLCache(self.cache_path, timeout=0.1)
+        first_cache.put("http://example.com/first", 200, True)
+        # pending entry does not lock database
+        second_cache.put("http://example.com/second", 200, True)
+        second_cache.flush()
+        first_cache.flush()
+        self.assertTrue(first_cache.get("http://example.com/first"))
+        self.assertTrue(first_cache.get("http://example.com/second"))
+        first_cache.close()
+        second_cache.close()
+
+    def test_locked_database(self):
+        cache = URLCache(self.cache_path, timeout=0.1)
+        connection = sqlite3.connect(self.cache_path)
+        connection.execute("BEGIN EXCLUSIVE")
+        cache.put("http://example.com/", 200, True)
+        with self.assertLogs("mdlinkscheck.urlcache", level="WARNING"):
+            # errors are not raised
+            cache.flush()
+            self.assertIsNone(cache.get("http://example.com/missing"))
+        connection.rollback()
+        connection.close()
+        cache.close()
@@ -0,0 +1,191 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import logging
+import tempfile
+import threading
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from mdlinkscheck.urlchecker import URLChecker, normalize_url
+from mdlinkscheck.urlcache import URLCache
+from mdlinkscheck.filechecker import FileChecker, DocumentRegistry
+from mdlinkscheck.batch import verify_files
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Respond with 200 for paths starting with '/ok' and 404 otherwise."""
+
+    requests_counter = 0
+
+    def do_HEAD(self):  # noqa: N802
+        StubRequestHandler.requests_counter += 1
+        if self.path.startswith("/ok"):
+            self.send_response(200)
+        elif self.path.startswith("/loop"):
+            self.send_response(302)
+            self.send_header("Location", self.path)
+        else:
+            self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        # silence server logs
+        pass
+
+
+class URLCheckerTest(unittest.TestCase):
+    def setUp(self):
+        StubRequestHandler.requests_counter = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubRequestHandler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+
+    def test_checkURL(self):
+        checker = URLChecker()
+        self.assertTrue(checker.checkURL(f"{self.base_url}/ok"))
+        self.assertFalse(checker.checkURL(f"{self.base_url}/missing"))
+        checker.close()
+
+    def test_checkURLs(self):
+        checker = URLChecker(max_workers=4, max_per_host=2)
+        urls = [f"{self.base_url}/ok/{index}" for index in range(10)]
+        urls.append(f"{self.base_url}/missing")
+        urls.append(f"{self.base_url}/ok/0")
+
+        results = checker.checkURLs(urls)
+        checker.close()
+
+        self.assertEqual(len(results), 11)
+        self.assertFalse(results[f"{self.base_url}/missing"])
+        self.assertEqual(sum(results.values()), 10)
+        # duplicated URL requested once
+        self.assertEqual(StubRequestHandler.requests_counter, 11)
+        self.assertEqual(checker.requests_count, 11)
+        self.assertEqual(checker.saved_count, 1)
+
+    def test_checkURLs_normalized(self):
+        checker = URLChecker()
+        urls = [f"{self.base_url}/ok#first", f"{self.base_url}/ok#second", f"{self.base_url.upper()}/ok"]
+
+        results = checker.checkURLs(urls)
+        checker.close()
+
+        self.assertEqual(list(results.values()), [True, True, True])
+        self.assertEqual(StubRequestHandler.requests_counter, 1)
+        self.assertEqual(checker.saved_count, 2)
+
+    def test_checkURL_unreachable(self):
+        checker = URLChecker(timeout=1)
+        # port of closed server
+        self.tearDown()
+        self.assertFalse(checker.checkURL(f"{self.base_url}/ok"))
+        self.setUp()
+
+    def test_checkURL_request_error(self):
+        checker = URLChecker(timeout=1)
+        # too many redirects
+        self.assertFalse(checker.checkURL(f"{self.base_url}/loop"))
+        # invalid URL
+        self.assertFalse(checker.checkURL("http://"))
+        checker.close()
+
+    def test_checkURLs_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, "cache.sqlite")
+            urls = [f"{self.base_url}/ok", f"{self.base_url}/missing"]
+
+            checker = URLChecker(url_cache=URLCache(cache_path))
+            checker.checkURLs(urls)
+            checker.close()
+            self.assertEqual(StubRequestHandler.requests_counter, 2)
+
+            # second run - results taken from cache
+            checker = URLChecker(url_cache=URLCache(cache_path))
+            results = checker.checkURLs(urls)
+            checker.close()
+            self.assertEqual(list(results.values()), [True, False])
+            self.assertEqual(StubRequestHandler.requests_counter, 2)
+            self.assertEqual(checker.cache_hits, 2)
+
+            # failures expired
+            checker = URLChecker(url_cache=URLCache(cache_path, ttl_failure=-1))
+            results = checker.checkURLs(urls)
+            checker.close()
+            self.assertEqual(StubRequestHandler.requests_counter, 3)
+
+    def test_checkMarkdown(self):
+        content = (
+            f"""[valid]({self.base_url}/ok)\n\n[invalid]({self.base_url}/missing)\n\n![img]({self.base_url}/ok.png)"""
+        )
+        checker = FileChecker.initializeByContent(content)
+        checker.setOptions(check_url_reachable=True)
+        valid = checker.checkMarkdown()
+
+        self.assertFalse(valid)
+        self.assertSetEqual(checker.invalid_links, set([f"{self.base_url}/missing"]))
+        self.assertEqual(StubRequestHandler.requests_counter, 3)
+
+    def test_checkMarkdown_shared(self):
+        registry = DocumentRegistry()
+        for _ in range(3):
+            checker = FileChecker.initializeByContent(f"[valid]({self.base_url}/ok#item)")
+            checker.registry = registry
+            checker.setOptions(check_url_reachable=True)
+            self.assertTrue(checker.checkMarkdown())
+
+        self.assertEqual(StubRequestHandler.requests_counter, 1)
+        self.assertEqual(registry.url_checker.saved_count, 2)
+
+    def test_verify_files_prefetch(self):
+        class TrackingChecker(URLChecker):
+            def __init__(self):
+                super().__init__()
+                self.batches = []
+
+            def _requestURLs(self, norm_urls):
+                self.batches.append(len(norm_urls))
+                super()._requestURLs(norm_urls)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            md_files = []
+            for index in range(4):
+                md_path = os.path.join(tmp_dir, f"file_{index}.md")
+                with open(md_path, "w", encoding="utf-8") as file:
+                    file.write(f"[valid]({self.base_url}/ok/{index})\n\n[shared]({self.base_url}/ok/shared)\n")
+                md_files.append(md_path)
+
+            url_checker = TrackingChecker()
+            results = verify_files(md_files, {"check_url_reachable": True}, url_checker=url_checker)
+            self.assertEqual([item[1] for item in results], [set()] * 4)
+            # URLs of all files requested together
+            self.assertEqual(url_checker.batches, [5] + [0] * 4)
+            self.assertEqual(StubRequestHandler.requests_counter, 5)
+            self.assertEqual(url_checker.saved_count, 3)
+
+            results = verify_files(md_files, {"check_url_reachable": True}, jobs=2)
+            self.assertEqual([item[1] for item in results], [set()] * 4)
+            # shared URL is requested at most once by each worker
+            self.assertLessEqual(StubRequestHandler.requests_counter, 5 + 4 + 2)
+
+
+class NormalizeURLTest(unittest.TestCase):
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url("HTTP://Example.COM:80#top"), "http://example.com/")
+        self.assertEqual(normalize_url("https://example.com:443/Path/?q=1#x"), "https://example.com/Path/?q=1")
+        self.assertEqual(normalize_url("https://example.com:8443/a"), "https://example.com:8443/a")
@@ -0,0 +1,175 @@
+# Copyright (c) 2022, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import errno
+import logging
+
+from mdlinkscheck.watcher import WatchSession, TreeObserver, create_inotify_waiter
+from mdlinkscheck.filefinder import walk_dirs, create_exclude_matcher
+
+from testmdlinkscheck.tmpdircase import TempDirTestCase
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WatcherTestBase(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.index_path = self._writeFile("index.md", "[link](other.md#section)\n\n[image](img.png)\n")
+        self.other_path = self._writeFile("other.md", '## <a name="section"></a> Section\n')
+        self.single_path = self._writeFile("single.md", "# Single\n")
+        self.img_path = self._writeFile("img.png", "")
+        self.md_files = [self.index_path, self.other_path, self.single_path]
+
+
+class WatchSessionTest(WatcherTestBase):
+    def test_update_dependency(self):
+        session = WatchSession({})
+        self.assertEqual(session.verifyFiles(self.md_files), self.md_files)
+        self.assertEqual(session.getInvalidCount(), 0)
+
+        # anchor removed - document pointing to changed file is verified again
+        self._writeFile("other.md", "## Section\n")
+        verified = session.update(self.md_files, [self.other_path])
+        self.assertEqual(verified, [self.index_path, self.other_path])
+        self.assertEqual(session.getInvalidCount(), 1)
+
+        # unrelated change - documents with invalid links are always verified
+        verified = session.update(self.md_files, [self.single_path])
+        self.assertEqual(verified, [self.index_path, self.single_path])
+
+        self._writeFile("other.md", '## <a name="section"></a> Section\n')
+        verified = session.update(self.md_files, [self.other_path])
+        self.assertEqual(verified, [self.index_path, self.other_path])
+        self.assertEqual(session.getInvalidCount(), 0)
+
+    def test_update_removed(self):
+        session = WatchSession({})
+        session.verifyFiles(self.md_files)
+        self.assertIn(os.path.realpath(self.img_path), session.getWatchedPaths())
+
+        os.remove(self.img_path)
+        verified = session.update(self.md_files, [os.path.realpath(self.img_path)])
+        self.assertEqual(verified, [self.index_path])
+        self.assertEqual(session.invalid_links[self.index_path], set(["img.png"]))
+
+        os.remove(self.single_path)
+        self.md_files.remove(self.single_path)
+        verified = session.update(self.md_files, [self.single_path])
+        self.assertEqual(verified, [self.index_path])
+        self.assertNotIn(self.single_path, session.invalid_links)
+
+    def test_update_created_target(self):
+        os.remove(self.img_path)
+        session = WatchSession({})
+        session.verifyFiles(self.md_files)
+        self.assertEqual(session.invalid_links[self.index_path], set(["img.png"]))
+        img_real_path = os.path.realpath(self.img_path)
+        self.assertIn(img_real_path, session.getWatchedPaths())
+
+        observer = TreeObserver(lambda: self.md_files, use_inotify=False)
+        observer.scan()
+        observer.setWatchedPaths(session.getWatchedPaths())
+        self._writeFile("img.png", "")
+        changed = observer.checkChanges()
+        self.assertEqual(changed, set([img_real_path]))
+
+        verified = session.update(self.md_files, changed)
+        self.assertEqual(verified, [self.index_path])
+        self.assertEqual(session.getInvalidCount(), 0)
+        observer.close()
+
+
+class TreeObserverTest(WatcherTestBase):
+    def test_checkChanges(self):
+        md_files = list(self.md_files)
+        observer = TreeObserver(lambda: md_files, use_inotify=False)
+        self.assertEqual(observer.scan(), self.md_files)
+        observer.setWatchedPaths([self.img_path])
+        self.assertEqual(observer.checkChanges(), set())
+
+        self._writeFile("other.md", "## Section changed\n")
+        os.remove(self.img_path)
+        new_path = self._writeFile("new.md", "")
+        md_files.append(new_path)
+        self.assertEqual(observer.checkChanges(), set([self.other_path, self.img_path, new_path]))
+        self.assertEqual(observer.checkChanges(), set())
+        observer.close()
+
+    def test_waitChanges_inotify(self):
+        provider_calls = []
+
+        def md_files_provider():
+            provider_calls.append(True)
+            return md_files
+
+        def dirs_provider():
+            return walk_dirs(self.root_dir, create_exclude_matcher([".*/excluded/.*"]))
+
+        md_files = list(self.md_files)
+        os.makedirs(os.path.join(self.root_dir, "excluded"))
+        observer = TreeObserver(md_files_provider, interval=0.1, dirs_provider=dirs_provider)
+        waiter = observer._waiter  # pylint: disable=protected-access
+        if waiter is None:
+            self.skipTest("inotify not available")
+        observer.scan()
+        # excluded directories are not watched
+        watched_dirs = waiter._dirs  # pylint: disable=protected-access
+        self.assertIn(os.path.abspath(self.root_dir), watched_dirs)
+        self.assertNotIn(os.path.abspath(os.path.join(self.root_dir, "excluded")), watched_dirs)
+        observer.setWatchedPaths([os.path.realpath(self.img_path)])
+        self.assertEqual(len(provider_calls), 1)
+
+        # modification - only files named by events are checked
+        self._writeFile("other.md", "## Section changed\n")
+        self.assertEqual(observer.waitChanges(), set([self.other_path]))
+        self._writeFile("img.png", "changed")
+        self.assertEqual(observer.waitChanges(), set([os.path.realpath(self.img_path)]))
+        self.assertEqual(len(provider_calls), 1)
+
+        # new file - files are searched again
+        new_path = self._writeFile("new.md", "")
+        md_files.append(new_path)
+        self.assertEqual(observer.waitChanges(), set([new_path]))
+        self.assertEqual(len(provider_calls), 2)
+
+        # new subdirectory is watched
+        sub_dir = os.path.join(self.tmp_dir.name, "sub")
+        os.makedirs(sub_dir)
+        sub_path = self._writeFile(os.path.join("sub", "sub.md"), "")
+        md_files.append(sub_path)
+        self.assertEqual(observer.waitChanges(), set([sub_path]))
+        observer.close()
+
+    def test_watch_failure(self):
+        class FailingWaiter:
+            def watchDirs(self, dirs_list):
+                raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC), list(dirs_list)[0])
+
+            def close(self):
+                pass
+
+        observer = TreeObserver(lambda: self.md_files, use_inotify=False, dirs_provider=lambda: [self.root_dir])
+        observer._waiter = FailingWaiter()  # pylint: disable=protected-access
+        with self.assertLogs("mdlinkscheck.watcher", level="WARNING"):
+            observer.scan()
+        # falls back to polling
+        self.assertIsNone(observer._waiter)  # pylint: disable=protected-access
+
+    def test_inotify(self):
+        waiter = create_inotify_waiter()
+        if waiter is None:
+            self.skipTest("inotify not available")
+        # missing directory is skipped
+        waiter.watchDirs([self.tmp_dir.name, os.path.join(self.tmp_dir.name, "missing")])
+        self.assertFalse(waiter.wait(0))
+        self._writeFile("other.md", "## Section changed\n")
+        self.assertTrue(waiter.wait(1.0))
+        waiter.drain()
+        self.assertFalse(waiter.wait(0))
+        waiter.close()
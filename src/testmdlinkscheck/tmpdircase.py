@@ -0,0 +1,30 @@
+#
+# Copyright (c) 2023, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Base of test cases working on files in temporary directory (removed after each test)."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.root_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _writeFile(self, rel_path, content) -> str:
+        """Write file inside temporary directory (creating subdirectories). Return path to file."""
+        file_path = os.path.join(self.root_dir, rel_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return file_path
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""Benchmark of links verification.
+
+Generates synthetic tree of Markdown documents and measures time of verification.
+Results can be stored and compared with results of previous run to detect performance regressions.
+"""
+
+#
+# Copyright (c) 2025, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+# ruff: noqa: T201
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+## allow running without installation of package
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, "..", "src")))
+
+# pylint: disable=C0413
+from mdlinkscheck import verify, extract_links, DocumentRegistry, MarkdownConverter  # noqa: E402
+from mdlinkscheck.main import main as main_entry, filter_items  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TreeGenerator:
+    """Generator of synthetic documentation tree."""
+
+    def __init__(
+        self,
+        files_num=100,
+        links_per_file=20,
+        anchor_ratio=0.3,
+        image_ratio=0.1,
+        absolute_ratio=0.1,
+        sections_per_file=10,
+        seed=0,
+    ):
+        """Initialize generator parameters."""
+        self.files_num = files_num
+        self.links_per_file = links_per_file
+        self.anchor_ratio = anchor_ratio
+        self.image_ratio = image_ratio
+        self.absolute_ratio = absolute_ratio
+        self.sections_per_file = sections_per_file
+        self.seed = seed
+
+    def generate(self, root_dir) -> list[str]:
+        """Generate tree in given directory. Return list of generated Markdown files."""
+        rand = random.Random(self.seed)  # noqa: S311
+        # repository marker - absolute links are relative to repository root
+        os.makedirs(os.path.join(root_dir, ".git"), exist_ok=True)
+        img_dir = os.path.join(root_dir, "img")
+        os.makedirs(img_dir, exist_ok=True)
+        images_num = max(1, self.files_num // 10)
+        for img_index in range(images_num):
+            save_content(os.path.join(img_dir, f"image_{img_index}.png"), "")
+
+        rel_files = [self._getRelPath(file_index) for file_index in range(self.files_num)]
+        for rel_path in rel_files:
+            content = self._generateContent(rand, rel_path, rel_files, images_num)
+            file_path = os.path.join(root_dir, rel_path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            save_content(file_path, content)
+        return [os.path.join(root_dir, rel_path) for rel_path in rel_files]
+
+    def _getRelPath(self, file_index):
+        return os.path.join("docs", f"dir_{file_index % 10}", f"file_{file_index}.md")
+
+    def _generateContent(self, rand, rel_path, rel_files, images_num):
+        file_dir = os.path.dirname(rel_path)
+        lines = [f"# Document {rel_path}", ""]
+        links_num = 0
+        for section_index in range(self.sections_per_file):
+            lines.append(f"## Section {section_index}")
+            lines.append("")
+            lines.append(f'<a name="anchor_{section_index}"></a> Lorem ipsum dolor sit amet, consectetur adipiscing.')
+            lines.append("")
+            section_links = self.links_per_file // self.sections_per_file
+            if section_index < self.links_per_file % self.sections_per_file:
+                section_links += 1
+            for _ in range(section_links):
+                links_num += 1
+                lines.append(f"- {self._generateLink(rand, file_dir, rel_files, images_num)}")
+            lines.append("")
+            lines.append("```")
+            lines.append("[not a link](inside_code_block.md)")
+            lines.append("```")
+            lines.append("")
+        return "\n".join(lines)
+
+    def _generateLink(self, rand, file_dir, rel_files, images_num):
+        if rand.random() < self.image_ratio:
+            img_path = f"img/image_{rand.randrange(images_num)}.png"
+            return f"![image](/{img_path})"
+        target = rand.choice(rel_files)
+        if rand.random() < self.absolute_ratio:
+            target_path = "/" + target
+        else:
+            target_path = os.path.relpath(target, file_dir)
+        if rand.random() < self.anchor_ratio:
+            section_index = rand.randrange(self.sections_per_file)
+            if rand.random() < 0.5:
+                target_path += f"#anchor_{section_index}"
+            else:
+                target_path += f"#section-{section_index}"
+        return f"[link]({target_path})"
+
+
+## ========================================
+
+
+def bench_verify(md_files):
+    """Verify all files sharing documents registry."""
+    registry = DocumentRegistry()
+    for md_file in md_files:
+        verify(md_file, implicit_heading_github=True, registry=registry)
+
+
+def bench_verify_low_memory(md_files):
+    """Verify all files keeping limited number of compact documents summaries."""
+    registry = DocumentRegistry(low_memory=True)
+    for md_file in md_files:
+        verify(md_file, implicit_heading_github=True, registry=registry)
+
+
+def bench_extract_links(md_files):
+    """Extract links from all files."""
+    for md_file in md_files:
+        extract_links(md_file)
+
+
+def bench_main(md_files):
+    """Run command line entry point."""
+    root_dir = os.path.commonpath(md_files)
+    main_entry(["--silence", "--dir", root_dir, "--implicit-heading-id-github", "--no-url-cache"])
+
+
+def generate_large_file(md_files, out_dir) -> str:
+    """Generate single large file (concatenation of all files) in given directory. Return path to file.
+
+    File is placed outside of generated tree, so it is not found by benchmarks traversing the tree.
+    """
+    large_path = os.path.join(out_dir, "large.md")
+    save_content(large_path, "\n\n".join(_read_contents(md_files)))
+    return large_path
+
+
+def bench_large_file(md_files):
+    """Verify single large file (concatenation of all files) converted to HTML."""
+    registry = DocumentRegistry(engine="html")
+    for md_file in md_files:
+        verify(md_file, implicit_heading_github=True, registry=registry)
+
+
+def bench_large_file_streaming(md_files):
+    """Verify single large file (concatenation of all files) parsed block by block."""
+    registry = DocumentRegistry(streaming=True)
+    for md_file in md_files:
+        verify(md_file, implicit_heading_github=True, registry=registry)
+
+
+def _read_contents(md_files) -> list[str]:
+    contents = []
+    for md_file in md_files:
+        with open(md_file, encoding="utf-8") as file:
+            contents.append(file.read())
+    return contents
+
+
+def bench_convert(md_files):
+    """Convert all files to HTML and to syntax tree reusing single converter."""
+    converter = MarkdownConverter()
+    for md_content in _read_contents(md_files):
+        converter.toHtml(md_content)
+        converter.parse(md_content)
+
+
+def bench_convert_rebuild(md_files):
+    """Convert all files building new converter for each document (overhead of building parsers)."""
+    for md_content in _read_contents(md_files):
+        MarkdownConverter().toHtml(md_content)
+        MarkdownConverter().parse(md_content)
+
+
+def bench_exclude(md_files):
+    """Filter large list of paths with large list of exclude patterns."""
+    regex_list = [f".*/generated_{index}/.*" for index in range(100)]
+    regex_list += [f"glob:**/cache_{index}/**" for index in range(100)]
+    paths_list = md_files * max(1, 100000 // len(md_files))
+    filter_items(paths_list, regex_list)
+
+
+BENCHMARKS = {
+    "verify": bench_verify,
+    "verify_low_memory": bench_verify_low_memory,
+    "extract_links": bench_extract_links,
+    "main": bench_main,
+    "exclude": bench_exclude,
+    "large_file": bench_large_file,
+    "large_file_streaming": bench_large_file_streaming,
+    "convert": bench_convert,
+    "convert_rebuild": bench_convert_rebuild,
+}
+
+# benchmarks receiving single large file instead of files of tree
+LARGE_FILE_BENCHMARKS = {"large_file", "large_file_streaming"}
+
+
+def run_benchmark(bench_name, md_files, repeats):
+    """Execute benchmark in separate process and return its results.
+
+    Each benchmark runs in fresh process, so peak memory is measured for single benchmark.
+    """
+    # 'spawn' - forked process would inherit memory of calling process
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as executor:
+        return executor.submit(_execute_benchmark, bench_name, md_files, repeats).result()
+
+
+def _execute_benchmark(bench_name, md_files, repeats):
+    logging.getLogger().setLevel(logging.ERROR)
+    bench_func = BENCHMARKS[bench_name]
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        bench_func(md_files)
+        times.append(time.perf_counter() - start_time)
+    best_time = min(times)
+    # peak resident memory of benchmark process (kilobytes on Linux)
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "time": best_time,
+        "files_per_sec": len(md_files) / best_time if best_time > 0 else 0.0,
+        "peak_memory_kb": peak_memory,
+    }
+
+
+def compare_results(results, baseline, tolerance):
+    """Compare results with baseline. Return list of regressed benchmarks."""
+    regressions = []
+    for bench_name, bench_data in results.items():
+        base_data = baseline.get(bench_name)
+        if base_data is None:
+            continue
+        if bench_data["time"] > base_data["time"] * (1.0 + tolerance):
+            regressions.append(bench_name)
+    return regressions
+
+
+def save_content(file_path: str, content: str):
+    """Save content to file."""
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+def main():
+    """Entry point for script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark of links verification",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--files", type=int, default=200, help="Number of generated files")
+    parser.add_argument("--links", type=int, default=30, help="Number of links per file")
+    parser.add_argument("--anchor-ratio", type=float, default=0.3, help="Fraction of links to elements in other file")
+    parser.add_argument("--image-ratio", type=float, default=0.1, help="Fraction of images")
+    parser.add_argument("--absolute-ratio", type=float, default=0.1, help="Fraction of absolute paths")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of random generator")
+    parser.add_argument("--repeats", type=int, default=3, help="Number of repeats of each benchmark")
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=list(BENCHMARKS.keys()), default=list(BENCHMARKS.keys()), help="Benchmarks"
+    )
+    parser.add_argument("--tree-dir", help="Directory to generate tree into (temporary directory if not given)")
+    parser.add_argument("--output", help="Path to JSON file to store results")
+    parser.add_argument("--baseline", help="Path to JSON file with results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown compared to baseline")
+
+    args = parser.parse_args()
+
+    logging.basicConfig()
+    logging.getLogger().setLevel(logging.ERROR)
+
+    generator = TreeGenerator(
+        files_num=args.files,
+        links_per_file=args.links,
+        anchor_ratio=args.anchor_ratio,
+        image_ratio=args.image_ratio,
+        absolute_ratio=args.absolute_ratio,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir, tempfile.TemporaryDirectory() as large_dir:
+        tree_dir = args.tree_dir if args.tree_dir else tmp_dir
+        md_files = generator.generate(tree_dir)
+        print(f"generated {len(md_files)} files in {tree_dir}")
+        large_files = []
+        if LARGE_FILE_BENCHMARKS.intersection(args.benchmarks):
+            # generated on each run, so it always matches parameters of tree
+            large_files = [generate_large_file(md_files, large_dir)]
+
+        results = {}
+        for bench_name in args.benchmarks:
+            bench_files = large_files if bench_name in LARGE_FILE_BENCHMARKS else md_files
+            bench_data = run_benchmark(bench_name, bench_files, args.repeats)
+            results[bench_name] = bench_data
+            print(
+                f"{bench_name:>16}: {bench_data['time']:8.3f} s {bench_data['files_per_sec']:10.1f} files/s"
+                f" peak memory: {bench_data['peak_memory_kb']} kB"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"performance regression detected: {', '.join(regressions)}")
+            return 1
+        print("no performance regression detected")
+    return 0
+
+
+## ========================================
+
+
+if __name__ == "__main__":
+    sys.exit(main())